@@ -0,0 +1,38 @@
+"""Regex vs compiled keyword matcher for relevance filtering and tagging.
+
+Run from the project root:
+    python -m benchmarks.matching [n_rows] [n_keywords]
+"""
+import re
+import sys
+import time
+
+import pandas as pd
+
+from utils.Matching import KeywordMatcher, tag_keywords
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_keywords = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    sample = pd.read_csv("data/Glints_RAW.csv")
+    df = sample.sample(n_rows, replace=True, random_state=0).reset_index(drop=True)
+
+    # keyword list: skill unik dari dataset, ditambah keyword acak sampai n_keywords
+    skills = sorted(set(sample["skills_requirements"].dropna().str.split(", ").explode()))
+    keywords = (skills + [f"keyword {i}" for i in range(n_keywords)])[:n_keywords]
+
+    start = time.perf_counter()
+    df["job_name"].str.contains("|".join(map(re.escape, keywords)), case=False, na=False, regex=True)
+    regex = time.perf_counter() - start
+    print(f"regex filter   : {n_rows} rows x {n_keywords} keywords in {regex:.2f}s")
+
+    start = time.perf_counter()
+    KeywordMatcher(keywords).mask(df["job_name"])
+    matcher = time.perf_counter() - start
+    print(f"matcher filter : {n_rows} rows x {n_keywords} keywords in {matcher:.2f}s (compile included)")
+
+    start = time.perf_counter()
+    tag_keywords(df, keywords)
+    print(f"matcher tagging: 3 columns in {time.perf_counter() - start:.2f}s")
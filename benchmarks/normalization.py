@@ -0,0 +1,45 @@
+"""Row-wise vs vectorized salary / post time normalization.
+
+Run from the project root:
+    python -m benchmarks.normalization [n_rows]
+"""
+import sys
+import time
+import datetime as dt
+
+import pandas as pd
+
+from utils.Scraping import exctract_time
+from utils.Normalization import normalize_jobs
+
+
+def rowwise(df:pd.DataFrame) -> pd.DataFrame:
+    # Jalur lama: dua pd.Series per baris + exctract_time dengan datetime.now() per baris
+    rows = []
+    for salary, last_post in zip(df["salary_range"], df["last_post"]):
+        rows.append({
+            "salary_min": pd.Series(salary).str.extract(r'IDR([\d\.]+)\s*-\s*\d+')[0].str.replace('.', '').astype(float).values[0],
+            "salary_max": pd.Series(salary).str.extract(r'IDR[\d\.]+\s*-\s*([\d\.]+)')[0].str.replace('.', '').astype(float).values[0],
+            "post_time": exctract_time(last_post, dt.datetime.now()),
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    sample = pd.read_csv("data/Glints_RAW.csv").drop(columns=["salary_min", "salary_max", "post_time"])
+    df = sample.sample(n_rows, replace=True, random_state=0).reset_index(drop=True)
+
+    start = time.perf_counter()
+    normalize_jobs(df)
+    vectorized = time.perf_counter() - start
+    print(f"vectorized : {n_rows} rows in {vectorized:.2f}s")
+
+    # jalur lama sangat lambat, diukur pada sebagian data lalu diproyeksikan
+    n_rowwise = min(n_rows, 2_000)
+    start = time.perf_counter()
+    rowwise(df.head(n_rowwise))
+    row_based = (time.perf_counter() - start) * n_rows / n_rowwise
+    print(f"row-wise   : {n_rows} rows in ~{row_based:.2f}s (measured on {n_rowwise} rows)")
+    print(f"speedup    : ~{row_based / vectorized:.0f}x")
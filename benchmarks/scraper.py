@@ -0,0 +1,120 @@
+"""End-to-end scraper benchmark against a local glints.com stand-in (no network access needed).
+
+Runs `collect_job_links`, `extract_all_job_details` and the cleaning / Parquet storage path
+for every size, then appends the timings to data/benchmark_results.jsonl (or `--results`)
+and compares them with the previous run of the same size.
+
+Run from the project root:
+    python -m benchmarks.scraper [--sizes 100,1000,10000,100000] [--latency 0.005] [--error-rate 0.01]
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import subprocess
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.stub_server import StubGlints, StubFetcher, build_jobs
+from utils.Scraping import collect_job_links, extract_all_job_details
+from utils.Cleaning_and_storing import cek_nan, cleaning_nan, filter_relevan_job
+from utils.Normalization import normalize_jobs
+from utils.Parquet_storing import append_parquet
+from utils.Throttling import AdaptiveRateLimiter
+from utils.Metrics import METRICS
+
+
+RESULTS_PATH = "data/benchmark_results.jsonl"
+
+KEYWORDS = ['data', 'scientist', 'machine learning', 'big data', 'modeling', 'analytst', "analis"]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(n_jobs:int, latency:float, error_rate:float) -> dict:
+    """Benchmarks one crawl of `n_jobs` jobs against a fresh stand-in server."""
+    jobs = build_jobs(n_jobs)
+    METRICS.reset()
+    timings = {}
+
+    with StubGlints(jobs, latency=latency, error_rate=error_rate) as stub:
+        fetcher = StubFetcher(stub.url)
+        # tanpa batas politeness: yang diukur adalah scraper, bukan rate limit
+        governor = AdaptiveRateLimiter(max_rps=1e6, start_rps=1e6, min_rps=1e3)
+
+        start = time.perf_counter()
+        links = collect_job_links(fetcher, "Data Scientist", rate_limiter=governor)
+        timings["collect_job_links"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = extract_all_job_details(links, fetcher, split=1000, rate_limiter=governor)
+        timings["extract_all_job_details"] = time.perf_counter() - start
+        requests, errors = stub.requests, stub.errors
+
+    start = time.perf_counter()
+    df = normalize_jobs(pd.DataFrame(result))
+    with tempfile.TemporaryDirectory() as root:
+        append_parquet(df, root)
+    df = cleaning_nan(df, list_na=cek_nan(df))
+    df = filter_relevan_job(df, list_keyword=KEYWORDS)
+    timings["clean_and_store"] = time.perf_counter() - start
+
+    stages = METRICS.report()["stages"]
+    return {
+        "n_jobs": n_jobs,
+        "links": len(links),
+        "records": len(result),
+        "requests": requests,
+        "injected_errors": errors,
+        "seconds": {name: round(value, 3) for name, value in timings.items()},
+        "jobs_per_sec": round(len(result) / timings["extract_all_job_details"], 1) if result else 0.0,
+        "latency": {name: {"p50": stage["p50"], "p95": stage["p95"]} for name, stage in stages.items()
+                    if name in ("request_page", "fetch_page", "parse_job_details", "cleaning_nan", "filter_relevan_job")},
+    }
+
+
+def previous_run(n_jobs:int, latency:float, error_rate:float, path:str=RESULTS_PATH) -> dict:
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            run = json.loads(line)
+            if (run["n_jobs"], run["config"]["latency"], run["config"]["error_rate"]) == (n_jobs, latency, error_rate):
+                previous = run
+    return previous
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark")
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="comma separated numbers of jobs")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean server delay per request, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--results", default=RESULTS_PATH, help="JSON lines file the results are appended to")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    for n_jobs in [int(size) for size in args.sizes.split(",")]:
+        run = run_size(n_jobs, args.latency, args.error_rate)
+        run["config"] = {"latency": args.latency, "error_rate": args.error_rate}
+        run["commit"] = commit
+        run["date"] = dt.datetime.now().isoformat(timespec="seconds")
+
+        print(f"\n{n_jobs:>7} jobs | " + " | ".join(f"{name} {seconds:.2f}s" for name, seconds in run["seconds"].items())
+              + f" | {run['jobs_per_sec']} jobs/sec")
+        previous = previous_run(n_jobs, args.latency, args.error_rate, args.results)
+        if previous:
+            for name, seconds in run["seconds"].items():
+                before = previous["seconds"].get(name)
+                if before:
+                    print(f"        {name}: {(seconds - before) / before:+.1%} vs {previous['commit']} ({previous['date']})")
+
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
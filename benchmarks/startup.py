@@ -0,0 +1,76 @@
+"""Import time of every CLI stage, in a fresh interpreter, against `cli.IMPORT_BUDGET`.
+
+Each stage imports its modules (`cli.STAGE_MODULES`) in a new process, as a short-lived
+worker would. The best of `--repeat` runs is reported, with the total process spawn time and
+the heavy packages the stage ended up loading. `main` (every module main.py imports) is shown
+for comparison. Exits with status 1 when a stage is over budget.
+
+Run from the project root:
+    python -m benchmarks.startup [--repeat 5]
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+import time
+
+from cli import STAGE_MODULES, IMPORT_BUDGET
+
+
+HEAVY_PACKAGES = ["selenium", "bs4", "lxml", "requests", "cryptography", "pandas", "numpy", "pyarrow", "pandas_gbq", "google"]
+
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+missing = []
+for name in {modules!r}:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        missing.append(name)
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "missing": missing,
+                  "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def main_modules(path:str="main.py") -> list:
+    """Modules imported at the top of main.py (the all-in-one entry point)."""
+    tree = ast.parse(open(path, encoding="utf-8").read())
+    return [node.module for node in tree.body if isinstance(node, ast.ImportFrom)] + \
+           [alias.name for node in tree.body if isinstance(node, ast.Import) for alias in node.names]
+
+
+def measure(modules:list, repeat:int) -> dict:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", PROBE.format(modules=modules, heavy=HEAVY_PACKAGES)],
+                                capture_output=True, text=True, check=True).stdout
+        run = json.loads(output)
+        run["spawn"] = time.perf_counter() - start
+        if best is None or run["seconds"] < best["seconds"]:
+            best = run
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import time budget of the CLI stages")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per stage, the fastest is kept")
+    args = parser.parse_args()
+
+    stages = {"cli": ["cli"], **{stage: ["cli"] + modules for stage, modules in STAGE_MODULES.items()}, "main": main_modules()}
+    over_budget = []
+    print(f"{'stage':<8} {'import':>8} {'spawn':>8} {'budget':>8}  heavy packages")
+    for stage, modules in stages.items():
+        run = measure(modules, args.repeat)
+        budget = IMPORT_BUDGET.get(stage)
+        if budget is not None and run["seconds"] > budget:
+            over_budget.append(stage)
+        print(f"{stage:<8} {run['seconds']:>7.3f}s {run['spawn']:>7.3f}s {budget if budget is not None else '-':>8}  "
+              + ", ".join(run["heavy"]) + (f"  (not installed: {', '.join(run['missing'])})" if run["missing"] else ""))
+
+    if over_budget:
+        print(f"\nOver the import budget: {', '.join(over_budget)}")
+        sys.exit(1)
@@ -0,0 +1,161 @@
+"""Local stand-in for glints.com, serving synthetic search and job detail pages.
+
+The pages use the same markup (class names, nesting) the scraper selectors expect, and
+their field values are sampled from data/Glints_RAW.csv.
+"""
+import html
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+from utils.Fetching import HttpFetcher
+
+
+JOBS_PER_PAGE = 30
+
+SEARCH_PATH = "/id/opportunities/jobs/explore"
+DETAIL_PREFIX = "/id/opportunities/jobs/"
+
+
+# _________________________________________________________________________________________ Pages
+
+def build_jobs(n_jobs:int, sample_path:str="data/Glints_RAW.csv", seed:int=0) -> pd.DataFrame:
+    """Samples `n_jobs` job records from the raw dataset, each with a new job UUID."""
+    sample = pd.read_csv(sample_path).fillna("")
+    jobs = sample.sample(n_jobs, replace=True, random_state=seed).reset_index(drop=True)
+    rng = random.Random(seed)
+    jobs["uuid"] = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(n_jobs)]
+    jobs["path"] = DETAIL_PREFIX + jobs["job_name"].str.lower().str.replace(r"[^a-z0-9]+", "-", regex=True) + "/" + jobs["uuid"]
+    return jobs
+
+
+def render_search_page(jobs:pd.DataFrame, page_num:int) -> str:
+    start = (page_num - 1) * JOBS_PER_PAGE
+    last_page = max(1, -(-len(jobs) // JOBS_PER_PAGE))
+    cards = "".join(
+        '<div class="JobCardsc__JobcardContainer-sc-hmqj50-0 iirqVR CompactOpportunityCardsc__CompactJobCardWrapper-sc-dkg8my-5 hRilQl">'
+        f'<a class="CompactOpportunityCardsc__JobCardTitleNoStyleAnchor-sc-dkg8my-12 jHptbP" href="{path}?utm_referrer=explore">'
+        f'{html.escape(name)}</a></div>'
+        for name, path in zip(jobs["job_name"][start:start+JOBS_PER_PAGE], jobs["path"][start:start+JOBS_PER_PAGE])
+    )
+    buttons = "".join(
+        f'<button class="UnstyledButton-sc-zp0cw8-0 AnchorPaginationsc__Number-sc-8wke03-3 dYSdtB bkvUQn">{n}</button>'
+        for n in sorted({1, 2, 3, last_page}) if n <= last_page
+    ) if last_page > 1 else ""
+    return f'<html><body><div id="__next">{cards}<nav>{buttons}</nav></div></body></html>'
+
+
+def render_detail_page(job:dict) -> str:
+    e = lambda value: html.escape(str(value))
+    skills = "".join(f"<span>{e(skill)}</span>" for skill in job["skills_requirements"].split(", ") if skill)
+    tags = ["Minimal Sarjana (S1)", "1 - 3 tahun pengalaman", "Umur 20 - 30 tahun"] + [tag for tag in job["another_requirements"].split(", ") if tag]
+    tags = "".join(f'<div class="TagStyle-sc-r1wv7a-4 bJWZOt JobRequirementssc__Tag-sc-15g5po6-3 cIkSrV">{e(tag)}</div>' for tag in tags)
+    crumbs = "".join(f'<label class="BreadcrumbStyle__BreadcrumbItemWrapper-sc-eq3cq-0"><a>{e(crumb)}</a></label>'
+                     for crumb in ("Lowongan", "Indonesia", job["province"], job["city"], job["district"]))
+    return (
+        '<html><body><div id="__next">'
+        f'<nav>{crumbs}</nav>'
+        f'<h1 class="TopFoldsc__JobOverViewTitle-sc-1fbktg5-3">{e(job["job_name"])}</h1>'
+        '<div>'
+        f'<span class="TopFoldsc__BasicSalary-sc-1fbktg5-13">{e(job["salary_range"])}</span>'
+        f'<span class="TopFoldsc__PostedAt-sc-1fbktg5-12 fcmpfD">Tayang {e(job["last_post"])}</span>'
+        f'<div class="TopFoldsc__JobOverViewInfo-sc-1fbktg5-9">{e(job["job_type"])}</div>'
+        f'<div class="TopFoldsc__JobOverViewInfo-sc-1fbktg5-9"><span>{e(job["education_requirements"])}</span></div>'
+        f'<div class="TopFoldsc__JobOverViewInfo-sc-1fbktg5-9">{e(job["experience_requirements"])}</div>'
+        '</div>'
+        f'<div class="Opportunitysc__SkillsContainer-sc-gb4ubh-10 jccjri">{skills}</div>'
+        f'<div>{tags}</div>'
+        f'<div class="AboutCompanySectionsc__Title-sc-c7oevo-6"><a>{e(job["company_name"])}</a></div>'
+        f'<div class="AboutCompanySectionsc__CompanyIndustryAndSize-sc-c7oevo-7">'
+        f'<span>{e(job["company_industry"])}</span><span>{e(job["company_size"])}</span></div>'
+        '</div></body></html>'
+    )
+
+
+# _________________________________________________________________________________________ Server
+
+class StubGlints:
+    """Threaded local HTTP server standing in for glints.com.
+
+    Args:
+        jobs (pd.DataFrame): jobs to serve, from `build_jobs`
+        latency (float, optional): mean response delay in seconds (uniform 0 to 2x). Defaults to 0.
+        error_rate (float, optional): share of requests answered with 503 (throttling). Defaults to 0.
+        seed (int, optional): seed for the latency and error draws. Defaults to 0.
+    """
+
+    def __init__(self, jobs:pd.DataFrame, latency:float=0.0, error_rate:float=0.0, seed:int=0):
+        self.jobs = jobs
+        self.details = {job["uuid"]: job for job in jobs.to_dict("records")}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = stub.respond(self.path)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def respond(self, path:str) -> tuple:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.rng.uniform(0, 2 * self.latency))
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors += 1
+            return 503, "<html><head><title>Service Unavailable</title></head></html>"
+
+        url = urlparse(path)
+        if url.path == SEARCH_PATH:
+            page_num = int(parse_qs(url.query).get("page", ["1"])[0])
+            return 200, render_search_page(self.jobs, page_num)
+        job = self.details.get(url.path.rstrip("/").rsplit("/", 1)[-1])
+        if job is None:
+            return 404, "<html><body>Not Found</body></html>"
+        return 200, render_detail_page(job)
+
+    def __enter__(self) -> "StubGlints":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubFetcher(HttpFetcher):
+    """HttpFetcher that sends every glints.com request to the stand-in server instead."""
+
+    def __init__(self, base_url:str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def _local(self, url:str) -> str:
+        return url.replace("https://glints.com", self.base_url, 1)
+
+    def get_html(self, url:str, wait_selector:str=None) -> str:
+        return super().get_html(self._local(url), wait_selector)
+
+    def get_html_conditional(self, url:str, etag:str=None, last_modified:str=None, wait_selector:str=None) -> tuple:
+        return super().get_html_conditional(self._local(url), etag, last_modified, wait_selector)
@@ -0,0 +1,407 @@
+"""Command line interface, one subcommand per stage of the pipeline:
+
+    python cli.py login                              # login once, the session is saved encrypted
+    python cli.py crawl --titles "Data Scientist"    # search pages -> data/links.json
+    python cli.py extract --workers 2                # job pages -> Parquet dataset (data/glints)
+    python cli.py clean                              # Parquet -> data/Glints_CLEAN.csv + skills index
+    python cli.py upload                             # Glints_CLEAN.csv -> BigQuery
+    python cli.py bench startup                      # benchmarks/<name>.py, e.g. scraper, matching, startup
+
+Distributed crawl: `crawl --queue` publishes the links to a shared work queue, `work` runs on any
+number of hosts and leases links from it, and `collect` writes the finished jobs to the dataset:
+
+    python cli.py crawl --queue redis://queue-host:6379/0
+    python cli.py work --queue redis://queue-host:6379/0 --workers 2     # on every worker host
+    python cli.py collect --queue redis://queue-host:6379/0
+
+Every stage imports its heavy dependencies (selenium, pandas, pyarrow, pandas_gbq, ...) inside its
+own function, so a stage only pays for what it uses: the browser stages never load pandas_gbq, and
+`clean` never loads selenium. `crawl` loads pandas and pyarrow through `utils.Preflight` for the
+preflight baseline (on by default, `--preflight-pages 0` skips it), so its budget matches `extract`.
+STAGE_MODULES lists what each stage loads, and `IMPORT_BUDGET` is checked by `python cli.py bench startup`. `main.py` still runs every stage in one go.
+"""
+import argparse
+import json
+import os
+import sys
+
+
+ENV_PATH = "privacy/.env"
+SESSION_PATH = "privacy/session.bin"
+LINKS_PATH = "data/links.json"
+DATASET_ROOT = "data/glints"
+CLEAN_PATH = "data/Glints_CLEAN.csv"
+SKILLS_INDEX_PATH = "data/skills_index.npz"
+REPORT_PATH = "data/run_report.json"
+QUEUE_URL = "data/work_queue.sqlite"    # atau redis://host:port/db untuk worker di beberapa host
+
+KEYWORDS = ['data', 'scientist', 'machine learning', 'big data', 'modeling', 'analytst', "analis"]
+
+# Modul yang dimuat tiap tahap (diukur oleh benchmarks/startup.py)
+STAGE_MODULES = {
+    "login": ["utils.Browser", "utils.Scraping", "utils.Session"],
+    "crawl": ["utils.Browser", "utils.Scraping", "utils.Session", "utils.Fetching", "utils.Scheduling",
+              "utils.Checkpointing", "utils.Throttling", "utils.Preflight"],
+    "extract": ["utils.Browser", "utils.Scraping", "utils.Session", "utils.Fetching", "utils.Normalization",
+                "utils.Parquet_storing", "utils.Incremental", "utils.Dedup", "utils.Caching", "utils.Archiving"],
+    "clean": ["utils.Cleaning_and_storing", "utils.Parquet_storing", "utils.Dedup", "utils.Skills"],
+    "upload": ["utils.Cleaning_and_storing", "utils.Warehouse_storing", "utils.Skills", "utils.Dedup", "pandas_gbq"],
+    "work": ["utils.Browser", "utils.Scraping", "utils.Session", "utils.Fetching", "utils.Queueing",
+             "utils.Caching", "utils.Archiving"],
+    "collect": ["utils.Queueing", "utils.Normalization", "utils.Parquet_storing"],
+}
+
+# Batas waktu import per tahap (detik, proses baru); dicek oleh `python cli.py bench startup`
+IMPORT_BUDGET = {"cli": 0.05, "login": 0.6, "crawl": 1.2, "extract": 1.2, "clean": 0.8, "upload": 2.5,
+                 "work": 0.6, "collect": 0.8}
+
+
+def load_env() -> dict:
+    from dotenv import dotenv_values
+    return dotenv_values(ENV_PATH)
+
+
+def apply_selector_mode(mode:str) -> None:
+    """Switches to the fallback selectors when the preflight check of the crawl chose them
+    (saved in the links file and in the work queue), so every stage parses the same way."""
+    if mode == "fallback":
+        from utils.Scraping import use_fallback_selectors
+        print("Switching to fallback selectors (chosen by the crawl preflight).")
+        use_fallback_selectors()
+
+
+def open_session(args, env:dict) -> tuple:
+    """Opens a browser and logs in (restoring the saved session when it is still valid).
+    Returns the browser, its options and the session store."""
+    from utils.Browser import build_options, open_browser
+    from utils.Scraping import glints_login
+    from utils.Session import SessionStore
+
+    session = SessionStore(env.get("SESSION_KEY") or env.get("GLINTS_PASSWORD"), SESSION_PATH)
+    options = build_options(headless=not args.show_browser)
+    browser = open_browser(options)
+    if not glints_login(browser, env.get("GLINTS_EMAIL"), env.get("GLINTS_PASSWORD"), session):
+        browser.quit()
+        sys.exit("Login failed!!")
+    print("Login success!!")
+    return browser, options, session
+
+
+# _________________________________________________________________________________________ Stages
+
+def login(args) -> None:
+    browser, _, _ = open_session(args, load_env())
+    browser.quit()
+    print(f"Session saved to {SESSION_PATH}")
+
+
+def crawl(args) -> None:
+    from utils.Fetching import HttpFetcher
+    from utils.Scheduling import collect_job_links_multi
+    from utils.Checkpointing import CrawlJournal
+    from utils.Throttling import AdaptiveRateLimiter
+    from utils.Metrics import METRICS
+
+    journal = CrawlJournal("data/crawl_journal.jsonl")
+    if not args.resume:
+        journal.clear()
+
+    browser, _, _ = open_session(args, load_env())
+    selectors = "primary"
+    try:
+        fetcher = HttpFetcher.from_browser(browser) if args.backend == "http" else browser
+        if args.preflight_pages:
+            from utils.Preflight import preflight, baseline_fill_rates, print_preflight
+
+            baseline = baseline_fill_rates(args.dataset_root)
+            health = preflight(fetcher, args.titles[0], baseline, n_pages=args.preflight_pages)
+            print_preflight(health, baseline)
+            if health["mode"] == "abort":
+                sys.exit("Selectors no longer match the Glints pages, crawl aborted.")
+            if health["mode"] == "fallback":
+                selectors = "fallback"
+                apply_selector_mode(selectors)
+
+        governor = AdaptiveRateLimiter(max_rps=args.max_rps)
+        links, matched = collect_job_links_multi(fetcher, args.titles, limit=args.pages, rate_limiter=governor, journal=journal)
+    finally:
+        browser.quit()
+        METRICS.write_report(REPORT_PATH)
+
+    with open(args.links, "w", encoding="utf-8") as f:
+        json.dump({"links": links, "matched": matched, "selectors": selectors}, f)
+    print(f"\nSaved {len(links)} job links to {args.links}")
+
+    if args.queue:
+        from utils.Queueing import open_work_queue
+        from utils.Dedup import RepostIndex, skip_known_reposts
+
+        work_queue = open_work_queue(args.queue)
+        work_queue.set_meta("selectors", selectors)
+        queued = work_queue.publish(skip_known_reposts(links, RepostIndex("data/reposts.json")), matched)
+        print(f"Published {queued} job links to {args.queue}: {work_queue.stats()}")
+
+
+def extract(args) -> None:
+    import pandas as pd
+    from utils.Fetching import HttpFetcher
+    from utils.Scraping import extract_all_job_details, extract_all_job_details_parallel, open_worker_browsers
+    from utils.Normalization import normalize_jobs, add_matched_keywords
+    from utils.Parquet_storing import append_parquet, read_parquet
+    from utils.Incremental import StateIndex, select_links_to_fetch
+    from utils.Dedup import RepostIndex, skip_known_reposts
+    from utils.Caching import PageCache
+    from utils.Archiving import PageArchive
+    from utils.Throttling import AdaptiveRateLimiter
+    from utils.Urls import job_uuid
+    from utils.Metrics import METRICS
+
+    with open(args.links, encoding="utf-8") as f:
+        crawled = json.load(f)
+    apply_selector_mode(crawled.get("selectors"))
+    links = skip_known_reposts(crawled["links"], RepostIndex("data/reposts.json"))
+    if args.incremental:
+        state_index = StateIndex("data/state_index.json")
+        if not len(state_index):
+            state_index.seed_from_dataset(read_parquet(args.dataset_root, columns=["url", "obtained"]))
+        links = select_links_to_fetch(links, state_index, refresh_days=args.refresh_days)
+
+    env = load_env()
+    browser, options, session = open_session(args, env)
+    browsers = [browser]
+    cache = PageCache("data/cache", ttl_hours=24, max_mb=500)
+    archive = PageArchive("data/archive")
+    governor = AdaptiveRateLimiter(max_rps=args.max_rps)
+    try:
+        if args.workers > 1 and args.backend == "http":
+            fetchers = [HttpFetcher.from_browser(browser) for _ in range(args.workers)]
+            result = extract_all_job_details_parallel(links, fetchers, max_rps=args.max_rps, cache=cache, archive=archive, rate_limiter=governor)
+        elif args.workers > 1:
+            browsers.extend(open_worker_browsers(args.workers-1, options, env.get("GLINTS_EMAIL"), env.get("GLINTS_PASSWORD"), session))
+            result = extract_all_job_details_parallel(links, browsers, max_rps=args.max_rps, cache=cache, archive=archive, rate_limiter=governor)
+        else:
+            fetcher = HttpFetcher.from_browser(browser) if args.backend == "http" else browser
+            result = extract_all_job_details(links, fetcher, split=50, cache=cache, archive=archive, rate_limiter=governor)
+    finally:
+        for opened in browsers:
+            opened.quit()
+        METRICS.write_report(REPORT_PATH)
+
+    if args.incremental:
+        state_index.mark_fetched([job_uuid(job["url"]) for job in result])
+        state_index.save()
+    if not result:
+        print("No job details found")
+        return
+    written = append_parquet(add_matched_keywords(normalize_jobs(pd.DataFrame(result)), crawled["matched"]), args.dataset_root)
+    print(f"\nSaved {len(result)} jobs to {args.dataset_root} (partitions: {', '.join(written)})")
+
+
+def work(args) -> None:
+    import socket
+    import threading
+    from utils.Fetching import HttpFetcher
+    from utils.Scraping import extract_from_queue, open_worker_browsers
+    from utils.Queueing import open_work_queue
+    from utils.Caching import PageCache
+    from utils.Archiving import PageArchive
+    from utils.Throttling import AdaptiveRateLimiter
+    from utils.Metrics import METRICS
+
+    work_queue = open_work_queue(args.queue, max_attempts=args.max_attempts)
+    apply_selector_mode(work_queue.get_meta("selectors"))
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    env = load_env()
+    browser, options, session = open_session(args, env)
+    browsers = [browser]
+    cache = PageCache("data/cache", ttl_hours=24, max_mb=500)
+    archive = PageArchive("data/archive")
+    governor = AdaptiveRateLimiter(max_rps=args.max_rps)   # satu budget untuk semua worker di host ini
+    try:
+        if args.backend == "http":
+            fetchers = [HttpFetcher.from_browser(browser) for _ in range(args.workers)]
+        else:
+            if args.workers > 1:
+                browsers.extend(open_worker_browsers(args.workers-1, options, env.get("GLINTS_EMAIL"), env.get("GLINTS_PASSWORD"), session))
+            fetchers = browsers
+        threads = [
+            threading.Thread(target=extract_from_queue, args=(work_queue, fetcher, f"{worker_id}-{i}"), daemon=True,
+                             kwargs={"batch_size": args.batch_size, "lease_seconds": args.lease_seconds, "rate_limiter": governor,
+                                     "cache": cache, "archive": archive, "stop_when_empty": not args.keep_polling})
+            for i, fetcher in enumerate(fetchers, start=1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        for opened in browsers:
+            opened.quit()
+        METRICS.write_report(REPORT_PATH)
+    print(f"\nQueue: {work_queue.stats()}")
+
+
+def collect(args) -> None:
+    import pandas as pd
+    from utils.Queueing import open_work_queue
+    from utils.Normalization import normalize_jobs, add_matched_keywords
+    from utils.Parquet_storing import append_parquet
+
+    work_queue = open_work_queue(args.queue)
+    if args.requeue_failed:
+        print(f"Queued {work_queue.requeue_failed()} failed job links again")
+
+    # per batch; job yang tertulis dua kali (at-least-once) digabung oleh append_parquet berdasarkan UUID
+    total = 0
+    while True:
+        records, matched = work_queue.results(new_only=True, limit=args.batch_size)
+        if not records:
+            break
+        written = append_parquet(add_matched_keywords(normalize_jobs(pd.DataFrame(records)), matched), args.dataset_root)
+        work_queue.mark_collected(records)
+        total += len(records)
+        print(f"Saved {len(records)} jobs to {args.dataset_root} (partitions: {', '.join(written)})")
+    print(f"\nCollected {total} jobs. Queue: {work_queue.stats()}")
+
+
+def clean(args) -> None:
+    import pandas as pd
+    from utils.Cleaning_and_storing import cek_nan, cleaning_nan, filter_relevan_job, clean_in_chunks
+    from utils.Parquet_storing import read_parquet, iter_parquet
+    from utils.Dedup import RepostIndex, mark_near_duplicates, drop_near_duplicates
+    from utils.Skills import SkillIndex
+
+    dates = args.dates.split(",") if args.dates else None
+    if os.path.exists(args.output):
+        os.remove(args.output)
+
+    if args.chunk_size:
+        # dedup per chunk (lihat drop_chunk_duplicates): duplikat antar chunk hanya lewat repost yang sudah dikenal
+        def sink(chunk:pd.DataFrame) -> None:
+            chunk.to_csv(args.output, mode="a", header=not os.path.exists(args.output), index=False)
+        reposts = None if args.no_dedup else RepostIndex("data/reposts.json")
+        skill_index = clean_in_chunks(iter_parquet(args.dataset_root, args.chunk_size, dates=dates), list_keyword=args.keywords,
+                                      sink=sink, reposts=reposts)
+    else:
+        df = read_parquet(args.dataset_root, dates=dates)
+        df = cleaning_nan(df, list_na=cek_nan(df))
+        df = filter_relevan_job(df, list_keyword=args.keywords)
+        print(f"\nSuccessfully filter ({df.shape[0]}) data to relevan job")
+        if not args.no_dedup and not df.empty:
+            df = mark_near_duplicates(df)
+            reposts = RepostIndex("data/reposts.json")
+            reposts.update(df)
+            reposts.save()
+            df = drop_near_duplicates(df)
+        df.to_csv(args.output, index=False)
+        skill_index = SkillIndex().add(df)
+
+    skill_index.save(SKILLS_INDEX_PATH)
+    print(f"Saved {len(skill_index)} clean jobs to {args.output}, skills index to {SKILLS_INDEX_PATH}")
+
+
+def upload(args) -> None:
+    import pandas as pd
+    from utils.Cleaning_and_storing import upload_gbq
+    from utils.Warehouse_storing import BigQueryWarehouse, upload_incremental
+    from utils.Skills import SkillIndex
+
+    env = load_env()
+    project_id, dataset_id = env.get("PROJECT_ID"), env.get("DATASET_ID")
+    key_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "privacy", env.get("KEY_JSON"))
+
+    df = pd.read_csv(args.input, parse_dates=['post_time', 'obtained'])
+    if df.empty:
+        print("No clean data to upload")
+        return
+    print("\nUploading to Google Big Query...")
+    if args.mode == "incremental":
+        upload_incremental(df, BigQueryWarehouse(project_id, dataset_id, key_path))
+    else:
+        skill_index = SkillIndex.load(SKILLS_INDEX_PATH) if os.path.exists(SKILLS_INDEX_PATH) else None
+        upload_gbq(df, project_id, dataset_id, key_path=key_path, skill_index=skill_index)
+
+
+def bench(args) -> None:
+    import runpy
+
+    sys.argv = [f"benchmarks/{args.name}.py"] + args.options
+    runpy.run_module(f"benchmarks.{args.name}", run_name="__main__")
+
+
+# _________________________________________________________________________________________ Parser
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Scrape Glints job postings and load them into BigQuery, one stage at a time")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    browser_options = argparse.ArgumentParser(add_help=False)
+    browser_options.add_argument("--show-browser", action="store_true", help="run Firefox with a window")
+
+    fetch_options = argparse.ArgumentParser(add_help=False, parents=[browser_options])
+    fetch_options.add_argument("--backend", choices=["selenium", "http"], default="selenium", help="page download backend")
+    fetch_options.add_argument("--max-rps", type=float, default=2.0, help="upper limit of requests per second")
+    fetch_options.add_argument("--links", default=LINKS_PATH, help="job links file written by `crawl`")
+    fetch_options.add_argument("--dataset-root", default=DATASET_ROOT, help="Parquet dataset folder")
+
+    command = commands.add_parser("login", parents=[browser_options], help="log in and save the session")
+    command.set_defaults(handler=login)
+
+    command = commands.add_parser("crawl", parents=[fetch_options], help="collect job links from the search pages")
+    command.add_argument("--titles", nargs="+", default=["Data Scientist"], help="job titles to search for")
+    command.add_argument("--pages", type=int, default=1, help="search pages per title")
+    command.add_argument("--preflight-pages", type=int, default=5, help="job pages sampled by the selector check (0: skip)")
+    command.add_argument("--resume", action="store_true", help="reuse the pages in data/crawl_journal.jsonl")
+    command.add_argument("--queue", help=f"also publish the links to this work queue, e.g. {QUEUE_URL} or redis://host:6379/0")
+    command.set_defaults(handler=crawl)
+
+    command = commands.add_parser("extract", parents=[fetch_options], help="extract the details of the crawled links")
+    command.add_argument("--workers", type=int, default=1, help="browsers (or HTTP sessions) used in parallel")
+    command.add_argument("--incremental", action="store_true", help="only new jobs, or jobs older than --refresh-days")
+    command.add_argument("--refresh-days", type=float, default=7)
+    command.set_defaults(handler=extract)
+
+    command = commands.add_parser("work", parents=[fetch_options], help="extract job links leased from a shared work queue")
+    command.add_argument("--queue", default=QUEUE_URL, help="SQLite file or redis://host:port/db")
+    command.add_argument("--worker-id", help="worker name, unique across hosts (default: hostname-pid)")
+    command.add_argument("--workers", type=int, default=1, help="browsers (or HTTP sessions) on this host")
+    command.add_argument("--batch-size", type=int, default=10, help="links leased at once")
+    command.add_argument("--lease-seconds", type=float, default=300, help="lease length, renewed after every job")
+    command.add_argument("--max-attempts", type=int, default=3, help="attempts per link, expired leases included")
+    command.add_argument("--keep-polling", action="store_true", help="wait for new links instead of stopping when the queue is empty")
+    command.set_defaults(handler=work)
+
+    command = commands.add_parser("collect", help="write the jobs finished by the workers to the Parquet dataset")
+    command.add_argument("--queue", default=QUEUE_URL, help="SQLite file or redis://host:port/db")
+    command.add_argument("--dataset-root", default=DATASET_ROOT, help="Parquet dataset folder")
+    command.add_argument("--batch-size", type=int, default=5000, help="jobs written per Parquet append")
+    command.add_argument("--requeue-failed", action="store_true", help="queue the failed links again")
+    command.set_defaults(handler=collect)
+
+    command = commands.add_parser("clean", help="clean the Parquet dataset and build the skills index")
+    command.add_argument("--dataset-root", default=DATASET_ROOT, help="Parquet dataset folder")
+    command.add_argument("--dates", help="comma separated scrape dates (default: every partition)")
+    command.add_argument("--keywords", nargs="+", default=KEYWORDS, help="relevant job keywords")
+    command.add_argument("--chunk-size", type=int, help="clean in chunks of this many rows (near-duplicates are removed within each chunk and against known reposts, but not across chunks of the same run)")
+    command.add_argument("--no-dedup", action="store_true", help="keep near-duplicate postings")
+    command.add_argument("--output", default=CLEAN_PATH)
+    command.set_defaults(handler=clean)
+
+    command = commands.add_parser("upload", help="upload the clean data to BigQuery")
+    command.add_argument("--input", default=CLEAN_PATH)
+    command.add_argument("--mode", choices=["replace", "incremental"], default="replace")
+    command.set_defaults(handler=upload)
+
+    command = commands.add_parser("bench", help="run a benchmark from benchmarks/")
+    command.add_argument("name", help="benchmark module, e.g. scraper, normalization, matching, startup")
+    command.add_argument("options", nargs=argparse.REMAINDER, help="options passed to the benchmark")
+    command.set_defaults(handler=bench)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    try:
+        args.handler(args)
+    except KeyboardInterrupt:
+        print("\n\nUser interruption detected. Stopping...")
@@ -1,15 +1,43 @@
 import os
-from utils.Scraping import *
-from utils.Cleaning_and_storing import *
+import argparse
+import pandas as pd
+from dotenv import dotenv_values
+from utils.Scraping import glints_login, open_worker_browsers, extract_all_job_details, extract_all_job_details_parallel, use_fallback_selectors
+from utils.Cleaning_and_storing import cek_nan, cleaning_nan, filter_relevan_job, clean_in_chunks, gbq_sink, upload_gbq, upload_skills_gbq
+from utils.Urls import job_uuid
+from utils.Fetching import HttpFetcher
+from utils.Pipeline import run_pipeline, csv_sink, parquet_sink
+from utils.Caching import PageCache
+from utils.Archiving import PageArchive
+from utils.Incremental import StateIndex, select_links_to_fetch
+from utils.Normalization import normalize_jobs, add_matched_keywords
+from utils.Parquet_storing import append_parquet, read_parquet, iter_parquet
+from utils.Warehouse_storing import BigQueryWarehouse, upload_incremental
+from utils.Scheduling import collect_job_links_multi
+from utils.Throttling import AdaptiveRateLimiter
+from utils.Checkpointing import CrawlJournal
+from utils.Metrics import METRICS
+from utils.Session import SessionStore
+from utils.Browser import build_options, open_browser
+from utils.Skills import SkillIndex
+from utils.Preflight import preflight, baseline_fill_rates, print_preflight
+from utils.Dedup import RepostIndex, mark_near_duplicates, drop_near_duplicates, skip_known_reposts
 
 
 
 if __name__ == "__main__":
-    
+
+    parser = argparse.ArgumentParser(description="Scrape Glints job postings and load them into BigQuery")
+    parser.add_argument("--resume", action="store_true", help="resume an interrupted crawl from data/crawl_journal.jsonl")
+    parser.add_argument("--preflight", action="store_true", help="only check the selectors on a few pages and exit")
+    args = parser.parse_args()
+
     env_data = dotenv_values("privacy/.env")
     # ---- Glints Configuration
     email_glints = env_data.get("GLINTS_EMAIL")
     password_glints = env_data.get("GLINTS_PASSWORD")
+    # sesi login disimpan terenkripsi, kunci dari SESSION_KEY (atau password Glints jika tidak diisi)
+    session = SessionStore(env_data.get("SESSION_KEY") or password_glints, "privacy/session.bin")
 
     # ---- BigQuery Configuration
     project_id = env_data.get("PROJECT_ID")
@@ -18,18 +46,42 @@ if __name__ == "__main__":
     key_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "privacy", key_json)
     # print(key_path)
 
+    # ---- Storage Configuration
+    dataset_root = "data/glints"    # dataset Parquet, dipartisi per tanggal scrape
+    upload_mode = "replace"         # "replace" (tulis ulang tabel) atau "incremental" (MERGE baris baru/berubah saja)
+    chunk_size = None               # mis. 50_000: cleaning dan upload per chunk, memori tetap untuk dataset besar
+    skills_index_path = "data/skills_index.npz"     # skill ID per posting, co-occurrence dan jumlah per provinsi/industri
+
+    # ---- Worker Configuration
+    lightweight_browser = True  # scrape profile: tanpa gambar, font, tracker dan cache disk, page load "eager"
+    fetch_backend = "selenium"  # "selenium" atau "http" (pakai cookie dari browser yang sudah login)
+    n_workers = 1       # jumlah browser yang dipakai untuk ekstraksi detail
+    max_rps = 2.0       # batas atas request per detik untuk semua worker; laju naik/turun otomatis mengikuti respons server
+    streaming = False   # True: pencarian link, ekstraksi detail dan cleaning berjalan bersamaan
+    use_cache = True    # simpan halaman detail di data/cache agar tidak perlu diunduh ulang
+    cache = PageCache("data/cache", ttl_hours=24, max_mb=500) if use_cache else None
+    archive_pages = True    # simpan HTML mentah di data/archive untuk re-parse offline (python reparse.py)
+    archive = PageArchive("data/archive") if archive_pages else None
+    incremental = False # True: hanya ambil detail job baru / lebih lama dari refresh_days, lalu gabung ke data lama
+    refresh_days = 7
+    dedup_postings = True   # gabungkan repost / job yang hampir sama (MinHash/LSH), repost yang sudah dikenal tidak diambil ulang
+    reposts = RepostIndex("data/reposts.json")
+    preflight_pages = 5     # cek selector pada beberapa halaman sebelum crawl (0: tanpa preflight)
+    report_path = "data/run_report.json"    # waktu per tahap, p50/p95, pages/sec dan waktu sleep
+    prometheus_path = None                  # mis. "data/run_report.prom" untuk format teks Prometheus
+    journal = CrawlJournal("data/crawl_journal.jsonl")  # checkpoint tiap batch, dipakai oleh --resume
+    if not args.resume:
+        journal.clear()
+
+    browsers = []
     try:
         # Konfigurasi Browser________________________________________ 1
-        options = Options()
-        options.add_argument("--headless")
-        # options.headless = True
-        options.set_preference('network.proxy.type', 0)  # Nonaktifkan proxy
-        options.set_preference("general.useragent.override", 
-                            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0")
-        browser = webdriver.Firefox(options=options)
+        options = build_options(lightweight=lightweight_browser)
+        browser = open_browser(options)
+        browsers.append(browser)
 
         # Proses Login_______________________________________________ 2
-        if glints_login(browser, email_glints, password_glints):
+        if glints_login(browser, email_glints, password_glints, session):
             print("Login success!!")
         else:
             print("Login failed!!")
@@ -37,44 +89,151 @@ if __name__ == "__main__":
             exit()
 
         # Scraping Data_____________________________________________ 3
-        job_title = "Data Scientist"
-        all_links = collect_job_links(browser, job_title, limit=1)
+        fetcher = HttpFetcher.from_browser(browser, pool_size=n_workers) if fetch_backend == "http" else browser
+
+        job_titles = ["Data Scientist"]    # beberapa keyword sekaligus, link dideduplikasi per job UUID
+        keywords = ['data', 'scientist', 'machine learning', 'big data', 'modeling', 'analytst', "analis"]
+
+        # Preflight: fill rate tiap field vs data lama, sebelum crawl penuh
+        if preflight_pages or args.preflight:
+            baseline = baseline_fill_rates(dataset_root)
+            health = preflight(fetcher, job_titles[0], baseline, n_pages=preflight_pages or 5)
+            print_preflight(health, baseline)
+            if args.preflight:
+                exit()
+            if health["mode"] == "abort":
+                print("Selectors no longer match the Glints pages, crawl aborted.")
+                exit()
+            if health["mode"] == "fallback":
+                print("Switching to fallback selectors.")
+                use_fallback_selectors()
+
+        if streaming:
+            if os.path.exists("data/Glints_CLEAN.csv") and not args.resume:
+                os.remove("data/Glints_CLEAN.csv")
+            if fetch_backend == "http":
+                detail_fetchers = [HttpFetcher.from_browser(browser) for _ in range(n_workers)]
+            else:
+                browsers.extend(open_worker_browsers(n_workers, options, email_glints, password_glints, session))
+                detail_fetchers = browsers[1:]
+            total = run_pipeline(fetcher, detail_fetchers, job_titles, sink=csv_sink("data/Glints_CLEAN.csv"),
+                                 limit=1, list_keyword=keywords, max_rps=max_rps,
+                                 raw_sink=parquet_sink(dataset_root), cache=cache, archive=archive, journal=journal)
+            print(f"\nSuccessfully streamed {total} jobs to {dataset_root} and Glints_CLEAN.csv")
+
+            df = pd.read_csv("data/Glints_CLEAN.csv", parse_dates=['post_time', 'obtained']) if os.path.exists("data/Glints_CLEAN.csv") else pd.DataFrame()
+            # job yang disimpan lagi dengan keyword tambahan: baris terakhir yang dipakai
+            df = df.drop_duplicates("url", keep="last") if not df.empty else df
+            # near-duplicate: seluruh hasil streaming sudah di memori, jadi dedup sekali di sini
+            if dedup_postings and not df.empty:
+                df = mark_near_duplicates(df)
+                reposts.update(df)
+                reposts.save()
+                df = drop_near_duplicates(df)
+                df.to_csv("data/Glints_CLEAN.csv", index=False)
+            if not df.empty:
+                print("\nUploading to Google Big Query...")
+                if upload_mode == "incremental":
+                    upload_incremental(df, BigQueryWarehouse(project_id, dataset_id, key_path))
+                else:
+                    upload_gbq(df,project_id,dataset_id,key_path=key_path)
+            journal.clear()
+            exit()
+
+        governor = AdaptiveRateLimiter(max_rps=max_rps)   # satu governor untuk pencarian dan ekstraksi detail
+        all_links, matched = collect_job_links_multi(fetcher, job_titles, limit=1, rate_limiter=governor, journal=journal)
         print(f"\nTotal job found: {len(all_links)}")
+        if dedup_postings:
+            all_links = skip_known_reposts(all_links, reposts)
+
+        if incremental:
+            state_index = StateIndex("data/state_index.json")
+            if not len(state_index):
+                state_index.seed_from_dataset(read_parquet(dataset_root, columns=["url", "obtained"]))
+            all_links = select_links_to_fetch(all_links, state_index, refresh_days=refresh_days)
 
-        result = extract_all_job_details(all_links, browser, split=50)
-        if not result:
+        if n_workers > 1 and fetch_backend == "http":
+            fetchers = [HttpFetcher.from_browser(browser) for _ in range(n_workers)]
+            result = extract_all_job_details_parallel(all_links, fetchers, max_rps=max_rps, cache=cache, archive=archive, rate_limiter=governor, journal=journal)
+        elif n_workers > 1:
+            browsers.extend(open_worker_browsers(n_workers-1, options, email_glints, password_glints, session))
+            result = extract_all_job_details_parallel(all_links, browsers, max_rps=max_rps, cache=cache, archive=archive, rate_limiter=governor, journal=journal)
+        else:
+            result = extract_all_job_details(all_links, fetcher, split=50, cache=cache, archive=archive, rate_limiter=governor, journal=journal)
+        if incremental:
+            state_index.mark_fetched([job_uuid(job["url"]) for job in result])
+            state_index.save()
+
+        if not result and not incremental:
             print("No job details found")
             browser.quit()
             exit()
-        df = pd.DataFrame(result)
 
-        # save to csv_______________________________________________ 4
-        df.to_csv(f"data/Glints_RAW.csv", index=False)
-        print(f"\nSuccessfully saved to CSV file, name: Glints_RAW.csv")
+        # save to parquet___________________________________________ 4
+        written = append_parquet(add_matched_keywords(normalize_jobs(pd.DataFrame(result)), matched), dataset_root) if result else []
 
         # cleaning__________________________________________________ 5
-        df = pd.read_csv("data/Glints_RAW.csv", parse_dates=['post_time', 'obtained'])
+        # mode incremental: seluruh dataset (data terbaru per job), selain itu hanya partisi hasil crawl ini
+        dates = None if incremental else written
+        if chunk_size:
+            print("\n Cleaning and uploading RAW data in chunks....")
+            chunks = iter_parquet(dataset_root, chunk_size, dates=dates)
+            chunk_reposts = reposts if dedup_postings else None    # dedup per chunk, lihat drop_chunk_duplicates
+            if upload_mode == "incremental":
+                warehouse = BigQueryWarehouse(project_id, dataset_id, key_path)
+                skill_index = clean_in_chunks(chunks, list_keyword=keywords, sink=lambda chunk: upload_incremental(chunk, warehouse),
+                                              reposts=chunk_reposts)
+            else:
+                skill_index = clean_in_chunks(chunks, list_keyword=keywords, sink=gbq_sink(project_id, dataset_id, key_path),
+                                              reposts=chunk_reposts)
+                if len(skill_index):
+                    upload_skills_gbq(skill_index, project_id, dataset_id, key_path)
+            skill_index.save(skills_index_path)
+            journal.clear()
+            exit()
+
+        df = read_parquet(dataset_root, dates=dates)
+        if incremental:
+            print(f"Merged new jobs into the stored dataset: {len(df)} jobs in total")
         print("\n Cleaning RAW data....")
         # clening NAN
         list_nan = cek_nan(df)
         df = cleaning_nan(df, list_na=list_nan)
         print(f"Cleaning NAN Succesfully: {df.shape[0]} baris, {df.shape[1]} kolom")
         # cleaning relevan job
-        keywords = ['data', 'scientist', 'machine learning', 'big data', 'modeling', 'analytst', "analis"]
         df = filter_relevan_job(df,list_keyword=keywords)
         print(f"\nSuccessfully filter ({df.shape[0]}) data to relevan job")
+        # near-duplicate: hanya posting kanonik yang dihitung dan diunggah
+        if dedup_postings and not df.empty:
+            df = mark_near_duplicates(df)
+            reposts.update(df)
+            reposts.save()
+            df = drop_near_duplicates(df)
 
-        # Storing to Google Big Query______________________________ 6
+        # Skills index______________________________________________ 6
+        skill_index = SkillIndex().add(df)
+        skill_index.save(skills_index_path)
+        print(f"Skills index: {len(skill_index.names)} canonical skills, {len(skill_index.pairs)} skill pairs")
+
+        # Storing to Google Big Query______________________________ 7
         if not df.empty:
             print("\nUploading to Google Big Query...")
-            upload_gbq(df,project_id,dataset_id,key_path=key_path)
+            if upload_mode == "incremental":
+                upload_incremental(df, BigQueryWarehouse(project_id, dataset_id, key_path))
+            else:
+                upload_gbq(df,project_id,dataset_id,key_path=key_path, skill_index=skill_index)
+        journal.clear()
 
 
     except KeyboardInterrupt:
         print("\n\nUser interruption detected. Stopping...")
+        print(f"Progress is saved in {journal.path}, run `python main.py --resume` to continue.")
     except Exception as e:
         print(f"\nUnexpected error: {str(e)}")
         print("The program is now shutting down properly.")
+        print(f"Progress is saved in {journal.path}, run `python main.py --resume` to continue.")
     finally:
-        browser.quit()
+        for browser in browsers:
+            browser.quit()
         print("Browser session terminated\n")
+        METRICS.write_report(report_path, prometheus_path=prometheus_path)
@@ -0,0 +1,29 @@
+import pandas as pd
+from utils.Archiving import reparse_archive
+from utils.Normalization import normalize_jobs
+from utils.Parquet_storing import append_parquet, read_parquet
+from utils.Urls import job_uuid
+
+
+if __name__ == "__main__":
+
+    # ---- Re-parse Configuration
+    archive_dir = "data/archive"
+    dataset_root = "data/glints"
+    processes = None    # None = semua core
+
+    # Re-parse seluruh arsip HTML tanpa request ke glints.com
+    result = reparse_archive(archive_dir, processes=processes)
+    if not result:
+        print("No archived pages found")
+        exit()
+
+    df = normalize_jobs(pd.DataFrame(result))
+
+    # keyword pencarian tidak ada di halaman job: ambil dari dataset yang sudah ada
+    stored = read_parquet(dataset_root, columns=["url", "matched_keywords"]).dropna()
+    df["matched_keywords"] = df["url"].map(job_uuid).map(dict(zip(stored["url"].map(job_uuid), stored["matched_keywords"])))
+
+    print(f"\nRe-parsed {df.shape[0]} archived jobs")
+    # obtained = waktu fetch asli, jadi setiap record menggantikan record lama di partisinya (per UUID)
+    append_parquet(df, dataset_root)
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_server import StubGlints, build_jobs  # noqa: E402
+
+
+SAMPLE_PATH = os.path.join(ROOT, "data", "Glints_RAW.csv")
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+
+
+@pytest.fixture(scope="module")
+def stub_jobs():
+    return build_jobs(45, sample_path=SAMPLE_PATH, seed=1)
+
+
+@pytest.fixture
+def stub(stub_jobs):
+    """Local glints.com stand-in serving `stub_jobs` (2 search pages)."""
+    with StubGlints(stub_jobs) as server:
+        yield server
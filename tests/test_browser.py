@@ -0,0 +1,16 @@
+from urllib.parse import unquote
+
+from utils.Browser import build_options
+
+
+def test_blocked_hosts_do_not_fail_over_to_direct():
+    preferences = build_options(blocked_hosts=["hotjar.com"]).preferences
+    assert preferences["network.proxy.type"] == 2
+    assert preferences["network.proxy.failover_direct"] is False
+    assert "hotjar.com" in unquote(preferences["network.proxy.autoconfig_url"])
+
+
+def test_full_profile_uses_no_proxy():
+    preferences = build_options(lightweight=False).preferences
+    assert preferences["network.proxy.type"] == 0
+    assert "network.proxy.autoconfig_url" not in preferences
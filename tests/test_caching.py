@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+
+from utils.Caching import PageCache, file_lock
+
+
+def test_processes_sharing_a_cache_keep_each_others_entries(tmp_path):
+    # dua proses `work` pada host yang sama, masing-masing dengan PageCache sendiri
+    first = PageCache(str(tmp_path), ttl_hours=24)
+    second = PageCache(str(tmp_path), ttl_hours=24)
+    first.put("job-a", "<html>a</html>")
+    second.put("job-b", "<html>b</html>")
+    first.save()
+    second.save()
+
+    reopened = PageCache(str(tmp_path), ttl_hours=24)
+    assert sorted(reopened.index) == ["job-a", "job-b"]
+    assert reopened.lookup("job-a")[0] == "<html>a</html>"
+
+
+def test_entries_evicted_by_another_process_are_dropped(tmp_path):
+    first = PageCache(str(tmp_path), ttl_hours=24)
+    first.put("job-a", "<html>a</html>")
+    first.put("job-b", "<html>b</html>")
+    first.save()
+
+    second = PageCache(str(tmp_path), ttl_hours=24)
+    os.remove(second._path("job-a"))
+    second.save()
+    first.save()
+
+    assert sorted(PageCache(str(tmp_path)).index) == ["job-b"]
+
+
+def test_put_leaves_no_partial_page(tmp_path):
+    cache = PageCache(str(tmp_path), ttl_hours=24)
+    cache.put("job-a", "<html>old</html>")
+    cache.put("job-a", "<html>new</html>")
+    assert sorted(os.listdir(tmp_path)) == ["job-a.html.gz"]
+    assert cache.lookup("job-a")[0] == "<html>new</html>"
+
+
+def _count_under_lock(lock_path:str, counter_path:str, n:int) -> None:
+    for _ in range(n):
+        with file_lock(lock_path):
+            with open(counter_path) as f:
+                value = int(f.read())
+            with open(counter_path, "w") as f:
+                f.write(str(value + 1))
+
+
+def _crash_holding_lock(lock_path:str) -> None:
+    with file_lock(lock_path):
+        os._exit(1)
+
+
+def test_file_lock_is_exclusive_between_processes(tmp_path):
+    lock_path, counter_path = str(tmp_path / "index.json.lock"), str(tmp_path / "counter")
+    with open(counter_path, "w") as f:
+        f.write("0")
+    workers = [multiprocessing.Process(target=_count_under_lock, args=(lock_path, counter_path, 50)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with open(counter_path) as f:
+        assert int(f.read()) == 200
+
+
+def test_lock_of_a_crashed_process_is_released(tmp_path):
+    lock_path = str(tmp_path / "index.json.lock")
+    crashed = multiprocessing.Process(target=_crash_holding_lock, args=(lock_path,))
+    crashed.start()
+    crashed.join()
+    assert crashed.exitcode == 1
+    with file_lock(lock_path):
+        pass
@@ -0,0 +1,66 @@
+from benchmarks.stub_server import StubFetcher
+from utils.Checkpointing import CrawlJournal
+from utils.Scheduling import collect_job_links_multi
+from utils.Scraping import extract_all_job_details_parallel
+from utils.Throttling import AdaptiveRateLimiter
+
+
+def fast_governor() -> AdaptiveRateLimiter:
+    # tanpa batas politeness, server lokal
+    return AdaptiveRateLimiter(max_rps=1e6, start_rps=1e6, min_rps=1e3)
+
+
+def record(n:int) -> dict:
+    return {"url": f"https://glints.com/id/opportunities/jobs/job-{n}/{n:08d}-0000-0000-0000-000000000000", "job_name": f"Job {n}"}
+
+
+def test_journal_survives_a_restart(tmp_path):
+    path = str(tmp_path / "crawl_journal.jsonl")
+    journal = CrawlJournal(path)
+    journal.log_page("Data Scientist", 1, ["/id/opportunities/jobs/job-1/a"], last_page=3)
+    journal.log_records([record(1), None, record(2)])
+
+    reopened = CrawlJournal(path)
+    assert reopened.page("Data Scientist", 1) == (["/id/opportunities/jobs/job-1/a"], 3)
+    assert reopened.page("Data Scientist", 2) is None
+    assert reopened.record(record(2)["url"]) == record(2)
+    # link relatif dari halaman pencarian
+    assert reopened.record(record(1)["url"].replace("https://glints.com", "")) == record(1)
+
+
+def test_line_cut_by_a_crash_is_ignored(tmp_path):
+    path = str(tmp_path / "crawl_journal.jsonl")
+    CrawlJournal(path).log_records([record(1)])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"kind": "records", "records": [{"url": "https://glints.com/id/opp')
+
+    assert [job["url"] for job in CrawlJournal(path).records()] == [record(1)["url"]]
+
+
+def test_clear_starts_a_new_crawl(tmp_path):
+    path = str(tmp_path / "crawl_journal.jsonl")
+    journal = CrawlJournal(path)
+    journal.log_records([record(1)])
+    journal.clear()
+    assert journal.records() == [] and CrawlJournal(path).records() == []
+
+
+def test_resumed_crawl_only_requests_what_is_missing(stub, stub_jobs, tmp_path):
+    path = str(tmp_path / "crawl_journal.jsonl")
+    fetcher = StubFetcher(stub.url)
+
+    #--------------------------- - 1. Run pertama, berhenti setelah sebagian job
+    journal = CrawlJournal(path)
+    links, _ = collect_job_links_multi(fetcher, ["Data Scientist"], rate_limiter=fast_governor(), journal=journal)
+    first = extract_all_job_details_parallel(links[:20], [fetcher], rate_limiter=fast_governor(), journal=journal, checkpoint_every=5)
+    assert len(first) == 20
+
+    #--------------------------- - 2. Resume: halaman pencarian dan 20 job pertama dari journal
+    requests_before = stub.requests
+    journal = CrawlJournal(path)
+    resumed_links, _ = collect_job_links_multi(fetcher, ["Data Scientist"], rate_limiter=fast_governor(), journal=journal)
+    jobs = extract_all_job_details_parallel(resumed_links, [fetcher, StubFetcher(stub.url)], rate_limiter=fast_governor(), journal=journal)
+
+    assert resumed_links == links
+    assert stub.requests - requests_before == len(links) - 20
+    assert [job["job_name"] for job in jobs] == list(stub_jobs["job_name"])
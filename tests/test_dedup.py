@@ -0,0 +1,43 @@
+import datetime as dt
+import json
+
+import pandas as pd
+
+from utils.Dedup import RepostIndex, drop_chunk_duplicates
+
+
+def posting(n:int, name:str="Senior Data Analyst", company:str="PT Maju", days:int=0) -> dict:
+    return {"url": f"https://glints.com/id/opportunities/jobs/job-{n}/{n:08d}-0000-0000-0000-000000000000",
+            "job_name": name, "company_name": company, "city": "Jakarta Selatan", "province": "DKI Jakarta",
+            "skills_requirements": "SQL, Python, Tableau", "post_time": pd.Timestamp("2026-10-01") + pd.Timedelta(days=days)}
+
+
+def test_old_entries_expire(tmp_path):
+    path = tmp_path / "reposts.json"
+    old = (dt.datetime.now() - dt.timedelta(days=40)).isoformat()
+    recent = dt.datetime.now().isoformat()
+    path.write_text(json.dumps({"reposts": {"a": "x", "b": "y"}, "seen": {"a": old, "b": recent}}))
+
+    index = RepostIndex(str(path), max_age_days=30)
+    assert index.reposts == {"b": "y"}
+
+
+def test_old_format_is_loaded(tmp_path):
+    path = tmp_path / "reposts.json"
+    path.write_text(json.dumps({"a": "x"}))
+
+    index = RepostIndex(str(path))
+    assert index.canonical("a") == "x"
+    index.save()
+    assert set(json.loads(path.read_text())) == {"reposts", "seen"}
+
+
+def test_chunk_duplicates_and_known_reposts_are_dropped(tmp_path):
+    index = RepostIndex(str(tmp_path / "reposts.json"))
+    first = drop_chunk_duplicates(pd.DataFrame([posting(1), posting(2, days=3), posting(3, name="Backend Engineer", company="PT Lain")]), index)
+    assert sorted(first["job_uuid"].str[:8]) == ["00000001", "00000003"]
+    assert index.canonical(posting(2)["url"].rsplit("/", 1)[1]) == first["job_uuid"].iloc[0]
+
+    # chunk berikutnya: repost yang sudah dikenal tidak dihitung lagi
+    second = drop_chunk_duplicates(pd.DataFrame([posting(2, days=3), posting(4, name="Product Designer", company="PT Baru")]), index)
+    assert list(second["job_uuid"].str[:8]) == ["00000004"]
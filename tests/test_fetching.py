@@ -0,0 +1,116 @@
+import pytest
+import requests
+
+from benchmarks.stub_server import StubGlints, StubFetcher, SEARCH_PATH
+from utils.Fetching import HttpFetcher, SeleniumFetcher, ThrottledError, TRANSIENT_ERRORS, PERMANENT_ERRORS, as_fetcher
+from utils.Scraping import collect_job_links, extract_all_job_details
+from utils.Throttling import AdaptiveRateLimiter
+
+
+def fast_governor() -> AdaptiveRateLimiter:
+    # tanpa batas politeness, server lokal
+    return AdaptiveRateLimiter(max_rps=1e6, start_rps=1e6, min_rps=1e3)
+
+
+def test_get_html_returns_the_page(stub):
+    html = HttpFetcher().get_html(f"{stub.url}{SEARCH_PATH}?page=1")
+    assert 'id="__next"' in html
+    assert html.count("JobCardsc__JobcardContainer") == 30
+
+
+def test_conditional_get_without_validators_returns_the_page(stub, stub_jobs):
+    html, etag, last_modified = HttpFetcher().get_html_conditional(stub.url + stub_jobs["path"][0])
+    assert stub_jobs["job_name"][0].split("&")[0] in html
+    assert (etag, last_modified) == (None, None)
+
+
+def test_keep_alive_session_is_reused(stub, stub_jobs):
+    fetcher = HttpFetcher(pool_size=2)
+    for path in stub_jobs["path"][:5]:
+        fetcher.get_html(stub.url + path)
+    assert stub.requests == 5
+    assert len(fetcher.session.adapters["http://"].poolmanager.pools) == 1
+
+
+def test_throttling_response_is_transient(stub_jobs):
+    with StubGlints(stub_jobs, error_rate=1.0) as stub:
+        with pytest.raises(ThrottledError):
+            HttpFetcher().get_html(stub.url + stub_jobs["path"][0])
+
+
+def test_missing_page_fails_fast(stub):
+    with pytest.raises(PERMANENT_ERRORS) as error:
+        HttpFetcher().get_html(f"{stub.url}/id/opportunities/jobs/closed/00000000-0000-0000-0000-000000000000")
+    assert not isinstance(error.value, TRANSIENT_ERRORS)
+    assert error.value.response.status_code == 404
+
+
+def test_from_browser_copies_cookies_and_user_agent():
+    class Browser:
+        def execute_script(self, script):
+            return "Mozilla/5.0 (X11; Linux x86_64; rv:137.0) Gecko/20100101 Firefox/137.0"
+
+        def get_cookies(self):
+            return [{"name": "session", "value": "abc", "domain": ".glints.com", "path": "/"}]
+
+    fetcher = HttpFetcher.from_browser(Browser())
+    assert fetcher.session.headers["User-Agent"].endswith("Firefox/137.0")
+    assert fetcher.session.cookies.get("session", domain=".glints.com") == "abc"
+
+
+class TitledBrowser:
+    """WebDriver stand-in serving a single page with the given title."""
+
+    def __init__(self, title:str):
+        self.title = title
+        self.page_source = f"<html><head><title>{title}</title></head></html>"
+
+    def get(self, url):
+        pass
+
+
+@pytest.mark.parametrize("title", ["429 Too Many Requests", "Too Many Requests", " 503 Service Temporarily Unavailable "])
+def test_selenium_throttle_page_is_transient(title):
+    with pytest.raises(ThrottledError):
+        SeleniumFetcher(TitledBrowser(title)).get_html("https://glints.com/id/opportunities/jobs/explore")
+
+
+@pytest.mark.parametrize("title", ["Lowongan Kerja 429 Data Analyst di Jakarta | Glints",
+                                   "Customer Service (Too Many Requests Team) - Glints"])
+def test_selenium_job_title_with_throttle_words_is_a_page(title):
+    fetcher = SeleniumFetcher(TitledBrowser(title))
+    assert title in fetcher.get_html("https://glints.com/id/opportunities/jobs/explore")
+
+
+def test_as_fetcher_keeps_fetchers():
+    fetcher = HttpFetcher()
+    assert as_fetcher(fetcher) is fetcher
+
+
+def test_crawl_with_http_backend(stub, stub_jobs):
+    fetcher = StubFetcher(stub.url)
+    governor = fast_governor()
+
+    links = collect_job_links(fetcher, "Data Scientist", rate_limiter=governor)
+    assert [link.split("?")[0] for link in links] == list(stub_jobs["path"])
+
+    jobs = extract_all_job_details(links, fetcher, split=20, rate_limiter=governor)
+    assert [job["job_name"] for job in jobs] == list(stub_jobs["job_name"])
+    assert all(job["url"].startswith("https://glints.com/") for job in jobs)
+
+
+def test_crawl_recovers_from_throttling(stub_jobs):
+    with StubGlints(stub_jobs, error_rate=0.2, seed=3) as stub:
+        fetcher = StubFetcher(stub.url)
+        links = [path + "?utm_referrer=explore" for path in stub_jobs["path"]]
+        jobs = extract_all_job_details(links, fetcher, split=50, rate_limiter=fast_governor())
+        assert stub.errors > 0
+    # setiap link punya 3 percobaan: hampir semua job tetap didapat
+    assert len(jobs) >= len(links) - 2
+    assert len({job["url"] for job in jobs}) == len(jobs)
+
+
+def test_requests_exceptions_are_classified():
+    assert issubclass(requests.Timeout, TRANSIENT_ERRORS)
+    assert issubclass(requests.ConnectionError, TRANSIENT_ERRORS)
+    assert not issubclass(requests.HTTPError, TRANSIENT_ERRORS)
@@ -0,0 +1,55 @@
+import datetime as dt
+
+import pandas as pd
+
+from utils.Incremental import StateIndex, select_links_to_fetch
+from utils.Urls import job_uuid
+
+
+def link(n:int, trace:str="a") -> str:
+    return f"https://glints.com/id/opportunities/jobs/data-analyst/{n:08d}-0000-0000-0000-000000000000?utm_referrer=explore&traceInfo={trace}"
+
+
+def days_ago(days:float) -> str:
+    return (dt.datetime.now() - dt.timedelta(days=days)).isoformat()
+
+
+def test_only_new_and_outdated_jobs_are_fetched(tmp_path):
+    index = StateIndex(str(tmp_path / "state_index.json"))
+    index.jobs = {job_uuid(link(1)): {"last_seen": days_ago(1), "last_fetched": days_ago(1)},
+                  job_uuid(link(2)): {"last_seen": days_ago(1), "last_fetched": days_ago(10)},
+                  job_uuid(link(3)): {"last_seen": days_ago(1), "last_fetched": None}}
+
+    selected = select_links_to_fetch([link(1), link(2), link(3), link(4)], index, refresh_days=7)
+    assert selected == [link(2), link(3), link(4)]
+
+
+def test_duplicate_links_of_a_job_are_fetched_once(tmp_path):
+    index = StateIndex(str(tmp_path / "state_index.json"))
+    assert select_links_to_fetch([link(1, "a"), link(1, "b"), link(2)], index) == [link(1, "a"), link(2)]
+
+
+def test_seen_and_fetched_survive_a_restart(tmp_path):
+    path = str(tmp_path / "state_index.json")
+    index = StateIndex(path)
+    selected = select_links_to_fetch([link(1), link(2)], index)
+    index.mark_fetched([job_uuid(url) for url in selected[:1]])
+    index.save()
+
+    reopened = StateIndex(path)
+    assert len(reopened) == 2
+    assert reopened.jobs[job_uuid(link(2))]["last_fetched"] is None
+    assert select_links_to_fetch([link(1), link(2)], reopened) == [link(2)]
+
+
+def test_seed_from_dataset_keeps_known_state(tmp_path):
+    index = StateIndex(str(tmp_path / "state_index.json"))
+    index.mark_fetched([job_uuid(link(1))])
+    before = dict(index.jobs[job_uuid(link(1))])
+
+    stored = pd.DataFrame({"url": [link(1), link(2)], "obtained": [days_ago(30), days_ago(2)]})
+    index.seed_from_dataset(stored)
+
+    assert index.jobs[job_uuid(link(1))] == before
+    assert not index.needs_fetch(job_uuid(link(2)), refresh_days=7)
+    assert index.needs_fetch(job_uuid(link(2)), refresh_days=1)
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from utils import Matching
+from utils.Cleaning_and_storing import filter_relevan_job
+from utils.Matching import KeywordMatcher, tag_keywords
+
+
+KEYWORDS = ["data", "data scientist", "scientist", "science", "ai", "c++", "analyst", "ana", "nalyst", "sql"]
+
+TEXTS = [
+    "Senior Data Scientist",
+    "data science lead",
+    "Business Analyst (SQL)",
+    "C++ Developer",
+    "Maintenance Engineer",      # "ai" di dalam kata lain
+    "Bigdata Engineer",          # "data" tanpa batas kata
+    "Banana",                    # "ana" berulang dan tumpang tindih
+    "",
+    None,
+]
+
+
+def pure_python(keywords) -> KeywordMatcher:
+    original = Matching.ahocorasick
+    Matching.ahocorasick = None
+    try:
+        return KeywordMatcher(keywords)
+    finally:
+        Matching.ahocorasick = original
+
+
+def test_pure_python_automaton_matches_pyahocorasick():
+    pytest.importorskip("ahocorasick")
+    fallback, native = pure_python(KEYWORDS), KeywordMatcher(KEYWORDS)
+    assert isinstance(fallback.automaton, Matching._Automaton)
+    assert isinstance(native.automaton, Matching._PyAhoCorasick)
+
+    texts = pd.Series(TEXTS)
+    assert fallback.match(texts).tolist() == native.match(texts).tolist()
+    assert fallback.mask(texts).tolist() == native.mask(texts).tolist()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Senior Data Scientist", ("data", "data scientist", "scientist")),
+    ("Business Analyst (SQL)", ("analyst", "ana", "nalyst", "sql")),
+    ("Banana", ("ana",)),
+    ("Maintenance Engineer", ("ai",)),   # substring, bukan per kata (sama dengan filter lama)
+    ("Bigdata Engineer", ("data",)),
+    ("C++ Developer", ("c++",)),
+    ("Marketing", ()),
+])
+def test_overlapping_keywords_and_substrings(text, expected):
+    assert pure_python(KEYWORDS).find(text) == expected
+
+
+def test_taxonomy_tags():
+    taxonomy = {"Data": ["data", "analyst"], "Engineering": ["engineer", "developer"]}
+    df = pd.DataFrame({"job_name": ["Data Engineer", "Sales"], "skills_requirements": ["SQL", "Excel, Data"],
+                       "another_requirements": [None, None]})
+    assert tag_keywords(df, taxonomy)["matched_tags"].tolist() == ["Data, Engineering", "Data"]
+
+
+def test_filter_relevan_job_tags_the_kept_rows():
+    df = pd.DataFrame({"job_name": ["Data Analyst", "Sales Manager", "Machine Learning Engineer"],
+                       "skills_requirements": ["SQL, Python", "Data", "Python, SQL"],
+                       "another_requirements": ["Unspecified", "Unspecified", "Unspecified"]})
+    filtered = filter_relevan_job(df, list_keyword=["data", "machine learning", "sql"])
+    assert filtered["job_name"].tolist() == ["Data Analyst", "Machine Learning Engineer"]
+    assert filtered["matched_tags"].tolist() == ["data, sql", "machine learning, sql"]
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from utils.Metrics import BUCKETS, Metrics, timed, METRICS
+
+
+def test_small_runs_are_reported_exactly():
+    metrics = Metrics()
+    for seconds in [0.2, 0.02, 0.6, 0.04, 3.0]:
+        metrics.observe("fetch_page", seconds)
+    metrics.count("job_errors")
+    metrics.count("job_errors", 2)
+
+    report = metrics.report()
+    stage = report["stages"]["fetch_page"]
+    assert (stage["count"], stage["total"], stage["max"]) == (5, 3.86, 3.0)
+    assert (stage["p50"], stage["p95"]) == (0.2, 3.0)
+    assert stage["buckets"] == {"0.01": 0, "0.05": 2, "0.1": 2, "0.25": 3, "0.5": 3, "1": 4,
+                                "2.5": 4, "5": 5, "10": 5, "30": 5, "60": 5}
+    assert report["pages"] == 5
+    assert report["counters"] == {"job_errors": 3}
+
+
+def test_memory_is_bounded_on_long_runs():
+    metrics = Metrics(reservoir_size=500)
+    rng = random.Random(1)
+    values = [rng.uniform(0, 2) for _ in range(100_000)]
+    for seconds in values:
+        metrics.observe("page_load", seconds)
+
+    assert len(metrics.timers["page_load"].sample) == 500
+    stage = metrics.report()["stages"]["page_load"]
+    # count, total, max dan histogram tetap tepat
+    assert stage["count"] == 100_000
+    assert stage["total"] == pytest.approx(sum(values))
+    assert stage["max"] == round(max(values), 6)
+    assert stage["buckets"]["1"] == sum(v <= 1 for v in values)
+    # persentil dari sampel: dekat dengan nilai sebenarnya
+    assert stage["p50"] == pytest.approx(1.0, abs=0.15)
+    assert stage["p95"] == pytest.approx(1.9, abs=0.1)
+
+
+def test_sleep_and_prometheus_output():
+    metrics = Metrics()
+    metrics.observe("sleep", 1.5)
+    metrics.observe("sleep", 0.5)
+    metrics.count("page_errors")
+
+    assert metrics.report()["sleep_seconds"] == 2.0
+    text = metrics.to_prometheus()
+    assert 'glints_sleep_seconds_bucket{le="+Inf"} 2' in text
+    assert f'glints_sleep_seconds_bucket{{le="{BUCKETS[-1]}"}} 2' in text
+    assert "glints_page_errors_total 1" in text
+
+
+def test_timed_records_every_call_even_when_it_fails():
+    METRICS.reset()
+
+    @timed("parse_job_details")
+    def parse(fail:bool):
+        if fail:
+            raise ValueError("bad page")
+
+    parse(False)
+    with pytest.raises(ValueError):
+        parse(True)
+    assert METRICS.report()["stages"]["parse_job_details"]["count"] == 2
+    METRICS.reset()
@@ -0,0 +1,96 @@
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from conftest import SAMPLE_PATH
+from utils.Normalization import parse_post_time, parse_salary
+
+
+NOW = dt.datetime(2026, 10, 18, 9, 30, 15)
+
+
+# ______ Perilaku lama (baseline), sebagai acuan
+
+def old_salary(salary:str) -> tuple:
+    """salary_min / salary_max of the old Scraping.extract_job_details + cleaning_nan."""
+    series = pd.Series([salary])
+    salary_min = series.str.extract(r'IDR([\d\.]+)\s*-\s*\d+')[0].str.replace('.', '').astype(float).values[0]
+    salary_max = series.str.extract(r'IDR[\d\.]+\s*-\s*([\d\.]+)')[0].str.replace('.', '').astype(float).values[0]
+    single = series.str.extract(r'IDR([\d\.]+)\/Bulan')[0].str.replace('.', '').astype(float).values[0]
+    return (single if np.isnan(salary_min) else salary_min), (single if np.isnan(salary_max) else salary_max)
+
+
+def old_exctract_time(post_time:str, now:dt.datetime) -> str:
+    """The old Scraping.exctract_time, with `now` passed in."""
+    text = post_time.lower()
+    if "menit" in text:
+        value = now - pd.Timedelta(minutes=int(post_time.split(" ")[0]))
+    elif "jam" in text:
+        value = now - pd.Timedelta(hours=int(post_time.split(" ")[0]))
+    elif "kemarin" in text:
+        value = now - pd.Timedelta(days=1)
+    elif "hari" in text:
+        value = now - pd.Timedelta(days=int(post_time.split(" ")[0]))
+    elif "bulan" in text:
+        value = now - relativedelta(months=int(post_time.split(" ")[0]))
+    elif "tahun" in text:
+        value = now - relativedelta(years=int(post_time.split(" ")[0]))
+    else:
+        return None
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+@pytest.fixture(scope="module")
+def sample():
+    if not os.path.exists(SAMPLE_PATH):
+        pytest.skip("no sample dataset")
+    return pd.read_csv(SAMPLE_PATH)
+
+
+# ______ Salary
+
+def test_salary_matches_the_old_parser_on_the_sample(sample):
+    parsed = parse_salary(sample["salary_range"])
+    for salary, (salary_min, salary_max) in zip(sample["salary_range"], parsed[["salary_min", "salary_max"]].to_numpy()):
+        expected = old_salary(salary)
+        np.testing.assert_equal((salary_min, salary_max), expected, err_msg=salary)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("IDR7.000.000 - 10.000.000/Bulan", (7_000_000, 10_000_000, "IDR", "month")),
+    ("Rp5.000.000/Bulan", (5_000_000, 5_000_000, "IDR", "month")),
+    ("rp 4.500.000 - 6.000.000/bulan", (4_500_000, 6_000_000, "IDR", "month")),
+    ("IDR7.500.000,50/Bulan", (7_500_000.5, 7_500_000.5, "IDR", "month")),
+    ("USD1,500.50/Month", (1_500.5, 1_500.5, "USD", "month")),
+    ("SGD 3,000 - 4,500/month", (3_000, 4_500, "SGD", "month")),
+    ("usd25/hour", (25, 25, "USD", "hour")),
+])
+def test_salary_separators_follow_the_currency(text, expected):
+    row = parse_salary(pd.Series([text])).iloc[0]
+    assert (row["salary_min"], row["salary_max"], row["salary_currency"], row["salary_period"]) == expected
+
+
+def test_unknown_salary_is_missing():
+    parsed = parse_salary(pd.Series(["Unspecified", "Negotiable", None]))
+    assert parsed["salary_min"].isna().all() and parsed["salary_max"].isna().all()
+
+
+# ______ Post time
+
+def test_post_time_matches_the_old_parser_on_the_sample(sample):
+    texts = pd.concat([sample["last_post"], pd.Series(["5 menit yang lalu", "2 jam yang lalu", "kemarin", "baru saja"])],
+                      ignore_index=True)
+    parsed = parse_post_time(texts, pd.Timestamp(NOW))
+    for text, value in zip(texts, parsed):
+        expected = old_exctract_time(text, NOW)
+        assert (None if pd.isna(value) else value.strftime("%Y-%m-%d %H:%M:%S")) == expected, text
+
+
+def test_post_time_uses_the_reference_of_every_row():
+    reference = pd.Series(pd.to_datetime(["2026-10-18 10:00:00", "2026-03-31 08:00:00"]))
+    parsed = parse_post_time(pd.Series(["3 hari yang lalu", "1 bulan yang lalu"]), reference)
+    assert parsed.tolist() == [pd.Timestamp("2026-10-15 10:00:00"), pd.Timestamp("2026-02-28 08:00:00")]
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_PATH
+from utils.Normalization import normalize_jobs
+from utils.Parquet_storing import append_parquet, read_parquet, iter_parquet
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Two partitions: an old one without `matched_keywords` and with `salary_currency` all null,
+    and a newer one that has both."""
+    raw = pd.read_csv(SAMPLE_PATH)
+    old = normalize_jobs(raw.iloc[:13]).assign(obtained="2025-01-01 10:00:00", salary_currency=None)
+    new = normalize_jobs(raw.iloc[13:40]).assign(obtained="2025-02-01 10:00:00", matched_keywords="Data Scientist")
+    append_parquet(old, str(tmp_path))
+    append_parquet(new, str(tmp_path))
+    return str(tmp_path), new
+
+
+def test_columns_of_newer_partitions_are_kept(dataset):
+    root, new = dataset
+    df = read_parquet(root)
+    assert df["matched_keywords"].notna().sum() == len(new)
+    assert read_parquet(root, columns=["url", "matched_keywords"])["matched_keywords"].notna().sum() == len(new)
+
+
+def test_null_column_of_an_old_partition_does_not_null_the_others(dataset):
+    root, new = dataset
+    currency = read_parquet(root, dates=["2025-02-01"])["salary_currency"]
+    assert read_parquet(root)["salary_currency"].notna().sum() == currency.notna().sum() > 0
+    assert "salary_currency" in read_parquet(root, dates=["2025-01-01"])
+
+
+def test_chunks_have_the_same_columns(dataset):
+    root, _ = dataset
+    chunks = list(iter_parquet(root, chunk_size=10))
+    assert len({tuple(chunk.columns) for chunk in chunks}) == 1
+    assert sum(len(chunk) for chunk in chunks) == len(read_parquet(root))
+    assert all(list(chunk.columns) == ["url", "matched_keywords"] for chunk in iter_parquet(root, 100, columns=["url", "matched_keywords"]))
+
+
+def test_missing_dataset_is_empty(tmp_path):
+    assert read_parquet(str(tmp_path / "missing"), columns=["url"]).empty
+    assert list(iter_parquet(str(tmp_path / "missing"))) == []
@@ -0,0 +1,92 @@
+import glob
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from utils.Parsing import Bs4JobParser, LxmlJobParser, MissingFieldError, JOB_FIELDS, FALLBACK_JOB_FIELDS, check_parity, lxml_html, prefix_selector
+
+
+PAGES = {os.path.basename(path): open(path, encoding="utf-8").read()
+         for path in sorted(glob.glob(os.path.join(FIXTURES, "job_pages", "*.html")))}
+
+requires_lxml = pytest.mark.skipif(lxml_html is None, reason="lxml and cssselect are not installed")
+
+
+def parse(parser, html:str):
+    try:
+        return parser.parse(html)
+    except MissingFieldError as e:
+        return f"MissingFieldError: {e}"
+
+
+@requires_lxml
+@pytest.mark.parametrize("fields", [JOB_FIELDS, FALLBACK_JOB_FIELDS], ids=["primary", "fallback"])
+@pytest.mark.parametrize("name", list(PAGES))
+def test_lxml_matches_html_parser(name, fields):
+    html = PAGES[name]
+    assert parse(LxmlJobParser(fields), html) == parse(Bs4JobParser(fields), html)
+
+
+@requires_lxml
+def test_check_parity_over_saved_pages():
+    assert check_parity(list(PAGES.values())) == []
+
+
+@pytest.mark.parametrize("backend", [Bs4JobParser, pytest.param(LxmlJobParser, marks=requires_lxml)])
+def test_fields_of_a_page_with_entities_and_whitespace(backend):
+    job = backend().parse(PAGES["entities_and_whitespace.html"])
+    assert job["job_name"] == "R&D Data Scientist — Jakarta (Senior)"
+    assert job["company_name"] == "PT Maju & Jaya Tbk"
+    assert job["skills"] == ["Python", "SQL", "Machine Learning", "C++"]
+    assert job["salary"] == "IDR 8.000.000 - 12.000.000"
+    assert job["post_time"].endswith("17 hari yang lalu")
+    assert (job["province"], job["city"], job["district"]) == ("Bali", "Denpasar", "Denpasar Selatan")
+
+
+@pytest.mark.parametrize("backend", [Bs4JobParser, pytest.param(LxmlJobParser, marks=requires_lxml)])
+def test_missing_optional_fields_use_defaults(backend):
+    job = backend().parse(PAGES["missing_optional_fields.html"])
+    assert job["salary"] == "Unspecified"
+    assert job["skills"] == []
+    assert job["requirements"] == []
+
+
+@pytest.mark.parametrize("backend", [Bs4JobParser, pytest.param(LxmlJobParser, marks=requires_lxml)])
+def test_missing_required_field_rejects_the_page(backend):
+    with pytest.raises(MissingFieldError):
+        backend().parse(PAGES["missing_post_time.html"])
+
+
+@pytest.mark.parametrize("backend", [Bs4JobParser, pytest.param(LxmlJobParser, marks=requires_lxml)])
+def test_page_without_content_returns_none(backend):
+    assert backend().parse(PAGES["no_next_root.html"]) is None
+
+
+@pytest.mark.parametrize("backend", [Bs4JobParser, pytest.param(LxmlJobParser, marks=requires_lxml)])
+def test_fallback_selectors_survive_new_class_hashes(backend):
+    html = PAGES["rehashed_classes.html"]
+    with pytest.raises(MissingFieldError):
+        backend().parse(html)
+    job = backend(FALLBACK_JOB_FIELDS).parse(html)
+    assert job["job_name"] == "Field Auditor Part Time - Bali"
+    assert job["company_name"] == "PT. Artha Dana Teknologi (Indodana)"
+
+
+@pytest.mark.parametrize("selector, expected", [
+    ("h1.TopFoldsc__JobOverViewTitle-sc-1fbktg5-3", 'h1[class*="TopFoldsc__JobOverViewTitle-sc-"]'),
+    ("div.TagStyle-sc-r1wv7a-4 > a", 'div[class*="TagStyle-sc-"] > a'),
+    ('div[class="JobCardsc__JobcardContainer-sc-hmqj50-0 iirqVR"]', 'div[class*="JobCardsc__JobcardContainer-sc-"]'),
+    ("#__next h1", "#__next h1"),
+])
+def test_prefix_selector_drops_the_class_hash(selector, expected):
+    assert prefix_selector(selector) == expected
+
+
+def test_prefix_selector_finds_renamed_class_hashes():
+    from bs4 import BeautifulSoup
+
+    page = BeautifulSoup('<h1 class="TopFoldsc__JobOverViewTitle-sc-9zz9zz-7 kLmNoP">Data Engineer</h1>', "html.parser")
+    selector = "h1.TopFoldsc__JobOverViewTitle-sc-1fbktg5-3"
+    assert page.select(selector) == []
+    assert [tag.text for tag in page.select(prefix_selector(selector))] == ["Data Engineer"]
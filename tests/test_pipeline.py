@@ -0,0 +1,63 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from benchmarks.stub_server import StubFetcher
+from utils.Pipeline import run_pipeline, store_batches, _DONE
+from utils.Scraping import extract_job_details, job_uuid
+from utils.Throttling import AdaptiveRateLimiter
+
+
+def fast_governor() -> AdaptiveRateLimiter:
+    # tanpa batas politeness, server lokal
+    return AdaptiveRateLimiter(max_rps=1e6, start_rps=1e6, min_rps=1e3)
+
+
+def test_streaming_output_has_matched_keywords(stub, stub_jobs):
+    batches = []
+    total = run_pipeline(StubFetcher(stub.url), [StubFetcher(stub.url) for _ in range(3)], ["Data Scientist", "Data Analyst"],
+                         sink=batches.append, batch_size=10, raw_sink=batches.append, rate_limiter=fast_governor())
+
+    assert total == len(stub_jobs)
+    raw = pd.concat(batches, ignore_index=True).drop_duplicates("url")
+    assert len(raw) == len(stub_jobs)
+    assert set(raw["matched_keywords"]) == {"Data Scientist, Data Analyst"}
+
+
+def test_failing_sink_stops_the_pipeline(stub):
+    def sink(df):
+        raise RuntimeError("warehouse down")
+
+    # antrian kecil: tanpa penanganan error, tahap lain menunggu selamanya di antrian yang penuh
+    with pytest.raises(RuntimeError, match="warehouse down"):
+        run_pipeline(StubFetcher(stub.url), [StubFetcher(stub.url)], "Data Scientist", sink=sink,
+                     batch_size=2, queue_size=1, rate_limiter=fast_governor())
+
+
+def test_job_matched_again_after_it_was_stored_is_stored_again(stub, stub_jobs):
+    fetcher = StubFetcher(stub.url)
+    records = [extract_job_details(path, fetcher, fast_governor()) for path in stub_jobs["path"][:3]]
+    keys = [job_uuid(record["url"]) for record in records]
+
+    async def run():
+        record_queue, discovered = asyncio.Queue(), asyncio.Event()
+        matched = {key: ["Data Scientist"] for key in keys}
+        raw = []
+        storer = asyncio.create_task(store_batches(record_queue, lambda df: None, batch_size=2, raw_sink=raw.append,
+                                                   matched=matched, discovered=discovered))
+        for record in records[:2]:
+            await record_queue.put(record)
+        while not raw:                  # batch pertama tersimpan sebelum discovery selesai
+            await asyncio.sleep(0.01)
+        matched[keys[0]].append("Data Analyst")
+        discovered.set()
+        await record_queue.put(records[2])
+        await record_queue.put(_DONE)
+        return await storer, pd.concat(raw, ignore_index=True)
+
+    total, raw = asyncio.run(run())
+    assert total == 3
+    latest = raw.assign(key=raw["url"].map(job_uuid)).drop_duplicates("key", keep="last").set_index("key")
+    assert latest.loc[keys, "matched_keywords"].tolist() == ["Data Scientist, Data Analyst", "Data Scientist", "Data Scientist"]
+    assert len(raw) == 4                # hanya job yang berubah disimpan lagi
@@ -0,0 +1,65 @@
+import re
+
+import pandas as pd
+import pytest
+
+from benchmarks.stub_server import StubGlints, StubFetcher
+from utils.Preflight import drifted_fields, fill_rates, preflight
+from utils.Throttling import AdaptiveRateLimiter
+
+
+def fast_governor() -> AdaptiveRateLimiter:
+    # tanpa batas politeness, server lokal
+    return AdaptiveRateLimiter(max_rps=1e6, start_rps=1e6, min_rps=1e3)
+
+
+class RehashedGlints(StubGlints):
+    """Stand-in after a frontend deploy: every styled-components class gets a new hash."""
+
+    def respond(self, path:str) -> tuple:
+        status, body = super().respond(path)
+        return status, re.sub(r"-sc-[0-9a-z]+-(\d+)", r"-sc-zz9zz9-\1", body)
+
+
+def test_fill_rates_ignore_parser_defaults():
+    df = pd.DataFrame({"job_name": ["Data Analyst", "No Title", None, "Data Engineer"],
+                       "salary_range": ["Unspecified", "IDR5.000.000/Bulan", "", None]})
+    assert fill_rates(df).to_dict() == {"job_name": 0.5, "salary_range": 0.25}
+
+
+def test_fill_rate_drop_is_flagged():
+    baseline = pd.Series({"job_name": 1.0, "salary_range": 0.9})
+    rates = pd.Series({"job_name": 1.0, "salary_range": 0.0})
+    assert drifted_fields(rates, baseline, n_pages=10) == ["salary_range"]
+
+
+@pytest.mark.parametrize("rate, n_pages", [(0.4, 5), (0.6, 10), (0.8, 5)])
+def test_normal_variance_is_not_flagged(rate, n_pages):
+    # baseline 0.7: beberapa halaman tanpa gaji dalam sampel kecil masih wajar
+    baseline = pd.Series({"salary_range": 0.7})
+    assert drifted_fields(pd.Series({"salary_range": rate}), baseline, n_pages=n_pages) == []
+
+
+def test_sparse_field_missing_from_a_small_sample_is_not_flagged():
+    # 2 halaman kosong pada field yang biasanya setengah terisi, bukan drift
+    assert drifted_fields(pd.Series({"salary_range": 0.0}), pd.Series({"salary_range": 0.5}), n_pages=2) == []
+
+
+def test_columns_without_baseline_are_ignored():
+    assert drifted_fields(pd.Series({"city": 0.0}), pd.Series({"job_name": 1.0}), n_pages=5) == []
+
+
+def test_preflight_uses_the_primary_selectors(stub):
+    report = preflight(StubFetcher(stub.url), "Data Scientist", rate_limiter=fast_governor())
+    assert report["mode"] == "primary", report
+    assert report["pages"] == 5
+    assert report["drifted"]["primary"] == []
+
+
+def test_preflight_falls_back_when_class_hashes_change(stub_jobs):
+    with RehashedGlints(stub_jobs) as server:
+        report = preflight(StubFetcher(server.url), "Data Scientist", rate_limiter=fast_governor())
+    assert report["links"]["primary"] == 0
+    assert report["links"]["fallback"] > 0
+    assert report["mode"] == "fallback", report
+    assert "job_name" in report["drifted"]["primary"]
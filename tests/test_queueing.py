@@ -0,0 +1,117 @@
+import pytest
+
+from utils.Queueing import RedisWorkQueue, SqliteWorkQueue
+
+
+LINKS = [f"https://glints.com/id/opportunities/jobs/job-{n}/{n:08d}-0000-0000-0000-000000000000" for n in range(3)]
+
+
+@pytest.fixture
+def redis_queue():
+    # script Lua butuh fakeredis dengan lupa; tanpa itu test dilewati
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return RedisWorkQueue(fakeredis.FakeRedis(decode_responses=True), max_attempts=1)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def work_queue(request, tmp_path):
+    """Same lease semantics on both backends (Redis through fakeredis, skipped when missing)."""
+    if request.param == "sqlite":
+        return SqliteWorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=2)
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return RedisWorkQueue(fakeredis.FakeRedis(decode_responses=True), max_attempts=2)
+
+
+def test_expired_lease_is_leased_again(work_queue):
+    work_queue.publish(LINKS[:1])
+    assert work_queue.lease("crashed", 1, lease_seconds=-1) == [(LINKS[0], 1)]
+    assert work_queue.stats()["expired"] == 1
+
+    # worker pertama mati: lease habis, link diambil worker lain sebagai percobaan kedua
+    assert work_queue.lease("worker", 1) == [(LINKS[0], 2)]
+    assert work_queue.lease("other", 1) == []
+
+
+def test_fail_after_losing_the_lease_is_a_no_op(work_queue):
+    work_queue.publish(LINKS[:1])
+    work_queue.lease("slow", 1, lease_seconds=-1)
+    work_queue.lease("worker", 1)
+
+    work_queue.fail("slow", LINKS[0], "timeout")
+    assert work_queue.stats()["leased"] == 1
+    work_queue.complete("worker", LINKS[0], {"url": LINKS[0]})
+    assert work_queue.stats()["done"] == 1
+
+
+def test_link_fails_after_max_attempts(work_queue):
+    work_queue.publish(LINKS[:1])
+    for attempt in (1, 2):
+        assert work_queue.lease("worker", 1) == [(LINKS[0], attempt)]
+        work_queue.fail("worker", LINKS[0], "timeout")
+
+    assert work_queue.stats()["failed"] == 1
+    assert work_queue.lease("worker", 1) == []
+    assert work_queue.requeue_failed() == 1
+    assert work_queue.lease("worker", 1) == [(LINKS[0], 1)]
+
+
+def test_expired_lease_on_the_last_attempt_fails(work_queue):
+    work_queue.publish(LINKS[:1])
+    work_queue.lease("worker", 1, lease_seconds=-1)
+    work_queue.lease("worker", 1, lease_seconds=-1)
+
+    assert work_queue.lease("worker", 1) == []
+    assert work_queue.stats()["failed"] == 1
+
+
+def test_publish_resets_a_done_job(work_queue):
+    work_queue.publish(LINKS)
+    for link, _ in work_queue.lease("worker", 3):
+        work_queue.complete("worker", link, {"url": link})
+    assert work_queue.publish(LINKS) == 3
+
+    assert work_queue.stats()["pending"] == 3
+    assert [attempt for _, attempt in work_queue.lease("worker", 3)] == [1, 1, 1]
+    # record lama tetap ada sampai job selesai lagi
+    assert len(work_queue.results(new_only=False)[0]) == 3
+
+
+def test_publish_keeps_pending_and_leased_jobs(work_queue):
+    work_queue.publish(LINKS[:2])
+    work_queue.lease("worker", 1)
+    assert work_queue.publish(LINKS) == 1
+    assert work_queue.stats() | {"expired": 0} == {"pending": 2, "leased": 1, "done": 0, "failed": 0,
+                                                     "expired": 0, "uncollected": 0}
+
+
+def test_meta_is_shared_through_the_queue_file(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    SqliteWorkQueue(path).set_meta("selectors", "fallback")
+
+    worker_queue = SqliteWorkQueue(path)
+    assert worker_queue.get_meta("selectors") == "fallback"
+    assert worker_queue.get_meta("missing", "primary") == "primary"
+
+
+def test_redis_results_stay_visible_after_republish(redis_queue):
+    redis_queue.publish(LINKS)
+    redis_queue.lease("worker", 3)
+    redis_queue.complete("worker", LINKS[0], {"url": LINKS[0]})
+
+    redis_queue.publish(LINKS[:1])  # crawl berikutnya menemukan job yang sama
+    records, _ = redis_queue.results(new_only=False)
+    assert records == [{"url": LINKS[0]}]
+    assert redis_queue.stats()["done"] == 0
+
+
+def test_redis_requeue_failed(redis_queue):
+    redis_queue.publish(LINKS)
+    redis_queue.lease("worker", 3)
+    redis_queue.fail("worker", LINKS[1], "timeout")
+    assert redis_queue.stats()["failed"] == 1
+
+    assert redis_queue.requeue_failed() == 1
+    assert redis_queue.stats()["failed"] == 0
+    assert redis_queue.lease("worker-2", 3) == [(LINKS[1], 1)]
@@ -0,0 +1,64 @@
+import collections
+import threading
+import time
+
+from benchmarks.stub_server import StubGlints, StubFetcher
+from utils.Scraping import extract_all_job_details_parallel
+from utils.Throttling import AdaptiveRateLimiter, RateLimiter
+
+
+def fast_governor() -> AdaptiveRateLimiter:
+    # tanpa batas politeness, server lokal
+    return AdaptiveRateLimiter(max_rps=1e6, start_rps=1e6, min_rps=1e3)
+
+
+class CountingFetcher(StubFetcher):
+    """StubFetcher that records which worker thread fetched each page."""
+
+    def __init__(self, base_url:str, seen:collections.Counter):
+        super().__init__(base_url)
+        self.seen = seen
+
+    def get_html(self, url:str, wait_selector:str=None) -> str:
+        self.seen[id(self), threading.get_ident()] += 1
+        return super().get_html(url, wait_selector)
+
+
+def links_of(jobs) -> list:
+    return [path + "?utm_referrer=explore" for path in jobs["path"]]
+
+
+def test_every_worker_pulls_from_the_shared_queue(stub_jobs):
+    seen = collections.Counter()
+    with StubGlints(stub_jobs, latency=0.005, seed=2) as stub:
+        fetchers = [CountingFetcher(stub.url, seen) for _ in range(4)]
+        jobs = extract_all_job_details_parallel(links_of(stub_jobs), fetchers, rate_limiter=fast_governor())
+
+    # urutan hasil sama dengan urutan link, apa pun worker yang mengambilnya
+    assert [job["job_name"] for job in jobs] == list(stub_jobs["job_name"])
+    assert len(seen) == 4
+    assert sum(seen.values()) == len(stub_jobs)
+
+
+def test_workers_share_one_politeness_budget(stub, stub_jobs):
+    links = links_of(stub_jobs)[:20]
+    start = time.perf_counter()
+    jobs = extract_all_job_details_parallel(links, [StubFetcher(stub.url) for _ in range(4)], rate_limiter=RateLimiter(max_rps=40))
+    elapsed = time.perf_counter() - start
+
+    assert len(jobs) == 20
+    # 4 worker tetap dibatasi 40 request/detik bersama: 20 request butuh >= 19 interval
+    assert elapsed >= 19 / 40 * 0.9
+
+
+def test_failed_links_are_retried_by_the_pool(stub_jobs):
+    with StubGlints(stub_jobs, error_rate=0.2, seed=5) as stub:
+        jobs = extract_all_job_details_parallel(links_of(stub_jobs), [StubFetcher(stub.url) for _ in range(3)],
+                                                rate_limiter=fast_governor())
+        assert stub.errors > 0
+    assert len(jobs) >= len(stub_jobs) - 2
+    assert len({job["url"] for job in jobs}) == len(jobs)
+
+
+def test_no_workers_returns_nothing():
+    assert extract_all_job_details_parallel(["https://glints.com/id/opportunities/jobs/a/b"], []) == []
@@ -0,0 +1,75 @@
+import os
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from utils.Session import SessionStore, PROFILE_SELECTOR
+
+
+COOKIES = [{"name": "session", "value": "abc", "domain": ".glints.com", "path": "/"},
+           {"name": "tracking", "value": "x", "domain": ".hotjar.com", "path": "/"}]
+
+
+class Browser:
+    """WebDriver stand-in: logged in when the session cookie it was given is accepted by the site."""
+
+    def __init__(self, cookies:list=(), local_storage:dict=None, valid_session:str="abc"):
+        self.cookies = list(cookies)
+        self.local_storage = dict(local_storage or {})
+        self.valid_session = valid_session
+
+    def get(self, url):
+        pass
+
+    def get_cookies(self):
+        return self.cookies
+
+    def add_cookie(self, cookie):
+        if cookie["domain"] != ".glints.com":
+            raise WebDriverException("invalid cookie domain")
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if args:
+            self.local_storage.update(args[0])
+            return None
+        return dict(self.local_storage)
+
+    def find_element(self, by, selector):
+        logged_in = any(cookie["name"] == "session" and cookie["value"] == self.valid_session for cookie in self.cookies)
+        if selector == PROFILE_SELECTOR and logged_in:
+            return object()
+        raise NoSuchElementException(selector)
+
+
+def test_saved_session_is_encrypted_and_restored(tmp_path):
+    path = str(tmp_path / "session.bin")
+    SessionStore("password", path).save(Browser(COOKIES, {"token": "jwt-123"}))
+
+    with open(path, "rb") as f:
+        assert b"jwt-123" not in f.read()
+
+    worker = Browser()
+    assert SessionStore("password", path, check_timeout=0).restore(worker)
+    assert [cookie["name"] for cookie in worker.cookies] == ["session"]     # cookie domain lain dilewati
+    assert worker.local_storage == {"token": "jwt-123"}
+
+
+def test_wrong_secret_is_ignored(tmp_path):
+    path = str(tmp_path / "session.bin")
+    SessionStore("password", path).save(Browser(COOKIES))
+
+    assert SessionStore("another secret", path).load() is None
+    assert not SessionStore("another secret", path, check_timeout=0).restore(Browser())
+    assert os.path.exists(path)
+
+
+def test_expired_session_is_dropped(tmp_path):
+    path = str(tmp_path / "session.bin")
+    SessionStore("password", path).save(Browser(COOKIES))
+
+    assert not SessionStore("password", path, check_timeout=0).restore(Browser(valid_session="renewed"))
+    assert not os.path.exists(path)
+
+
+def test_no_saved_session(tmp_path):
+    assert not SessionStore("password", str(tmp_path / "session.bin")).restore(Browser())
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from utils.Skills import SkillIndex, canonical_skill, canonical_skills
+
+
+def test_case_variants_share_one_canonical_name():
+    skills = pd.Series(["sql", "SQL", "Sql", " sql ", "microsoft excel", "Microsoft Excel"])
+    assert canonical_skills(skills).tolist() == ["SQL"] * 4 + ["Microsoft Excel"] * 2
+
+
+def test_display_name_keeps_acronyms_and_connecting_words():
+    assert canonical_skill("it project management") == "IT Project Management"
+    assert canonical_skill("MONITORING AND EVALUATION") == "Monitoring and Evaluation"
+    assert canonical_skill("javascript") == "JavaScript"
+
+
+def test_skill_names_do_not_depend_on_row_order():
+    df = pd.DataFrame({"url": ["a", "b", "c"], "skills_requirements": ["sql, Python", "SQL, python", "Sql"]})
+    forward = SkillIndex().add(df).tables()["Skills"]
+    backward = SkillIndex().add(df.iloc[::-1]).tables()["Skills"]
+
+    assert dict(zip(forward["index"], forward["count"])) == {"SQL": 3, "Python": 2}
+    assert dict(zip(backward["index"], backward["count"])) == {"SQL": 3, "Python": 2}
+
+
+def test_aggregates_only_index_stays_bounded_over_many_chunks():
+    from utils.Cleaning_and_storing import clean_in_chunks
+
+    def chunks():
+        for n in range(40):
+            yield pd.DataFrame({"url": [f"https://glints.com/id/opportunities/jobs/x/{n:04d}{i:04d}" for i in range(250)],
+                                "job_name": "Data Analyst", "province": ["DKI Jakarta", "Jawa Barat"] * 125,
+                                "company_industry": "IT", "skills_requirements": ["SQL, Python", "Excel, SQL"] * 125})
+
+    index = clean_in_chunks(chunks(), list_keyword=["data"])
+    assert len(index) == 10_000
+    assert index.keys == [] and len(index.indices) == 0 and len(index.indptr) == 1
+    assert len(index.counts) == 3 and len(index.pairs) == 2
+    assert dict(zip(*index.tables()["Skills"][["index", "count"]].T.values)) == {"SQL": 10_000, "Python": 5_000, "Microsoft Excel": 5_000}
+
+
+def test_aggregates_only_index_round_trips(tmp_path):
+    df = pd.DataFrame({"url": ["a", "b"], "skills_requirements": ["SQL, Python", "SQL"]})
+    index = SkillIndex(keep_postings=False).add(df)
+    index.save(str(tmp_path / "skills.npz"))
+
+    loaded = SkillIndex.load(str(tmp_path / "skills.npz"))
+    assert len(loaded) == 2 and not loaded.keep_postings
+    assert loaded.top_skills().to_dict() == {"SQL": 2, "Python": 1}
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from utils.Skills import SkillIndex
+from utils.Warehouse_storing import SqliteWarehouse, upload_incremental
+
+
+def job(n:int, skills:str, province:str="DKI Jakarta", industry:str="IT") -> dict:
+    return {"url": f"https://glints.com/id/opportunities/jobs/job-{n}/{n:08d}-0000-0000-0000-000000000000",
+            "job_title": f"Job {n}", "skills_requirements": skills, "province": province, "company_industry": industry}
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    return SqliteWarehouse(str(tmp_path / "warehouse.sqlite"))
+
+
+def stored_table(warehouse, table:str) -> pd.DataFrame:
+    df = pd.read_sql(f'SELECT * FROM "{table}"', warehouse.connection)
+    keys = [col for col in df.columns if col != "count"]
+    return df.sort_values(keys, ignore_index=True)
+
+
+def expected_table(df:pd.DataFrame, table:str) -> pd.DataFrame:
+    expected = SkillIndex().add(df).tables()[table]
+    keys = [col for col in expected.columns if col != "count"]
+    return expected.sort_values(keys, ignore_index=True)
+
+
+def test_skills_tables_follow_edits_by_delta(warehouse):
+    first = pd.DataFrame([job(1, "SQL, Python"), job(2, "sql, Excel", province="Jawa Barat"), job(3, "Python")])
+    upload_incremental(first, warehouse)
+
+    edited = first.copy()
+    edited.loc[1, "skills_requirements"] = "Python"
+    edited.loc[2, "company_industry"] = "Finance"
+    upload_incremental(edited, warehouse)
+
+    for table in ["Skills", "Skill_Pairs", "Skills_Province", "Skills_Industry"]:
+        pd.testing.assert_frame_equal(stored_table(warehouse, table), expected_table(edited, table), check_dtype=False)
+
+
+def test_only_new_or_changed_rows_are_upserted(warehouse):
+    first = pd.DataFrame([job(1, "SQL"), job(2, "Python"), job(3, "Excel")])
+    assert upload_incremental(first, warehouse) == 3
+
+    edited = pd.concat([first, pd.DataFrame([job(4, "Tableau")])], ignore_index=True)
+    edited.loc[0, "job_title"] = "Data Analyst"
+    assert upload_incremental(edited, warehouse) == 2
+
+    glints = warehouse.read("Glints").set_index("url")
+    assert len(glints) == 4
+    assert glints.loc[edited.loc[0, "url"], "job_title"] == "Data Analyst"
+
+
+def test_unchanged_rows_are_a_no_op(warehouse):
+    df = pd.DataFrame([job(1, "SQL, Python"), job(2, "Python")])
+    upload_incremental(df, warehouse)
+    before = stored_table(warehouse, "Skills")
+
+    rescraped = df.assign(obtained="2026-10-18")
+    assert upload_incremental(rescraped, warehouse) == 0
+    pd.testing.assert_frame_equal(stored_table(warehouse, "Skills"), before)
+
+
+def test_skills_delta_after_an_edit(warehouse):
+    df = pd.DataFrame([job(1, "SQL, Python"), job(2, "SQL")])
+    upload_incremental(df, warehouse)
+
+    edited = df.copy()
+    edited.loc[1, "skills_requirements"] = "Python, Excel"
+    upload_incremental(edited, warehouse)
+
+    skills = stored_table(warehouse, "Skills")
+    assert dict(zip(skills["index"], skills["count"])) == {"Microsoft Excel": 1, "Python": 2, "SQL": 1}
+
+
+def test_legacy_table_is_migrated_before_incremental_loading(warehouse):
+    # tabel Glints lama dari upload_gbq: tanpa job_uuid / row_hash
+    df = pd.DataFrame([job(1, "SQL"), job(2, "Python")])
+    df.to_sql("Glints", warehouse.connection, index=False)
+    SkillIndex().add(df).tables()["Skills"].to_sql("Skills", warehouse.connection, index=False)
+
+    assert upload_incremental(df, warehouse) == 0
+    assert {"job_uuid", "row_hash"} <= set(warehouse.columns("Glints"))
+
+    edited = pd.concat([df, pd.DataFrame([job(3, "SQL")])], ignore_index=True)
+    assert upload_incremental(edited, warehouse) == 1
+    assert len(warehouse.read("Glints")) == 3
+    skills = stored_table(warehouse, "Skills")
+    assert dict(zip(skills["index"], skills["count"])) == {"Python": 1, "SQL": 2}
+
+
+def test_columns_added_later_are_added_to_the_stored_table(warehouse):
+    first = pd.DataFrame([job(1, "SQL"), job(2, "Python")])
+    upload_incremental(first, warehouse)
+
+    tagged = first.assign(matched_tags=["sql", "python"])
+    assert upload_incremental(tagged, warehouse) == 2
+    glints = warehouse.read("Glints").set_index("url")
+    assert glints.loc[tagged["url"], "matched_tags"].tolist() == ["sql", "python"]
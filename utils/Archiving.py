@@ -0,0 +1,96 @@
+import datetime as dt
+import gzip
+import json
+import os
+import threading
+from multiprocessing import Pool
+
+from tqdm import tqdm
+
+
+class PageArchive:
+    """Append-only archive of raw job detail pages, used to re-parse everything offline.
+
+    Every fetched page is written gzip-compressed to `<directory>/<uuid>/<fetch time>.html.gz`
+    and recorded in `<directory>/manifest.jsonl` with its url and fetch time. Nothing is
+    ever evicted, unlike `PageCache`.
+
+    Args:
+        directory (str, optional): archive folder. Defaults to "data/archive".
+    """
+
+    def __init__(self, directory:str="data/archive"):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.jsonl")
+        self._lock = threading.Lock()
+        self._saved = set()
+
+        os.makedirs(directory, exist_ok=True)
+        for entry in self.entries():
+            self._saved.add((entry["uuid"], entry["fetched_at"]))
+
+    def save(self, key:str, url:str, html:str, fetched_at:dt.datetime) -> None:
+        """Archives one page. A page already archived for the same fetch time is skipped."""
+        stamp = fetched_at.isoformat(timespec="seconds")
+        with self._lock:
+            if (key, stamp) in self._saved:
+                return
+            self._saved.add((key, stamp))
+
+            relative_path = os.path.join(key, fetched_at.strftime("%Y%m%d%H%M%S") + ".html.gz")
+            os.makedirs(os.path.join(self.directory, key), exist_ok=True)
+            with gzip.open(os.path.join(self.directory, relative_path), "wt", encoding="utf-8") as f:
+                f.write(html)
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"uuid": key, "url": url, "fetched_at": stamp, "path": relative_path}) + "\n")
+
+    def entries(self, latest_only:bool=False) -> list:
+        """Returns the manifest entries, optionally only the latest fetch of every job."""
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        if latest_only:
+            latest = {}
+            for entry in entries:
+                if entry["uuid"] not in latest or entry["fetched_at"] > latest[entry["uuid"]]["fetched_at"]:
+                    latest[entry["uuid"]] = entry
+            entries = list(latest.values())
+        return entries
+
+
+def _reparse_entry(task:tuple) -> dict:
+    """Worker function: parses one archived page. Runs in a separate process."""
+    from utils.Scraping import parse_job_details
+
+    path, url, fetched_at = task
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            html = f.read()
+        return parse_job_details(html, url, dt.datetime.fromisoformat(fetched_at))
+    except Exception as e:
+        print(f"\nError re-parsing {path}: {str(e)}")
+        return None
+
+
+def reparse_archive(directory:str="data/archive", processes:int=None, latest_only:bool=True, chunksize:int=32) -> list:
+    """Runs the field extraction over the whole page archive in a process pool, without any network call.
+
+    Args:
+        directory (str, optional): archive folder. Defaults to "data/archive".
+        processes (int, optional): number of worker processes. Defaults to all cores.
+        latest_only (bool, optional): only re-parse the latest fetch of every job. Defaults to True.
+        chunksize (int, optional): pages sent to a worker at a time. Defaults to 32.
+
+    Returns:
+        list: list of dictionaries containing job details
+    """
+    archive = PageArchive(directory)
+    tasks = [(os.path.join(directory, entry["path"]), entry["url"], entry["fetched_at"])
+             for entry in archive.entries(latest_only=latest_only)]
+    print(f"\nRe-parsing {len(tasks)} archived pages from {directory} ...")
+
+    with Pool(processes=processes) as pool:
+        results = list(tqdm(pool.imap(_reparse_entry, tasks, chunksize=chunksize),
+                            total=len(tasks), desc="Re-parsing pages", colour="green", ncols=100, unit="page"))
+    return [job for job in results if job]
@@ -0,0 +1,80 @@
+from urllib.parse import quote
+
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0"
+
+# Host pihak ketiga (analytics, iklan, tracker) yang tidak pernah dibaca parser
+BLOCKED_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "facebook.net", "facebook.com", "hotjar.com", "clarity.ms",
+    "segment.io", "segment.com", "amplitude.com", "mixpanel.com", "analytics.tiktok.com",
+    "bat.bing.com", "snap.licdn.com", "intercom.io", "intercomcdn.com",
+]
+
+# Preferensi Firefox untuk "scrape profile": tanpa gambar, font, media, tracker dan cache disk
+SCRAPE_PREFERENCES = {
+    "permissions.default.image": 2,                 # gambar tidak diunduh
+    "browser.display.use_document_fonts": 0,        # web font tidak dipakai
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,                    # video / audio tidak diputar
+    "media.autoplay.blocking_policy": 2,
+    "privacy.trackingprotection.enabled": True,     # daftar tracker bawaan Firefox
+    "privacy.trackingprotection.socialtracking.enabled": True,
+    "privacy.trackingprotection.cryptomining.enabled": True,
+    "privacy.trackingprotection.fingerprinting.enabled": True,
+    "browser.cache.disk.enable": False,             # halaman tidak dibuka ulang, cache disk tidak berguna
+    "browser.cache.offline.enable": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "dom.webnotifications.enabled": False,
+    "geo.enabled": False,
+}
+
+
+def blocking_pac(hosts:list) -> str:
+    """Proxy auto-config script sending requests for `hosts` (and their subdomains) to a closed
+    local port, so they are refused, while every other request goes direct. Only blocks with
+    `network.proxy.failover_direct` off (see `build_options`), otherwise Firefox retries direct."""
+    conditions = " || ".join(f'dnsDomainIs(host, ".{host}") || host == "{host}"' for host in hosts)
+    script = f"function FindProxyForURL(url, host) {{ if ({conditions}) return 'PROXY 127.0.0.1:9'; return 'DIRECT'; }}"
+    return "data:text/plain," + quote(script)
+
+
+def build_options(headless:bool=True, user_agent:str=USER_AGENT, lightweight:bool=True, blocked_hosts:list=BLOCKED_HOSTS) -> Options:
+    """Function to build the Firefox options used for every scraping browser.
+
+    Args:
+        headless (bool, optional): run Firefox without a window. Defaults to True.
+        user_agent (str, optional): user agent sent with every request. Defaults to USER_AGENT.
+        lightweight (bool, optional): apply the scrape profile: no images, fonts, media, trackers
+            or disk cache, and an `eager` page load strategy. Defaults to True.
+        blocked_hosts (list, optional): third-party hosts blocked in the lightweight profile. Defaults to BLOCKED_HOSTS.
+
+    Returns:
+        Options: Firefox options
+    """
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.set_preference("network.proxy.type", 0)  # Nonaktifkan proxy
+    options.set_preference("general.useragent.override", user_agent)
+
+    if lightweight:
+        for name, value in SCRAPE_PREFERENCES.items():
+            options.set_preference(name, value)
+        if blocked_hosts:
+            options.set_preference("network.proxy.type", 2)  # PAC, hanya untuk memblokir host di atas
+            options.set_preference("network.proxy.autoconfig_url", blocking_pac(blocked_hosts))
+            options.set_preference("network.proxy.failover_direct", False)  # proxy gagal: jangan coba DIRECT
+        # tidak menunggu gambar / iframe; elemen yang dibutuhkan tetap ditunggu dengan WebDriverWait
+        options.page_load_strategy = "eager"
+    return options
+
+
+def open_browser(options:Options=None) -> webdriver.Firefox:
+    """Function to start a Firefox session with the given options (by default `build_options()`)."""
+    return webdriver.Firefox(options=options or build_options())
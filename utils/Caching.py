@@ -0,0 +1,178 @@
+import contextlib
+import datetime as dt
+import gzip
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: msvcrt.locking
+    fcntl = None
+    import msvcrt
+
+
+@contextlib.contextmanager
+def file_lock(path:str):
+    """Lock between processes on an OS file lock (flock, or msvcrt on Windows). The OS releases
+    the lock when its holder exits or crashes, so there is never a stale lock to take over."""
+    with open(path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)   # menyerah setelah ~10 detik, coba lagi
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class PageCache:
+    """Persistent on-disk cache of job detail pages, keyed by job UUID.
+
+    Every page is stored gzip-compressed as `<uuid>.html.gz` in `directory`, next to an
+    `index.json` holding the fetch time, last access time, size and HTTP validators
+    (ETag / Last-Modified) of each entry. Entries younger than `ttl_hours` are served
+    without any network load; older entries are revalidated with a conditional request
+    when the fetcher supports it. When the cache grows past `max_mb`, the least recently
+    used entries are evicted.
+
+    Several processes (e.g. `cli.py work` on one host) can share the same directory: `save`
+    merges the index with the one on disk under a lock file instead of overwriting it.
+
+    Args:
+        directory (str, optional): cache folder. Defaults to "data/cache".
+        ttl_hours (float, optional): how long an entry is considered fresh. Defaults to 24.
+        max_mb (float, optional): size cap of the compressed pages in megabytes. Defaults to 500.
+    """
+
+    def __init__(self, directory:str="data/cache", ttl_hours:float=24, max_mb:float=500):
+        self.directory = directory
+        self.ttl = dt.timedelta(hours=ttl_hours)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.index_path = os.path.join(directory, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def _path(self, key:str) -> str:
+        return os.path.join(self.directory, f"{key}.html.gz")
+
+    def lookup(self, key:str):
+        """Looks up a cached page and updates the hit/miss counters.
+
+        Args:
+            key (str): job UUID
+
+        Returns:
+            tuple: (html, meta, is_fresh), or None when the page is not cached
+        """
+        with self._lock:
+            meta = self.index.get(key)
+            if meta is None or not os.path.exists(self._path(key)):
+                self.index.pop(key, None)
+                self.misses += 1
+                return None
+
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                html = f.read()
+            meta["accessed"] = dt.datetime.now().isoformat()
+
+            is_fresh = dt.datetime.now() - dt.datetime.fromisoformat(meta["stored"]) < self.ttl
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+            return html, dict(meta), is_fresh
+
+    def put(self, key:str, html:str, etag:str=None, last_modified:str=None) -> None:
+        """Stores (or replaces) a page in the cache and evicts old entries if the size cap is exceeded."""
+        with self._lock:
+            # file sementara + os.replace: proses lain tidak pernah membaca gzip yang setengah tertulis
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, self._path(key))
+            now = dt.datetime.now().isoformat()
+            self.index[key] = {
+                "stored": now,
+                "accessed": now,
+                "size": os.path.getsize(self._path(key)),
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+            self._evict()
+
+    def mark_revalidated(self, key:str) -> None:
+        """Marks an entry as fresh again after the server answered 304 Not Modified."""
+        with self._lock:
+            if key in self.index:
+                now = dt.datetime.now().isoformat()
+                self.index[key]["stored"] = now
+                self.index[key]["accessed"] = now
+                self.revalidated += 1
+
+    def _evict(self) -> None:
+        total = sum(meta["size"] for meta in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.index, key=lambda k: self.index[k]["accessed"]):
+            total -= self.index[key]["size"]
+            del self.index[key]
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+            self.evictions += 1
+            if total <= self.max_bytes:
+                break
+
+    def save(self) -> None:
+        """Merges the cache index with the index on disk (written meanwhile by other processes)
+        and writes it back. Per entry the most recent one is kept; entries whose page file is gone
+        (evicted by any process) are dropped."""
+        with self._lock, file_lock(self.index_path + ".lock"):
+            on_disk = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, encoding="utf-8") as f:
+                    on_disk = json.load(f)
+            for key, meta in on_disk.items():
+                own = self.index.get(key)
+                if own is None or (meta["stored"], meta["accessed"]) > (own["stored"], own["accessed"]):
+                    self.index[key] = meta
+            self.index = {key: meta for key, meta in self.index.items() if os.path.exists(self._path(key))}
+            self._evict()
+
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+
+    def stats(self) -> dict:
+        """Returns the cache counters. `hits` is the number of network loads saved."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "entries": len(self.index),
+            "size_mb": round(sum(meta["size"] for meta in self.index.values()) / 1024 / 1024, 2),
+        }
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+
+
+class CrawlJournal:
+    """Append-only checkpoint journal of a crawl, used to resume it after a crash or an interruption.
+
+    Every finished search page (its job links, and the page count for the first page of a keyword)
+    and every finished batch of parsed job records is appended as one JSON line to `path`. On a
+    resumed run, journaled pages are not requested again and journaled jobs are not fetched again.
+
+    Args:
+        path (str, optional): journal file. Defaults to "data/crawl_journal.jsonl".
+    """
+
+    def __init__(self, path:str="data/crawl_journal.jsonl"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._records = {}
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue    # baris terakhir bisa terpotong jika proses mati saat menulis
+                if entry["kind"] == "page":
+                    self._pages[(entry["keyword"], entry["page"])] = (entry["links"], entry["last_page"])
+                elif entry["kind"] == "records":
+                    for record in entry["records"]:
+                        self._records[record["url"]] = record
+
+    def _append(self, entry:dict) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def log_page(self, keyword:str, page_num:int, links:list, last_page:int=None) -> None:
+        """Checkpoints one finished search page."""
+        self._pages[(keyword, page_num)] = (links, last_page)
+        self._append({"kind": "page", "keyword": keyword, "page": page_num, "links": links, "last_page": last_page})
+
+    def log_records(self, records:list) -> None:
+        """Checkpoints one finished batch of parsed job records."""
+        records = [record for record in records if record]
+        if not records:
+            return
+        for record in records:
+            self._records[record["url"]] = record
+        self._append({"kind": "records", "records": records})
+
+    def page(self, keyword:str, page_num:int) -> tuple:
+        """Returns (links, last_page) of a journaled search page, or None."""
+        return self._pages.get((keyword, page_num))
+
+    def record(self, url:str) -> dict:
+        """Returns the journaled record of a job url (relative or absolute), or None."""
+        if not url.startswith("http"):
+            url = "https://glints.com" + url
+        return self._records.get(url)
+
+    def records(self) -> list:
+        return list(self._records.values())
+
+    def clear(self) -> None:
+        """Starts a new crawl: drops the journal of the previous one."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._pages = {}
+            self._records = {}
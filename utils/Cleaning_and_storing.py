@@ -1,21 +1,25 @@
 import numpy as np
 import pandas as pd
 
-import pandas_gbq
-from google.oauth2 import service_account
-from dotenv import dotenv_values
 import os
 
+from utils.Normalization import parse_salary
+from utils.Metrics import timed
+from utils.Matching import get_matcher, tag_keywords
+from utils.Skills import SkillIndex
+from utils.Dedup import RepostIndex, drop_chunk_duplicates
+
 
 # _________________________________________________________________________________________ Cleaning
 
-def cek_nan(df:pd.DataFrame) -> list:
+def cek_nan(df:pd.DataFrame, verbose:bool=True) -> list:
     """This function checks each column in the DataFrame for NaN values and prints the count 
     of NaN values found in each column. If any column contains NaN values, the results 
     will be displayed; otherwise, a message will be shown indicating no NaN values are detected.
 
     Args:
     df (pd.DataFrame): The DataFrame to be checked.
+    verbose (bool, optional): print the NaN counts. Defaults to True.
 
     Returns:
         list: A list of column names that contain NaN values.
@@ -23,26 +27,34 @@ def cek_nan(df:pd.DataFrame) -> list:
     all_col = df.isna().sum()
     col_na = all_col[all_col>0]
 
-    if not col_na.empty:
+    if verbose and not col_na.empty:
         print("\nColumn NAN count")
         print(col_na)
-    else:
+    elif verbose:
         print("\nNo Column NAN Detected")
 
     return list(col_na.index)
 
-def cleaning_nan(df:pd.DataFrame, list_na:list) -> pd.DataFrame:
+def fill_na(series:pd.Series, value) -> pd.Series:
+    """fillna that also works on categorical columns (e.g. read from the Parquet dataset)."""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+@timed("cleaning_nan")
+def cleaning_nan(df:pd.DataFrame, list_na:list, verbose:bool=True) -> pd.DataFrame:
     """This function cleans NaN values in the specified columns of the DataFrame based on the given conditions.
 
     For each column specified in `list_na`, the function performs the following operations:
     - Drops rows where `skills_requirements` is NaN.
-    - Fills NaN in `salary_min` and `salary_max` based on conditions in `salary_range` (i.e., 'Unspecified' or range values).
+    - Fills NaN in `salary_min` and `salary_max` based on conditions in `salary_range` (i.e., 'Unspecified' or single values).
     - Fills NaN in `another_requirements` with a default value of "No other requirements".
-    - Fills NaN in `company_industry` with "Unspecified".
+    - Fills NaN in `company_industry`, `salary_currency` and `salary_period` with "Unspecified".
 
     Args:
     df (pd.DataFrame): The DataFrame to be cleaned.
     list_na (list): A list of column names to clean.
+    verbose (bool, optional): print the NaN counts left after cleaning. Defaults to True.
 
     Returns:
         pd.DataFrame: The cleaned DataFrame with NaN values handled.
@@ -53,73 +65,138 @@ def cleaning_nan(df:pd.DataFrame, list_na:list) -> pd.DataFrame:
         if val == "skills_requirements":
             df = df.dropna(subset=['skills_requirements'])
 
-        elif val == "salary_min":
+        elif val in ("salary_min", "salary_max"):
             # jika kosong dan kolom salary_range = Unspecified
-            df.loc[df['salary_min'].isna() & (df['salary_range'] == 'Unspecified'), 'salary_min'] = 0
-            # jika masih kosong dan kolom salary range tidak berbentuk range tapi 1 nilai saja
-            df["salary_min"] = df["salary_min"].fillna(df["salary_range"].str.extract(r'IDR([\d\.]+)\/Bulan')[0].str.replace('.', '').astype(float))
-        elif val == "salary_max":
-            df.loc[df['salary_max'].isna() & (df['salary_range'] == 'Unspecified'), 'salary_max'] = 0
-            df["salary_max"] = df["salary_max"].fillna(df["salary_range"].str.extract(r'IDR([\d\.]+)\/Bulan')[0].str.replace('.', '').astype(float))
+            df.loc[df[val].isna() & (df['salary_range'] == 'Unspecified'), val] = 0
+            # jika masih kosong (data lama tanpa normalisasi), parse hanya baris yang kosong
+            missing = df[val].isna()
+            if missing.any():
+                df.loc[missing, val] = parse_salary(df.loc[missing, "salary_range"])[val]
 
         elif val == "another_requirements":
-            df["another_requirements"] = df["another_requirements"].fillna("No other requirements")
+            df["another_requirements"] = fill_na(df["another_requirements"], "No other requirements")
             
-        elif val == "company_industry":
-            df["company_industry"] = df["company_industry"].fillna("Unspecified")
+        elif val in ("company_industry", "salary_currency", "salary_period"):
+            df[val] = fill_na(df[val], "Unspecified")
         
 
-    cek_nan(df)
+    cek_nan(df, verbose)
     return df
 
 
-def filter_relevan_job(df:pd.DataFrame, list_keyword:list) -> pd.DataFrame:
+@timed("filter_relevan_job")
+def filter_relevan_job(df:pd.DataFrame, list_keyword:list, columns:list=("job_name",), tag_column:str="matched_tags") -> pd.DataFrame:
     """Filters the jobs in the given DataFrame based on the presence of specified keywords 
     in the 'job_name' column. Only the rows where 'job_name' contains one or more of 
     the keywords (case-insensitive) will be retained.
+    The keywords are matched literally with a compiled, cached matcher (`utils.Matching`), and the
+    kept rows are tagged with every keyword found in the job name, skills and other requirements
+    (`tag_keywords`).
 
     Args:
         df (pd.DataFrame): The DataFrame to be cleaned.
-        list_keyword (list): A list of keywords that should be searched within the 'job_name' column.
+        list_keyword (list | dict): A list of keywords (or a taxonomy {tag: [keywords]}) that should be searched within the 'job_name' column.
+        columns (list, optional): columns to search. Defaults to ("job_name",).
+        tag_column (str, optional): name of the tag column. Defaults to "matched_tags" (None: no tagging).
 
     Returns:
         pd.DataFrame: A filtered DataFrame containing only the job listings that include at least one 
                     of the provided keywords in the 'job_name' column.
     """
-    keywords = list_keyword
-    df = df[df['job_name'].str.contains('|'.join(keywords), case=False, na=False)]
+    matcher = get_matcher(list_keyword)
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        mask |= matcher.mask(df[col]).to_numpy()
+    df = df[mask]
+    # tag dihitung setelah filter, jadi hanya baris yang relevan yang dipindai
+    if tag_column:
+        df = tag_keywords(df, list_keyword, name=tag_column)
     
     return df
 
+
+def split_skills(skills:pd.Series) -> pd.Series:
+    """Splits comma separated skills into one stripped skill per row."""
+    skills = skills.dropna().astype(str).str.split(",").explode().str.strip()
+    return skills[skills != ""]
+
+
+def clean_in_chunks(chunks, list_keyword:list=None, sink=None, skill_index:SkillIndex=None, reposts:RepostIndex=None) -> SkillIndex:
+    """Chunked cleaning engine for large (historical) datasets. Every chunk is cleaned with the
+    same rules as `cleaning_nan` and `filter_relevan_job`, handed to `sink` and dropped. Only the
+    skill aggregates are kept (an aggregates-only `SkillIndex`, no per-posting data), so peak memory
+    depends on the chunk size and the number of distinct skills, not on the dataset size.
+
+    Args:
+        chunks (iterable): pd.DataFrame chunks, e.g. from `iter_parquet` or `pd.read_csv(..., chunksize=...)`
+        list_keyword (list, optional): keywords for `filter_relevan_job`. Defaults to None (no filtering).
+        sink (callable, optional): called with every cleaned chunk. Defaults to None.
+        skill_index (SkillIndex, optional): index the skills are added to. Defaults to a new
+            `SkillIndex(keep_postings=False)`.
+        reposts (RepostIndex, optional): when given, near-duplicates are dropped from every chunk
+            (`drop_chunk_duplicates`) and the index is saved at the end. Defaults to None (no dedup).
+
+    Returns:
+        SkillIndex: skills index over all cleaned chunks
+    """
+    skill_index = skill_index if skill_index is not None else SkillIndex(keep_postings=False)
+    n_raw = n_clean = 0
+    for chunk in chunks:
+        n_raw += len(chunk)
+        chunk = cleaning_nan(chunk, list_na=cek_nan(chunk, verbose=False), verbose=False)
+        if list_keyword:
+            chunk = filter_relevan_job(chunk, list_keyword=list_keyword)
+        if reposts is not None and not chunk.empty:
+            chunk = drop_chunk_duplicates(chunk, reposts)
+        if chunk.empty:
+            continue
+        n_clean += len(chunk)
+        skill_index.add(chunk)
+        if sink:
+            sink(chunk)
+
+    if reposts is not None:
+        reposts.save()
+    print(f"\nCleaned {n_raw} rows in chunks: {n_clean} relevant rows, {len(skill_index.names)} distinct skills")
+    return skill_index
+
 # _________________________________________________________________________________________ Storing
 
-def upload_gbq(df:pd.DataFrame , project_id:str, dataset_id:str, key_path:str) -> None:
-    """Uploads data from a pandas DataFrame to Google BigQuery tables. The function uploads two tables:
+@timed("upload_gbq")
+def upload_gbq(df:pd.DataFrame , project_id:str, dataset_id:str, key_path:str, skill_index:SkillIndex=None) -> None:
+    """Uploads data from a pandas DataFrame to Google BigQuery tables. The function uploads:
     - The main DataFrame `df` to the "Glints" table.
-    - A table with skills counts (from the "skills_requirements" column) to the "Skills" table.
+    - The aggregates of the skills index (from the "skills_requirements" column): canonical skills
+      counts to the "Skills" table, skill co-occurrence to "Skill_Pairs", and counts per province
+      and per industry to "Skills_Province" and "Skills_Industry".
 
     Args:
     df (pd.DataFrame): The main DataFrame to be uploaded.
     project_id (str): The Google Cloud Project ID.
     dataset_id (str): The BigQuery Dataset ID.
     key_path (str): Path to the service account key file for authentication.
+    skill_index (SkillIndex, optional): skills index of `df`. Defaults to None (built from `df`).
 
     Returns:
         None
     """
 
+    import pandas_gbq   # hanya dimuat saat upload
+
     # ---- Credential configuration
-    scopes = ["https://www.googleapis.com/auth/bigquery"]
-    credentials = service_account.Credentials.from_service_account_file(filename=key_path, scopes=scopes) 
+    credentials = gbq_credentials(key_path)
 
     # print("Google BigQuery Configuration")
     # print(f"Project ID: {project_id}")
     # print(f"Dataset ID: {dataset_id}")
     # print(f"Key Path: {key_path}")
 
-    table_skill = df["skills_requirements"].str.split(",",expand=True).stack().str.strip().value_counts().reset_index()
+    # kategori (dari dataset Parquet) diunggah sebagai STRING biasa
+    df = df.astype({col: "object" for col in df.select_dtypes("category").columns})
+
+    skill_index = skill_index if skill_index is not None else SkillIndex(keep_postings=False).add(df)
     list_table = {"Glints": df, 
-            "Skills": table_skill}
+            **skill_index.tables()}
 
     for table_name, table in list_table.items():
         # Upload DataFrame to BigQuery
@@ -132,6 +209,54 @@ def upload_gbq(df:pd.DataFrame , project_id:str, dataset_id:str, key_path:str) -
         )
         print(f"Table {table_name} uploaded successfully!")
 
+
+def gbq_credentials(key_path:str):
+    """Service account credentials for BigQuery, from the key file at `key_path`."""
+    from google.oauth2 import service_account
+
+    scopes = ["https://www.googleapis.com/auth/bigquery"]
+    return service_account.Credentials.from_service_account_file(filename=key_path, scopes=scopes)
+
+
+def gbq_sink(project_id:str, dataset_id:str, key_path:str, table_name:str="Glints"):
+    """Returns a sink for `clean_in_chunks` that uploads every cleaned chunk to `table_name`:
+    the first chunk replaces the table and the next ones are appended."""
+    import pandas_gbq
+
+    credentials = gbq_credentials(key_path)
+    uploaded = []
+
+    def sink(df:pd.DataFrame) -> None:
+        df = df.astype({col: "object" for col in df.select_dtypes("category").columns})
+        pandas_gbq.to_gbq(
+            dataframe=df,
+            destination_table=f"{dataset_id}.{table_name}",
+            project_id=project_id,
+            if_exists="append" if uploaded else "replace",
+            credentials=credentials
+        )
+        uploaded.append(len(df))
+        print(f"Table {table_name}: chunk of {len(df)} rows uploaded ({sum(uploaded)} so far)")
+    return sink
+
+
+@timed("upload_gbq")
+def upload_skills_gbq(skill_index:SkillIndex, project_id:str, dataset_id:str, key_path:str) -> None:
+    """Replaces the skills tables (Skills, Skill_Pairs, Skills_Province, Skills_Industry) with the
+    aggregates of the index built by `clean_in_chunks`."""
+    import pandas_gbq
+
+    credentials = gbq_credentials(key_path)
+    for table_name, table in skill_index.tables().items():
+        pandas_gbq.to_gbq(
+            dataframe=table,
+            destination_table=f"{dataset_id}.{table_name}",
+            project_id=project_id,
+            if_exists="replace",
+            credentials=credentials
+        )
+        print(f"Table {table_name} uploaded successfully!")
+
 if __name__ == "__main__":
 
     # Mendapatkan main directory langsung
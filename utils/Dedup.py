@@ -0,0 +1,277 @@
+import datetime as dt
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.Urls import job_uuid
+from utils.Skills import canonical_skills
+from utils.Metrics import timed
+
+
+NUM_PERM = 64       # panjang signature MinHash
+BANDS = 16          # LSH: 16 band x 4 baris, kandidat mulai dari kemiripan ~0.5
+THRESHOLD = 0.8     # kemiripan (Jaccard perkiraan) minimal untuk dianggap duplikat
+BLOCK_SIZE = 5_000  # posting per blok saat menghitung signature, membatasi memori
+REPOST_MAX_AGE_DAYS = 30    # repost yang tidak terlihat lagi selama ini dilupakan (dicek ulang di run berikutnya)
+
+
+# _________________________________________________________________________________________ Signatures
+
+def _normalize(text:pd.Series) -> pd.Series:
+    return text.fillna("").astype(str).str.lower().str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+
+
+def posting_features(df:pd.DataFrame) -> pd.DataFrame:
+    """Feature set of every posting (one row per distinct feature): the words and word pairs of the
+    normalized job name, the company, the city and province, and the canonical skills.
+    `posting` is the position of the row in `df`."""
+    df = df.reset_index(drop=True)
+    parts = []
+
+    #--------------------------- - 1. Nama job: kata dan pasangan kata
+    words = _normalize(df["job_name"]).str.split()
+    bigrams = words.map(lambda w: [f"{a} {b}" for a, b in zip(w, w[1:])])
+    parts.append("n:" + (words + bigrams).explode().dropna())
+
+    #--------------------------- - 2. Perusahaan dan lokasi
+    for col, prefix in (("company_name", "c:"), ("city", "l:"), ("province", "l:")):
+        if col in df:
+            value = _normalize(df[col])
+            parts.append(prefix + value[value != ""])
+
+    #--------------------------- - 3. Skill kanonik
+    if "skills_requirements" in df:
+        skills = df["skills_requirements"].dropna().astype(str).str.split(",").explode().str.strip()
+        skills = canonical_skills(skills[skills != ""]).str.casefold()
+        parts.append("s:" + skills)
+
+    features = pd.concat(parts).rename("feature").rename_axis("posting").reset_index()
+    return features.drop_duplicates().sort_values("posting", kind="stable", ignore_index=True)
+
+
+class MinHasher:
+    """MinHash signatures of posting feature sets, computed with numpy in blocks of postings.
+
+    Args:
+        num_perm (int, optional): hash functions per signature. Defaults to NUM_PERM.
+        seed (int, optional): seed of the hash functions. Defaults to 0.
+    """
+
+    def __init__(self, num_perm:int=NUM_PERM, seed:int=0):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # multiply-shift hashing: (a*x + b) mod 2^64, 32 bit teratas; a harus ganjil
+        self.a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, df:pd.DataFrame, block_size:int=BLOCK_SIZE) -> tuple:
+        """Returns the signatures (one row of `num_perm` uint32 per posting of `df`) and a mask of
+        the postings that have at least one feature (the others cannot be compared)."""
+        features = posting_features(df)
+        posting = features["posting"].to_numpy()
+        hashes = pd.util.hash_array(features["feature"].to_numpy(dtype=object))
+
+        signatures = np.full((len(df), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        has_features = np.zeros(len(df), dtype=bool)
+        has_features[posting] = True
+
+        bounds = np.searchsorted(posting, np.arange(0, len(df) + block_size, block_size))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if start == end:
+                continue
+            block = posting[start:end]
+            with np.errstate(over="ignore"):
+                values = ((hashes[start:end, None] * self.a + self.b) >> np.uint64(32)).astype(np.uint32)
+            firsts = np.flatnonzero(np.r_[True, block[1:] != block[:-1]])
+            signatures[block[firsts]] = np.minimum.reduceat(values, firsts, axis=0)
+        return signatures, has_features
+
+
+# _________________________________________________________________________________________ Grouping
+
+def near_duplicate_groups(signatures:np.ndarray, valid:np.ndarray=None, bands:int=BANDS, threshold:float=THRESHOLD) -> np.ndarray:
+    """Groups near-duplicate postings with LSH banding, without comparing every pair: postings that
+    share a band bucket are compared (by signature) with the first posting of the bucket only.
+
+    Returns:
+        np.ndarray: group label of every posting (the smallest position in its group)
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    valid = np.ones(n, dtype=bool) if valid is None else valid
+    candidates = np.flatnonzero(valid)
+
+    edges = []
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[candidates, band*rows:(band+1)*rows]).view(f"V{4*rows}").ravel()
+        _, bucket, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = counts[bucket] > 1
+        if not shared.any():
+            continue
+        members, bucket = candidates[shared], bucket[shared]
+        first = np.full(len(counts), n, dtype=np.int64)
+        np.minimum.at(first, bucket, members)
+        representative = first[bucket]
+
+        others = members != representative
+        members, representative = members[others], representative[others]
+        similarity = (signatures[members] == signatures[representative]).mean(axis=1)
+        keep = similarity >= threshold
+        edges.append(np.stack([members[keep], representative[keep]], axis=1))
+
+    #--------------------------- - Komponen terhubung (label = posisi terkecil)
+    labels = np.arange(n)
+    edges = np.concatenate(edges) if edges else np.zeros((0, 2), dtype=np.int64)
+    if len(edges):
+        u, v = edges[:, 0], edges[:, 1]
+        while True:
+            lowest = np.minimum(labels[u], labels[v])
+            updated = labels.copy()
+            np.minimum.at(updated, u, lowest)
+            np.minimum.at(updated, v, lowest)
+            updated = updated[updated]
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+    return labels
+
+
+@timed("dedup")
+def mark_near_duplicates(df:pd.DataFrame, threshold:float=THRESHOLD, num_perm:int=NUM_PERM, bands:int=BANDS, seed:int=0) -> pd.DataFrame:
+    """Function to group every posting with its near-duplicates (reposts under a new UUID, slightly
+    changed titles, the same job posted by several companies) under a canonical ID: the job UUID
+    of the earliest posting of the group.
+
+    Args:
+        df (pd.DataFrame): job records
+        threshold (float, optional): minimum estimated Jaccard similarity. Defaults to THRESHOLD.
+        num_perm (int, optional): MinHash signature length. Defaults to NUM_PERM.
+        bands (int, optional): LSH bands (num_perm must be a multiple). Defaults to BANDS.
+        seed (int, optional): seed of the hash functions. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: copy of `df` with the `job_uuid` and `canonical_id` columns
+    """
+    df = df.copy()
+    if "job_uuid" not in df:
+        df["job_uuid"] = df["url"].map(job_uuid)
+    if df.empty:
+        df["canonical_id"] = df["job_uuid"]
+        return df
+
+    signatures, valid = MinHasher(num_perm, seed).signatures(df)
+    labels = near_duplicate_groups(signatures, valid, bands=bands, threshold=threshold)
+
+    # posting paling awal (post_time) menjadi kanonik
+    groups = pd.DataFrame({
+        "group": labels,
+        "key": df["job_uuid"].to_numpy(),
+        "time": pd.to_datetime(df["post_time"]).to_numpy() if "post_time" in df else np.arange(len(df)),
+    })
+    first = groups.sort_values("time", kind="stable", na_position="last").drop_duplicates("group")
+    df["canonical_id"] = groups["group"].map(dict(zip(first["group"], first["key"]))).to_numpy()
+
+    n_duplicates = int((df["canonical_id"] != df["job_uuid"]).sum())
+    print(f"\nNear-duplicates: {n_duplicates} of {len(df)} postings grouped into {len(df) - n_duplicates} canonical jobs")
+    return df
+
+
+def drop_near_duplicates(df:pd.DataFrame) -> pd.DataFrame:
+    """Keeps only the canonical posting of every group found by `mark_near_duplicates`."""
+    return df[df["canonical_id"] == df["job_uuid"]].drop(columns="canonical_id")
+
+
+# _________________________________________________________________________________________ Reposts
+
+class RepostIndex:
+    """Local index of known reposts (job UUID -> canonical job UUID), stored as JSON, so the
+    details of a known repost are not fetched again.
+
+    Every entry keeps the last time the repost was confirmed by `mark_near_duplicates`. Entries
+    older than `max_age_days` are dropped when the index is loaded: the posting is fetched and
+    compared again, so a repost that was edited into a different job is not skipped forever.
+
+    Args:
+        path (str, optional): location of the index file. Defaults to "data/reposts.json".
+        max_age_days (float, optional): lifetime of an entry. Defaults to REPOST_MAX_AGE_DAYS.
+    """
+
+    def __init__(self, path:str="data/reposts.json", max_age_days:float=REPOST_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = dt.timedelta(days=max_age_days)
+        self.reposts = {}
+        self.seen = {}      # job UUID -> waktu terakhir dikonfirmasi sebagai repost
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if "reposts" in stored and isinstance(stored["reposts"], dict):
+                self.reposts, self.seen = stored["reposts"], stored.get("seen", {})
+            else:
+                # format lama: {job_uuid: canonical_id}, tanpa waktu
+                now = dt.datetime.now().isoformat()
+                self.reposts, self.seen = stored, {key: now for key in stored}
+        self.expire()
+
+    def __len__(self) -> int:
+        return len(self.reposts)
+
+    def expire(self) -> int:
+        """Drops the entries not confirmed for `max_age_days`, returns how many were dropped."""
+        oldest = (dt.datetime.now() - self.max_age).isoformat()
+        expired = [key for key in self.reposts if self.seen.get(key, "") < oldest]
+        for key in expired:
+            self.reposts.pop(key)
+            self.seen.pop(key, None)
+        return len(expired)
+
+    def update(self, df:pd.DataFrame) -> None:
+        """Records the reposts of a frame marked by `mark_near_duplicates`."""
+        reposts = df[df["canonical_id"] != df["job_uuid"]]
+        now = dt.datetime.now().isoformat()
+        self.reposts.update(zip(reposts["job_uuid"], reposts["canonical_id"]))
+        self.seen.update((key, now) for key in reposts["job_uuid"])
+        # posting yang kini kanonik bukan repost lagi
+        for key in df.loc[df["canonical_id"] == df["job_uuid"], "job_uuid"]:
+            self.reposts.pop(key, None)
+            self.seen.pop(key, None)
+
+    def canonical(self, key:str) -> str:
+        return self.reposts.get(key, key)
+
+    def save(self) -> None:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"reposts": self.reposts, "seen": self.seen}, f)
+        os.replace(tmp_path, self.path)
+
+
+def drop_chunk_duplicates(df:pd.DataFrame, index:RepostIndex) -> pd.DataFrame:
+    """Near-duplicate removal for one chunk of a chunked run (`clean_in_chunks`): postings already
+    known as reposts (earlier chunks or runs) are dropped, the chunk is grouped with
+    `mark_near_duplicates`, its reposts are recorded in `index` and only its canonical postings kept.
+
+    Duplicates are found inside a chunk and against the reposts known so far; a posting whose
+    canonical posting is in another chunk of the same run is only caught by a non-chunked run.
+    """
+    df = df.copy()
+    if "job_uuid" not in df:
+        df["job_uuid"] = df["url"].map(job_uuid)
+    df = df[~df["job_uuid"].isin(index.reposts.keys())]
+    if df.empty:
+        return df
+    df = mark_near_duplicates(df)
+    index.update(df)
+    return drop_near_duplicates(df)
+
+
+def skip_known_reposts(links:list, index:RepostIndex) -> list:
+    """Drops the links of jobs already known to be reposts of another job."""
+    selected = [link for link in links if job_uuid(link) not in index.reposts]
+    if len(selected) < len(links):
+        print(f"\nSkipping {len(links) - len(selected)} known reposts")
+    return selected
@@ -0,0 +1,150 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.Metrics import METRICS
+
+
+# Status / judul halaman yang menandakan request dibatasi oleh server (semua 5xx juga dianggap sementara).
+# Judul dicocokkan utuh: judul halaman job biasa bisa saja memuat "429" atau kata yang sama
+THROTTLE_STATUS = (429, 503)
+THROTTLE_TITLES = {"too many requests", "429 too many requests", "error 429", "429",
+                   "service unavailable", "503 service unavailable", "503 service temporarily unavailable"}
+
+
+class ThrottledError(Exception):
+    """Raised when glints.com answers with a throttling response (429) or a server error (5xx) instead of the page."""
+
+
+# Kegagalan sementara: request boleh diulang setelah backoff
+TRANSIENT_ERRORS = (WebDriverException, requests.Timeout, requests.ConnectionError, ThrottledError)
+# Kegagalan permanen (4xx selain 429, mis. 404/410 untuk job yang sudah ditutup):
+# tidak diulang dan tidak menurunkan laju governor
+PERMANENT_ERRORS = (requests.HTTPError,)
+
+
+def check_status(response:requests.Response, url:str) -> None:
+    """Raises ThrottledError for 429 and 5xx responses, and requests.HTTPError for the other 4xx."""
+    if response.status_code in THROTTLE_STATUS or response.status_code >= 500:
+        raise ThrottledError(f"HTTP {response.status_code} while loading {url}")
+    response.raise_for_status()
+
+
+def is_throttle_title(title:str) -> bool:
+    """True when `title` is the title of a throttling / server error page (Selenium has no HTTP status)."""
+    return " ".join((title or "").split()).lower() in THROTTLE_TITLES
+
+
+# _________________________________________________________________________________________ Fetcher backends
+#
+# A fetcher only has to provide `get_html(url, wait_selector=None) -> str`.
+# `collect_job_links` and `extract_job_details` accept either a fetcher or a plain
+# Selenium WebDriver (wrapped in `SeleniumFetcher` by `as_fetcher`).
+
+class SeleniumFetcher:
+    """Fetcher backend that loads every page in a full Firefox session.
+
+    Args:
+        browser (webdriver): Selenium WebDriver instance.
+        max_waiting_time (int, optional): seconds to wait for `wait_selector`. Defaults to 15.
+    """
+
+    def __init__(self, browser, max_waiting_time:int=15):
+        self.browser = browser
+        self.max_waiting_time = max_waiting_time
+
+    def get_html(self, url:str, wait_selector:str=None) -> str:
+        with METRICS.time("page_load"):
+            self.browser.get(url)
+        if is_throttle_title(self.browser.title):
+            raise ThrottledError(f"Throttled while loading {url}")
+        if wait_selector:
+            with METRICS.time("wait_selector"):
+                WebDriverWait(self.browser, self.max_waiting_time).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                )
+        return self.browser.page_source
+
+    def close(self) -> None:
+        self.browser.quit()
+
+
+class HttpFetcher:
+    """Browserless fetcher backend that downloads pages over a pooled keep-alive HTTP session.
+    `wait_selector` is ignored because the server-rendered HTML is used as is.
+
+    Args:
+        session (requests.Session, optional): session to use. Defaults to a new session.
+        timeout (int, optional): request timeout in seconds. Defaults to 15.
+        pool_size (int, optional): number of keep-alive connections kept per host. Defaults to 10.
+    """
+
+    def __init__(self, session:requests.Session=None, timeout:int=15, pool_size:int=10):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_browser(cls, browser, timeout:int=15, pool_size:int=10) -> "HttpFetcher":
+        """Builds an HttpFetcher that reuses the cookies and user agent of a logged-in browser.
+
+        Args:
+            browser (webdriver): Selenium WebDriver instance, already logged in through `glints_login`.
+            timeout (int, optional): request timeout in seconds. Defaults to 15.
+            pool_size (int, optional): number of keep-alive connections kept per host. Defaults to 10.
+
+        Returns:
+            HttpFetcher: fetcher sharing the browser's authenticated session
+        """
+        session = requests.Session()
+        session.headers["User-Agent"] = browser.execute_script("return navigator.userAgent")
+        for cookie in browser.get_cookies():
+            session.cookies.set(cookie["name"], cookie["value"],
+                                domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        return cls(session=session, timeout=timeout, pool_size=pool_size)
+
+    def get_html(self, url:str, wait_selector:str=None) -> str:
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.Timeout as e:
+            raise TimeoutException(str(e)) from e
+        check_status(response, url)
+        return response.text
+
+    def get_html_conditional(self, url:str, etag:str=None, last_modified:str=None, wait_selector:str=None) -> tuple:
+        """Conditional GET used to revalidate cached pages.
+
+        Returns:
+            tuple: (html, etag, last_modified); html is None when the server answered 304 Not Modified
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.Timeout as e:
+            raise TimeoutException(str(e)) from e
+        if response.status_code == 304:
+            return None, etag, last_modified
+        check_status(response, url)
+        return response.text, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def as_fetcher(browser_or_fetcher):
+    """Returns `browser_or_fetcher` unchanged if it already is a fetcher, otherwise wraps
+    the Selenium WebDriver in a `SeleniumFetcher`."""
+    if hasattr(browser_or_fetcher, "get_html"):
+        return browser_or_fetcher
+    return SeleniumFetcher(browser_or_fetcher)
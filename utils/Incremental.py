@@ -0,0 +1,87 @@
+import datetime as dt
+import json
+import os
+
+import pandas as pd
+
+from utils.Urls import job_uuid
+
+
+class StateIndex:
+    """Local index of every job UUID seen in earlier crawls, stored as JSON.
+
+    For each UUID the index keeps `last_seen` (the last time the job appeared in the search
+    results) and `last_fetched` (the last time its details were extracted).
+
+    Args:
+        path (str, optional): location of the index file. Defaults to "data/state_index.json".
+    """
+
+    def __init__(self, path:str="data/state_index.json"):
+        self.path = path
+        self.jobs = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.jobs = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def seed_from_dataset(self, df:pd.DataFrame) -> None:
+        """Fills an empty index from an already stored dataset, using its `url` and `obtained` columns."""
+        for url, obtained in zip(df["url"], pd.to_datetime(df["obtained"])):
+            stamp = obtained.isoformat()
+            self.jobs.setdefault(job_uuid(url), {"last_seen": stamp, "last_fetched": stamp})
+
+    def needs_fetch(self, key:str, refresh_days:float=7) -> bool:
+        """True when the job is unknown, or its details are older than `refresh_days`."""
+        state = self.jobs.get(key)
+        if state is None or state.get("last_fetched") is None:
+            return True
+        age = dt.datetime.now() - dt.datetime.fromisoformat(state["last_fetched"])
+        return age > dt.timedelta(days=refresh_days)
+
+    def mark_seen(self, keys:list) -> None:
+        now = dt.datetime.now().isoformat()
+        for key in keys:
+            self.jobs.setdefault(key, {"last_fetched": None})["last_seen"] = now
+
+    def mark_fetched(self, keys:list) -> None:
+        now = dt.datetime.now().isoformat()
+        for key in keys:
+            self.jobs.setdefault(key, {"last_seen": now})["last_fetched"] = now
+
+    def save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.jobs, f)
+        os.replace(tmp_path, self.path)
+
+
+def select_links_to_fetch(links:list, index:StateIndex, refresh_days:float=7) -> list:
+    """Keeps only the links whose job is new, or whose details are older than `refresh_days`.
+    Duplicate links of the same job (e.g. a different `traceInfo`) are dropped as well.
+    Every link is marked as seen in the index.
+
+    Args:
+        links (list): job links returned by `collect_job_links`
+        index (StateIndex): state index of earlier crawls
+        refresh_days (float, optional): refresh window in days. Defaults to 7.
+
+    Returns:
+        list: links that need a detail fetch
+    """
+    selected = []
+    keys = set()
+    for link in links:
+        key = job_uuid(link)
+        if key in keys:
+            continue
+        keys.add(key)
+        if index.needs_fetch(key, refresh_days):
+            selected.append(link)
+
+    index.mark_seen(keys)
+    print(f"\nIncremental mode: {len(selected)} of {len(keys)} jobs are new or older than {refresh_days} days.")
+    return selected
+
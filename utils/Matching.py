@@ -0,0 +1,169 @@
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional, the pure Python automaton is used without it
+    ahocorasick = None
+
+
+# _________________________________________________________________________________________ Automaton
+
+class _Automaton:
+    """Pure Python Aho–Corasick automaton: finds every keyword in one pass over the text."""
+
+    def __init__(self, words:dict):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [frozenset()]
+
+        #--------------------------- - 1. Trie
+        for word, ids in words.items():
+            state = 0
+            for char in word:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(frozenset())
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.out[state] = self.out[state] | ids
+
+        #--------------------------- - 2. Failure links (BFS)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.out[child] = self.out[child] | self.out[self.fail[child]]
+
+    def search(self, text:str) -> set:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        found = set()
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def contains(self, text:str) -> bool:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                return True
+        return False
+
+
+class _PyAhoCorasick:
+    """Same interface on the C implementation of pyahocorasick."""
+
+    def __init__(self, words:dict):
+        self.automaton = ahocorasick.Automaton()
+        for word, ids in words.items():
+            self.automaton.add_word(word, ids)
+        self.automaton.make_automaton()
+
+    def search(self, text:str) -> set:
+        found = set()
+        for _, ids in self.automaton.iter(text):
+            found |= ids
+        return found
+
+    def contains(self, text:str) -> bool:
+        return next(self.automaton.iter(text), None) is not None
+
+
+# _________________________________________________________________________________________ Matcher
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher for many keywords at once, compiled once into an
+    Aho–Corasick automaton. Columns are matched per unique value and mapped back, so repeated
+    job names or skill lists are only scanned once.
+
+    Args:
+        keywords (list | dict): keywords, each one its own tag, or a taxonomy {tag: [keywords]}
+    """
+
+    def __init__(self, keywords):
+        taxonomy = keywords if isinstance(keywords, dict) else {keyword: [keyword] for keyword in keywords}
+        self.tags = list(taxonomy)
+
+        words = {}
+        for i, tag_words in enumerate(taxonomy.values()):
+            for keyword in tag_words:
+                word = str(keyword).lower()
+                if word:
+                    words[word] = words.get(word, frozenset()) | {i}
+        self.automaton = _PyAhoCorasick(words) if ahocorasick is not None else _Automaton(words)
+
+    def find(self, text:str) -> tuple:
+        """Tags matched in `text`, in taxonomy order."""
+        if not isinstance(text, str):
+            return ()
+        return tuple(self.tags[i] for i in sorted(self.automaton.search(text.lower())))
+
+    def _per_unique(self, texts:pd.Series) -> tuple:
+        codes, uniques = pd.factorize(texts.astype("string"), use_na_sentinel=True)
+        return codes, pd.Series(uniques).str.lower().tolist()
+
+    def match(self, texts:pd.Series) -> pd.Series:
+        """Tags matched in every value of `texts` (tuple per row, empty when nothing matched)."""
+        codes, uniques = self._per_unique(texts)
+        found = [tuple(self.tags[i] for i in sorted(self.automaton.search(text))) for text in uniques]
+        lookup = np.empty(len(found) + 1, dtype=object)
+        lookup[:-1] = found
+        lookup[-1] = ()   # NaN (kode -1)
+        return pd.Series(lookup[codes], index=texts.index)
+
+    def mask(self, texts:pd.Series) -> pd.Series:
+        """True for every value of `texts` containing at least one keyword."""
+        codes, uniques = self._per_unique(texts)
+        lookup = np.array([self.automaton.contains(text) for text in uniques] + [False])
+        return pd.Series(lookup[codes], index=texts.index)
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(key:tuple) -> KeywordMatcher:
+    return KeywordMatcher({tag: list(words) for tag, words in key})
+
+
+def get_matcher(keywords) -> KeywordMatcher:
+    """Returns the compiled matcher for `keywords` (list or {tag: [keywords]}), building it only once."""
+    taxonomy = keywords if isinstance(keywords, dict) else {keyword: [keyword] for keyword in keywords}
+    return _cached_matcher(tuple((tag, tuple(words)) for tag, words in taxonomy.items()))
+
+
+def tag_keywords(df:pd.DataFrame, keywords, columns:list=("job_name", "skills_requirements", "another_requirements"),
+                 name:str="matched_tags") -> pd.DataFrame:
+    """Adds a column listing (comma separated) the tags of `keywords` matched in any of `columns`.
+
+    Args:
+        df (pd.DataFrame): job records
+        keywords (list | dict): keywords, or a taxonomy {tag: [keywords]}
+        columns (list, optional): text columns to search. Defaults to job name, skills and other requirements.
+        name (str, optional): name of the new column. Defaults to "matched_tags".
+
+    Returns:
+        pd.DataFrame: copy of `df` with the tag column
+    """
+    matcher = get_matcher(keywords)
+    order = {tag: i for i, tag in enumerate(matcher.tags)}
+    per_column = [matcher.match(df[col]) for col in columns if col in df]
+
+    df = df.copy()
+    df[name] = [", ".join(sorted(set().union(*tags), key=order.get)) for tags in zip(*per_column)] if per_column else ""
+    return df
@@ -0,0 +1,191 @@
+import bisect
+import functools
+import itertools
+import json
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Batas bucket histogram (detik), dipakai untuk laporan JSON dan format Prometheus
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Timer yang dihitung sebagai satu halaman yang diunduh (untuk pages/sec)
+PAGE_TIMERS = ("request_page", "fetch_page")
+
+# Sampel per timer untuk p50/p95: memori tetap, persentil tepat selama observasi <= ukuran ini
+RESERVOIR_SIZE = 2048
+
+
+class Timer:
+    """Running aggregates of one timer: exact count, total, max and histogram buckets, and a
+    fixed-size uniform sample of the observations (reservoir sampling) for the percentiles."""
+
+    def __init__(self, size:int=RESERVOIR_SIZE, rng:random.Random=None):
+        self.size = size
+        self.rng = rng or random.Random(0)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)    # per bucket, belum kumulatif
+        self.sample = []
+
+    def add(self, seconds:float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        i = bisect.bisect_left(BUCKETS, seconds)
+        if i < len(BUCKETS):
+            self.buckets[i] += 1
+        if len(self.sample) < self.size:
+            self.sample.append(seconds)
+        else:
+            j = self.rng.randrange(self.count)
+            if j < self.size:
+                self.sample[j] = seconds
+
+
+class Metrics:
+    """Thread-safe registry of wall-time observations and counters for one run.
+
+    Every stage records its duration under a name (`observe`, `time`, or the `timed` decorator),
+    and events are counted with `count`. `report` turns them into a summary with count, total,
+    p50/p95 latency and a histogram per stage, plus pages/sec and the time spent sleeping.
+    Memory per stage is fixed: count, total, max and the histogram are exact, and the percentiles
+    come from a sample of at most `reservoir_size` observations (see `Timer`).
+    """
+
+    def __init__(self, reservoir_size:int=RESERVOIR_SIZE):
+        self._lock = threading.Lock()
+        self.reservoir_size = reservoir_size
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.timers = {}
+            self.counters = {}
+            self._rng = random.Random(0)
+
+    def observe(self, name:str, seconds:float) -> None:
+        with self._lock:
+            if name not in self.timers:
+                self.timers[name] = Timer(self.reservoir_size, self._rng)
+            self.timers[name].add(seconds)
+
+    def count(self, name:str, n:float=1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def time(self, name:str):
+        """Context manager recording the wall time of its block under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @staticmethod
+    def _percentile(values:list, q:float) -> float:
+        rank = max(1, math.ceil(q / 100 * len(values)))
+        return values[rank - 1]
+
+    def report(self) -> dict:
+        """Summary of the run so far.
+
+        Returns:
+            dict: run wall time, pages/sec, seconds spent sleeping, and per stage count, total,
+                mean, p50, p95, max and cumulative histogram buckets (seconds)
+        """
+        with self._lock:
+            timers = {name: (timer.count, timer.total, timer.max, list(timer.buckets), sorted(timer.sample))
+                      for name, timer in self.timers.items()}
+            counters = dict(self.counters)
+        elapsed = time.time() - self.started
+
+        stages = {}
+        for name, (count, total, longest, buckets, sample) in timers.items():
+            stages[name] = {
+                "count": count,
+                "total": round(total, 6),
+                "mean": round(total / count, 6),
+                "p50": round(self._percentile(sample, 50), 6),
+                "p95": round(self._percentile(sample, 95), 6),
+                "max": round(longest, 6),
+                "buckets": {str(le): n for le, n in zip(BUCKETS, itertools.accumulate(buckets))},
+            }
+
+        pages = sum(timers[name][0] for name in PAGE_TIMERS if name in timers)
+        return {
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "elapsed_seconds": round(elapsed, 3),
+            "pages": pages,
+            "pages_per_sec": round(pages / elapsed, 4) if elapsed else 0.0,
+            "sleep_seconds": round(timers["sleep"][1], 3) if "sleep" in timers else 0.0,
+            "counters": counters,
+            "stages": stages,
+        }
+
+    def to_prometheus(self, prefix:str="glints") -> str:
+        """Report in the Prometheus text exposition format (one histogram per stage, one counter per event)."""
+        report = self.report()
+        lines = []
+        for name, stage in report["stages"].items():
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for le, n in stage["buckets"].items():
+                lines.append(f'{metric}_bucket{{le="{le}"}} {n}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {stage["count"]}')
+            lines.append(f"{metric}_sum {stage['total']}")
+            lines.append(f"{metric}_count {stage['count']}")
+        for name, value in report["counters"].items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name in ("elapsed_seconds", "pages_per_sec", "sleep_seconds"):
+            lines.append(f"# TYPE {prefix}_run_{name} gauge")
+            lines.append(f"{prefix}_run_{name} {report[name]}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path:str="data/run_report.json", prometheus_path:str=None) -> dict:
+        """Writes the run report as JSON (and optionally in Prometheus text format) and prints a short summary.
+
+        Args:
+            path (str, optional): JSON report file. Defaults to "data/run_report.json".
+            prometheus_path (str, optional): Prometheus text file. Defaults to None (not written).
+
+        Returns:
+            dict: the report
+        """
+        report = self.report()
+        for file_path in filter(None, (path, prometheus_path)):
+            folder = os.path.dirname(file_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        if prometheus_path:
+            with open(prometheus_path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+
+        print(f"\nRun report: {report['pages']} pages in {report['elapsed_seconds']}s "
+              f"({report['pages_per_sec']} pages/sec, {report['sleep_seconds']}s sleeping), saved to {path}")
+        return report
+
+
+# Registry untuk seluruh proses
+METRICS = Metrics()
+
+
+def timed(name:str):
+    """Decorator recording the wall time of every call of the function under `name` in `METRICS`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.time(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,142 @@
+import pandas as pd
+
+from utils.Metrics import timed
+from utils.Urls import job_uuid
+
+
+# Urutan kolom dataset mentah (Glints_RAW.csv)
+RAW_COLUMNS = [
+    "job_name", "job_type", "salary_range", "salary_min", "salary_max", "salary_currency", "salary_period",
+    "skills_requirements", "education_requirements", "experience_requirements", "another_requirements",
+    "province", "city", "district", "company_name", "company_industry", "company_size",
+    "last_post", "post_time", "obtained", "url",
+]
+
+# e.g. "IDR7.000.000 - 10.000.000/Bulan", "Rp5.500.000/Bulan", "USD1,000.50 - 2,000/Month"
+SALARY_PATTERN = r"^\s*(?P<currency>[A-Za-z]{2,3})\s*(?P<min>\d[\d.,]*)(?:\s*-\s*(?P<max>\d[\d.,]*))?(?:\s*/\s*(?P<period>\w+))?"
+
+# Kode mata uang yang ditulis lain di halaman job
+SALARY_CURRENCIES = {"RP": "IDR"}
+
+# Mata uang dengan "." sebagai pemisah ribuan dan "," sebagai desimal (IDR7.000.000,50);
+# yang lain memakai "," untuk ribuan dan "." untuk desimal (USD1,500.50)
+DOT_THOUSANDS_CURRENCIES = {"IDR", "VND"}
+
+SALARY_PERIODS = {
+    "jam": "hour", "hour": "hour",
+    "hari": "day", "day": "day",
+    "minggu": "week", "week": "week",
+    "bulan": "month", "month": "month",
+    "tahun": "year", "year": "year",
+}
+
+# e.g. "5 menit yang lalu", "kemarin", "3 hari yang lalu", "1 tahun yang lalu"
+POST_TIME_PATTERN = r"(?P<n>\d+)\s*(?P<unit>menit|jam|hari|minggu|bulan|tahun)"
+
+POST_TIME_UNITS = {"menit": "min", "jam": "h", "hari": "D", "minggu": "W"}
+
+
+def _parse_amount(amount:pd.Series, dot_thousands) -> pd.Series:
+    """Salary amounts as numbers, with the separators of their currency (see DOT_THOUSANDS_CURRENCIES)."""
+    dot_style = amount.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    comma_style = amount.str.replace(",", "", regex=False)
+    return pd.to_numeric(dot_style.where(dot_thousands, comma_style).astype(object), errors="coerce").astype(float)
+
+
+def parse_salary(salary_range:pd.Series) -> pd.DataFrame:
+    """Parses the whole `salary_range` column at once.
+    Ranges give `salary_min` and `salary_max`, single values give the same value for both,
+    and "Unspecified" (or any unknown format) gives NaN. The currency code is matched in any
+    case ("Rp" is stored as IDR), and thousands / decimal separators follow the currency.
+
+    Args:
+        salary_range (pd.Series): salary text shown on the job pages
+
+    Returns:
+        pd.DataFrame: `salary_min`, `salary_max`, `salary_currency` and `salary_period` columns
+    """
+    parts = salary_range.astype("string").str.extract(SALARY_PATTERN)
+    currency = parts["currency"].str.upper().replace(SALARY_CURRENCIES)
+    dot_thousands = currency.isin(DOT_THOUSANDS_CURRENCIES).fillna(False).to_numpy(dtype=bool)
+    salary_min = _parse_amount(parts["min"], dot_thousands)
+    salary_max = _parse_amount(parts["max"], dot_thousands)
+
+    return pd.DataFrame({
+        "salary_min": salary_min.astype(float),
+        "salary_max": salary_max.fillna(salary_min).astype(float),
+        "salary_currency": currency.astype(object),
+        "salary_period": parts["period"].str.lower().map(SALARY_PERIODS).astype(object),
+    }, index=salary_range.index)
+
+
+def parse_post_time(last_post:pd.Series, reference) -> pd.Series:
+    """Converts the relative Indonesian post times of a whole column to timestamps.
+
+    Args:
+        last_post (pd.Series): relative post time shown on the job pages (e.g. "3 hari yang lalu")
+        reference (pd.Timestamp | pd.Series): time the post times are counted from, either one
+            timestamp for every row or one per row (e.g. the `obtained` column)
+
+    Returns:
+        pd.Series: post timestamps (NaT when the format is unknown)
+    """
+    text = last_post.astype("string").str.lower()
+    parts = text.str.extract(POST_TIME_PATTERN)
+    n = pd.to_numeric(parts["n"], errors="coerce")
+    unit = parts["unit"]
+
+    yesterday = unit.isna() & text.str.contains("kemarin", na=False)
+    n = n.mask(yesterday, 1)
+    unit = unit.mask(yesterday, "hari")
+
+    if not isinstance(reference, pd.Series):
+        reference = pd.Series(pd.Timestamp(reference), index=last_post.index)
+    reference = pd.to_datetime(reference).dt.floor("s")
+
+    post_time = pd.Series(pd.NaT, index=last_post.index, dtype="datetime64[ns]")
+    for name, freq in POST_TIME_UNITS.items():
+        mask = unit == name
+        if mask.any():
+            post_time[mask] = reference[mask] - pd.to_timedelta(n[mask], unit=freq)
+
+    # bulan dan tahun tidak punya panjang tetap, dihitung per nilai unik
+    for name, offset in (("bulan", "months"), ("tahun", "years")):
+        mask = unit == name
+        for value in n[mask].unique():
+            rows = mask & (n == value)
+            post_time[rows] = reference[rows] - pd.DateOffset(**{offset: int(value)})
+
+    return post_time
+
+
+@timed("normalize_jobs")
+def normalize_jobs(df:pd.DataFrame, reference=None) -> pd.DataFrame:
+    """Normalization stage for raw job records: derives the salary and `post_time` columns
+    for the whole frame at once and puts the columns in the `RAW_COLUMNS` order.
+
+    Args:
+        df (pd.DataFrame): raw records from `extract_job_details`
+        reference (pd.Timestamp, optional): time relative post times are counted from.
+            Defaults to the `obtained` column (the time each page was fetched).
+
+    Returns:
+        pd.DataFrame: normalized records
+    """
+    df = df.copy()
+    if reference is None:
+        reference = pd.to_datetime(df["obtained"]) if "obtained" in df else pd.Timestamp.now()
+
+    salary = parse_salary(df["salary_range"])
+    for col in salary.columns:
+        df[col] = salary[col]
+    df["post_time"] = parse_post_time(df["last_post"], reference)
+
+    extra_columns = [col for col in df.columns if col not in RAW_COLUMNS]
+    return df.reindex(columns=[col for col in RAW_COLUMNS if col in df.columns] + extra_columns)
+
+
+def add_matched_keywords(df:pd.DataFrame, matched:dict) -> pd.DataFrame:
+    """Adds a `matched_keywords` column (comma separated) from the result of `collect_job_links_multi`."""
+    df = df.copy()
+    df["matched_keywords"] = df["url"].map(job_uuid).map(lambda key: ", ".join(matched.get(key, [])))
+    return df
@@ -0,0 +1,162 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.Urls import job_uuid
+
+
+# Kolom dengan nilai berulang, disimpan dictionary-encoded
+CATEGORICAL_COLUMNS = [
+    "job_type", "salary_currency", "salary_period", "education_requirements", "experience_requirements",
+    "province", "city", "district", "company_industry", "company_size",
+]
+
+DATETIME_COLUMNS = ["post_time", "obtained"]
+
+# Baris per row group; iter_parquet hanya membaca satu row group sekaligus
+ROW_GROUP_SIZE = 50_000
+
+
+def _typed(df:pd.DataFrame) -> pd.DataFrame:
+    """Casts the raw columns to the types stored in Parquet."""
+    df = df.copy()
+    for col in DATETIME_COLUMNS:
+        if col in df:
+            df[col] = pd.to_datetime(df[col])
+    for col in ("salary_min", "salary_max"):
+        if col in df:
+            df[col] = df[col].astype(float)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def append_parquet(df:pd.DataFrame, root:str="data/glints") -> list:
+    """Appends raw job records to a Parquet dataset partitioned by scrape date
+    (`<root>/scrape_date=YYYY-MM-DD/part.parquet`). Inside a partition, records are
+    deduplicated on job UUID and the newest record wins; across partitions the
+    newest record wins at read time (see `read_parquet`).
+
+    Args:
+        df (pd.DataFrame): normalized raw records
+        root (str, optional): dataset folder. Defaults to "data/glints".
+
+    Returns:
+        list: scrape dates (partitions) that were written
+    """
+    df = _typed(df)
+    df["job_uuid"] = df["url"].map(job_uuid)
+    scrape_date = df["obtained"].dt.strftime("%Y-%m-%d")
+
+    written = []
+    for date, part in df.groupby(scrape_date, sort=True):
+        folder = os.path.join(root, f"scrape_date={date}")
+        path = os.path.join(folder, "part.parquet")
+        os.makedirs(folder, exist_ok=True)
+
+        if os.path.exists(path):
+            part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+        part = part.sort_values("obtained", kind="stable").drop_duplicates("job_uuid", keep="last")
+        part = _typed(part)  # concat bisa mengubah kategori menjadi object
+
+        tmp_path = path + ".tmp"
+        part.to_parquet(tmp_path, index=False, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+        written.append(date)
+
+    print(f"\nSuccessfully saved {len(df)} jobs to Parquet dataset {root} (partitions: {', '.join(written)})")
+    return written
+
+
+def _partition_paths(root:str, dates:list=None, newest_first:bool=False) -> list:
+    """Paths of the partition files of the dataset, sorted by scrape date."""
+    partitions = sorted((name for name in os.listdir(root) if name.startswith("scrape_date=")), reverse=newest_first)
+    if dates:
+        partitions = [name for name in partitions if name.split("=", 1)[1] in set(dates)]
+    paths = [os.path.join(root, name, "part.parquet") for name in partitions]
+    return [path for path in paths if os.path.exists(path)]
+
+
+def _present(path:str, columns:list) -> list:
+    """Requested columns that the partition file actually has (older partitions lack newer columns)."""
+    if columns is None:
+        return None
+    names = set(pq.read_schema(path).names)
+    return [col for col in columns if col in names]
+
+
+def read_parquet(root:str="data/glints", columns:list=None, dates:list=None, latest_only:bool=True) -> pd.DataFrame:
+    """Reads the Parquet dataset, touching only the requested columns and partitions.
+    Every partition is read with its own schema and the results are concatenated, so a column
+    added later (e.g. `matched_keywords`) or all-null in an old partition is kept for the
+    partitions that have it, and missing values are NaN elsewhere.
+
+    Args:
+        root (str, optional): dataset folder. Defaults to "data/glints".
+        columns (list, optional): columns to read. Defaults to all columns.
+        dates (list, optional): scrape dates ("YYYY-MM-DD") to read. Defaults to all partitions.
+        latest_only (bool, optional): keep only the newest record of every job UUID. Defaults to True.
+
+    Returns:
+        pd.DataFrame: stored records (empty when the dataset does not exist yet)
+    """
+    paths = _partition_paths(root, dates) if os.path.exists(root) else []
+    if not paths:
+        return pd.DataFrame(columns=columns)
+
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys(columns + (["job_uuid", "obtained"] if latest_only else [])))
+
+    frames = [pq.read_table(path, columns=_present(path, read_columns)).to_pandas() for path in paths]
+    all_columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    # kolom yang seluruhnya null di satu partisi tidak boleh menentukan tipe kolom gabungan
+    frames = [frame.dropna(axis=1, how="all") for frame in frames]
+    df = _typed(pd.concat(frames, ignore_index=True).reindex(columns=all_columns))
+    if latest_only and not df.empty:
+        df = df.sort_values("obtained", kind="stable").drop_duplicates("job_uuid", keep="last")
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    return df.reset_index(drop=True)
+
+
+def iter_parquet(root:str="data/glints", chunk_size:int=50_000, columns:list=None, dates:list=None, latest_only:bool=True):
+    """Reads the Parquet dataset as a stream of chunks of at most `chunk_size` rows, so large
+    histories can be processed without loading them at once. Partitions are read newest first;
+    with `latest_only` a job UUID already read from a newer partition is skipped (only the
+    set of UUIDs is kept in memory). Every chunk has the same columns: the requested ones, or
+    the columns of the newest partition, with NaN where an older partition lacks them.
+
+    Args:
+        root (str, optional): dataset folder. Defaults to "data/glints".
+        chunk_size (int, optional): maximum rows per chunk. Defaults to 50_000.
+        columns (list, optional): columns to read. Defaults to all columns.
+        dates (list, optional): scrape dates ("YYYY-MM-DD") to read. Defaults to all partitions.
+        latest_only (bool, optional): keep only the newest record of every job UUID. Defaults to True.
+
+    Yields:
+        pd.DataFrame: chunk of stored records
+    """
+    if not os.path.exists(root):
+        return
+
+    paths = _partition_paths(root, dates, newest_first=True)
+    if not paths:
+        return
+    output_columns = columns if columns is not None else pq.read_schema(paths[0]).names
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys(columns + (["job_uuid"] if latest_only else [])))
+
+    seen = set()
+    for path in paths:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=_present(path, read_columns)):
+            df = batch.to_pandas()
+            if latest_only:
+                df = df[~df["job_uuid"].isin(seen)]
+                seen.update(df["job_uuid"])
+            df = df.reindex(columns=output_columns)
+            if not df.empty:
+                yield df.reset_index(drop=True)
@@ -0,0 +1,199 @@
+import re
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree, html as lxml_html
+    from cssselect import GenericTranslator
+except ImportError:  # lxml is optional, the html.parser backend is used without it
+    lxml_html = None
+
+
+# _________________________________________________________________________________________ Selectors
+#
+# Every field of a job detail page, as (field, css selector, default, kind):
+#   text      -> get_text() of the first match, or the default
+#   required  -> get_text(strip=True) of the first match, the page is rejected when missing
+#   skills    -> stripped, non-empty text of every <span> inside the first match
+#   tags      -> get_text() of every match after the first three
+# Class selectors written as [class="..."] match the whole class attribute, like
+# BeautifulSoup's find(class_="a b").
+
+JOB_FIELDS = [
+    ("job_name", "h1.TopFoldsc__JobOverViewTitle-sc-1fbktg5-3", "No Title", "text"),
+    ("education", "div.TopFoldsc__JobOverViewInfo-sc-1fbktg5-9:nth-child(4) > span", "No Requirement", "text"),
+    ("job_type", "div.TopFoldsc__JobOverViewInfo-sc-1fbktg5-9:nth-child(3)", "Unspecified", "text"),
+    ("experience", "div.TopFoldsc__JobOverViewInfo-sc-1fbktg5-9:nth-child(5)", "No Requirement", "text"),
+    ("salary", ".TopFoldsc__BasicSalary-sc-1fbktg5-13", "Unspecified", "text"),
+    ("post_time", 'span[class="TopFoldsc__PostedAt-sc-1fbktg5-12 fcmpfD"]', None, "required"),
+    ("skills", 'div[class="Opportunitysc__SkillsContainer-sc-gb4ubh-10 jccjri"]', [], "skills"),
+    ("requirements", 'div[class="TagStyle-sc-r1wv7a-4 bJWZOt JobRequirementssc__Tag-sc-15g5po6-3 cIkSrV"]', [], "tags"),
+    ("province", "label.BreadcrumbStyle__BreadcrumbItemWrapper-sc-eq3cq-0:nth-child(3) > a", "Unspecified", "text"),
+    ("city", "label.BreadcrumbStyle__BreadcrumbItemWrapper-sc-eq3cq-0:nth-child(4) > a", "Unspecified", "text"),
+    ("district", "label.BreadcrumbStyle__BreadcrumbItemWrapper-sc-eq3cq-0:nth-child(5) > a", "Unspecified", "text"),
+    ("company_name", ".AboutCompanySectionsc__Title-sc-c7oevo-6 > a", "Unspecified", "text"),
+    ("company_industry", ".AboutCompanySectionsc__CompanyIndustryAndSize-sc-c7oevo-7 > span:nth-of-type(1)", "Unspecified", "text"),
+    ("company_size", ".AboutCompanySectionsc__CompanyIndustryAndSize-sc-c7oevo-7 > span:nth-of-type(2)", "Unspecified", "text"),
+]
+
+
+# Selector halaman pencarian dan selector yang ditunggu sebelum halaman dibaca
+PAGE_SELECTORS = {
+    "job_card": 'div[class="JobCardsc__JobcardContainer-sc-hmqj50-0 iirqVR CompactOpportunityCardsc__CompactJobCardWrapper-sc-dkg8my-5 hRilQl"]',
+    "job_link": 'a[class="CompactOpportunityCardsc__JobCardTitleNoStyleAnchor-sc-dkg8my-12 jHptbP"][href]',
+    "pagination": 'button[class="UnstyledButton-sc-zp0cw8-0 AnchorPaginationsc__Number-sc-8wke03-3 dYSdtB bkvUQn"]',
+    "search_ready": "div.JobCardsc__JobcardContainer-sc-hmqj50-0",
+    "detail_ready": ".TopFoldsc__JobOverViewTitle-sc-1fbktg5-3",
+}
+
+
+# _________________________________________________________________________________________ Fallback selectors
+#
+# Glints builds its class names with styled-components: "<Component>-sc-<hash>-<n>" plus a
+# generated class ("iirqVR"). A redeploy changes the hashes, while the component names stay.
+# The fallback selectors only keep the component name: [class*="<Component>-sc-"].
+
+STYLED_CLASS = re.compile(r"^([A-Za-z0-9_]+)-sc-[0-9a-z]+-\d+$")
+
+
+def prefix_selector(selector:str) -> str:
+    """Rewrites the styled-components classes of a css selector into hash-independent
+    attribute prefix matches, e.g. `h1.TopFoldsc__JobOverViewTitle-sc-1fbktg5-3` becomes
+    `h1[class*="TopFoldsc__JobOverViewTitle-sc-"]`. Generated classes without a component name are dropped."""
+
+    def whole_class(match) -> str:
+        components = [STYLED_CLASS.match(name) for name in match.group(1).split()]
+        return "".join(f'[class*="{component.group(1)}-sc-"]' for component in components if component)
+
+    def single_class(match) -> str:
+        return f'[class*="{match.group(1)}-sc-"]'
+
+    selector = re.sub(r'\[class="([^"]*)"\]', whole_class, selector)
+    return re.sub(r"\.([A-Za-z0-9_]+)-sc-[0-9a-z]+-\d+", single_class, selector)
+
+
+FALLBACK_JOB_FIELDS = [(field, prefix_selector(selector), default, kind) for field, selector, default, kind in JOB_FIELDS]
+FALLBACK_PAGE_SELECTORS = {name: prefix_selector(selector) for name, selector in PAGE_SELECTORS.items()}
+
+
+class MissingFieldError(ValueError):
+    """Raised when a required field is missing from a job page."""
+
+
+# _________________________________________________________________________________________ Backends
+
+class Bs4JobParser:
+    """Parser backend on BeautifulSoup's html.parser, with every selector compiled once by soupsieve."""
+
+    name = "html.parser"
+
+    def __init__(self, fields:list=JOB_FIELDS):
+        self.fields = [(field, soupsieve.compile(selector), default, kind) for field, selector, default, kind in fields]
+
+    def parse(self, html:str) -> dict:
+        page = BeautifulSoup(html, "html.parser").find(id="__next")
+        if not page:
+            return None
+
+        result = {}
+        for field, pattern, default, kind in self.fields:
+            if kind == "tags":
+                matches = pattern.select(page)
+                result[field] = [match.get_text() for match in matches[3:]] if len(matches) > 3 else []
+                continue
+
+            match = pattern.select_one(page)
+            if kind == "text":
+                result[field] = match.get_text() if match else default
+            elif kind == "required":
+                if match is None:
+                    raise MissingFieldError(f"'{field}' not found on the page")
+                result[field] = match.get_text(strip=True)
+            elif kind == "skills":
+                result[field] = [span.get_text(strip=True) for span in match.find_all("span") if span.get_text(strip=True)] if match else []
+        return result
+
+
+class LxmlJobParser:
+    """Parser backend on lxml, with every selector translated to XPath and compiled once."""
+
+    name = "lxml"
+
+    def __init__(self, fields:list=JOB_FIELDS):
+        translator = GenericTranslator()
+        self.fields = [(field, etree.XPath(translator.css_to_xpath(selector)), default, kind)
+                       for field, selector, default, kind in fields]
+        self.find_root = etree.XPath('//*[@id="__next"]')
+        self.find_spans = etree.XPath("descendant::span")
+
+    @staticmethod
+    def _strip_text(element) -> str:
+        # sama dengan BeautifulSoup get_text(strip=True)
+        return "".join(text.strip() for text in element.itertext())
+
+    def parse(self, html:str) -> dict:
+        roots = self.find_root(lxml_html.fromstring(html))
+        if not roots:
+            return None
+        page = roots[0]
+
+        result = {}
+        for field, xpath, default, kind in self.fields:
+            matches = xpath(page)
+            if kind == "text":
+                result[field] = matches[0].text_content() if matches else default
+            elif kind == "required":
+                if not matches:
+                    raise MissingFieldError(f"'{field}' not found on the page")
+                result[field] = self._strip_text(matches[0])
+            elif kind == "skills":
+                spans = self.find_spans(matches[0]) if matches else []
+                result[field] = [text for text in (self._strip_text(span) for span in spans) if text]
+            elif kind == "tags":
+                result[field] = [match.text_content() for match in matches[3:]] if len(matches) > 3 else []
+        return result
+
+
+def get_job_parser(backend:str=None, fields:list=JOB_FIELDS):
+    """Returns a compiled job page parser.
+
+    Args:
+        backend (str, optional): "lxml" or "html.parser". Defaults to lxml when it is installed.
+        fields (list, optional): field selectors. Defaults to JOB_FIELDS.
+
+    Returns:
+        parser with a `parse(html) -> dict` method
+    """
+    if backend is None:
+        backend = "lxml" if lxml_html is not None else "html.parser"
+    if backend == "lxml":
+        if lxml_html is None:
+            raise ImportError("The lxml backend needs the lxml and cssselect packages")
+        return LxmlJobParser(fields)
+    return Bs4JobParser(fields)
+
+
+def check_parity(pages:list, backend:str="lxml") -> list:
+    """Compares a parser backend against the html.parser backend over saved pages.
+
+    Args:
+        pages (list): list of html strings (e.g. read from the page cache)
+        backend (str, optional): backend to check. Defaults to "lxml".
+
+    Returns:
+        list: (page number, html.parser result, backend result) for every page where the results differ
+    """
+    reference = Bs4JobParser()
+    candidate = get_job_parser(backend)
+    mismatches = []
+    for i, html in enumerate(pages):
+        results = []
+        for parser in (reference, candidate):
+            try:
+                results.append(parser.parse(html))
+            except MissingFieldError as e:
+                results.append(str(e))
+        if results[0] != results[1]:
+            mismatches.append((i, results[0], results[1]))
+    return mismatches
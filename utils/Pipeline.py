@@ -0,0 +1,261 @@
+import asyncio
+import os
+
+import pandas as pd
+
+from utils.Scraping import extract_job_details, job_uuid
+from utils.Scheduling import iterate_search_pages
+from utils.Cleaning_and_storing import cek_nan, cleaning_nan, filter_relevan_job
+from utils.Normalization import normalize_jobs, add_matched_keywords
+from utils.Parquet_storing import append_parquet
+from utils.Throttling import RateLimiter, AdaptiveRateLimiter, RetryQueue
+from utils.Checkpointing import CrawlJournal
+from utils.Caching import PageCache
+from utils.Archiving import PageArchive
+
+
+# Penanda akhir antrian
+_DONE = object()
+
+
+# _________________________________________________________________________________________ Stages
+
+async def discover_links(fetcher, job_title, link_queue:asyncio.Queue, limit:int=None, rate_limiter:RateLimiter=None,
+                         journal:CrawlJournal=None, matched:dict=None) -> int:
+    """Producer stage: crawls the search result pages and pushes every new job link to `link_queue`
+    as soon as its page is parsed, so detail extraction starts before the crawl is finished.
+
+    Args:
+        fetcher: Selenium WebDriver instance or fetcher backend used for the search pages.
+        job_title (str | list): job_title to search for, or several of them (pages are interleaved
+            and links deduplicated by job UUID, see `utils.Scheduling`)
+        link_queue (asyncio.Queue): bounded queue feeding the detail stage
+        limit (int, optional): limit pages. Defaults to None.
+        rate_limiter (RateLimiter, optional): shared politeness budget. Defaults to None.
+        journal (CrawlJournal, optional): checkpoint journal; journaled pages are not requested again
+            and journaled jobs (already stored) are not published. Defaults to None.
+        matched (dict, optional): filled with job UUID -> list of matching keywords, as in
+            `collect_job_links_multi`, for the `matched_keywords` column. Defaults to None.
+
+    Returns:
+        int: number of unique job links found
+    """
+    keywords = [job_title] if isinstance(job_title, str) else list(job_title)
+    pages = iterate_search_pages(fetcher, keywords, limit, rate_limiter, journal)
+    matched = matched if matched is not None else {}
+    seen = set()
+
+    while True:
+        item = await asyncio.to_thread(next, pages, None)
+        if item is None:
+            break
+        keyword, _, page_links = item
+        for link in page_links:
+            key = job_uuid(link)
+            if keyword not in matched.setdefault(key, []):
+                matched[key].append(keyword)
+            if key not in seen:
+                seen.add(key)
+                if journal and journal.record(link):
+                    continue
+                await link_queue.put(link)  # menunggu jika antrian penuh (backpressure)
+
+    return len(seen)
+
+
+async def extract_details(fetcher, link_queue:asyncio.Queue, record_queue:asyncio.Queue, rate_limiter:RateLimiter=None, cache:PageCache=None,
+                          archive:PageArchive=None, retry_queue:RetryQueue=None) -> None:
+    """Consumer stage: one worker per fetcher, turning job links into job detail records.
+    Failed links go to `retry_queue`; once the link queue is finished, every worker retries them before stopping."""
+    while True:
+        link = await link_queue.get()
+        if link is _DONE:
+            break
+        record = await asyncio.to_thread(extract_job_details, link, fetcher, rate_limiter, cache, archive, retry_queue)
+        if record:
+            await record_queue.put(record)
+
+    while retry_queue is not None:
+        item = retry_queue.pop()
+        if item is None:
+            return
+        link, attempt = item
+        record = await asyncio.to_thread(extract_job_details, link, fetcher, rate_limiter, cache, archive, retry_queue, attempt)
+        if record:
+            await record_queue.put(record)
+
+
+def raw_batch(records:list, matched:dict=None) -> pd.DataFrame:
+    """Normalized micro-batch of records, with the `matched_keywords` column when `matched` is given."""
+    df = normalize_jobs(pd.DataFrame(records))
+    return add_matched_keywords(df, matched) if matched is not None else df
+
+
+def clean_batch(records:list, list_keyword:list=None, matched:dict=None) -> pd.DataFrame:
+    """Applies the regular cleaning steps (`cleaning_nan`, `filter_relevan_job`) to one micro-batch of records.
+
+    Args:
+        records (list): list of job detail dictionaries
+        list_keyword (list, optional): keywords for `filter_relevan_job`. Defaults to None (no filtering).
+        matched (dict, optional): job UUID -> matching keywords (`matched_keywords` column). Defaults to None.
+
+    Returns:
+        pd.DataFrame: cleaned micro-batch
+    """
+    df = raw_batch(records, matched)
+    df["obtained"] = pd.to_datetime(df["obtained"])
+
+    df = cleaning_nan(df, list_na=cek_nan(df))
+    if list_keyword:
+        df = filter_relevan_job(df, list_keyword=list_keyword)
+    return df
+
+
+async def store_batches(record_queue:asyncio.Queue, sink, batch_size:int=50, list_keyword:list=None, raw_sink=None,
+                        journal:CrawlJournal=None, matched:dict=None, discovered:asyncio.Event=None) -> int:
+    """Sink stage: groups records into micro-batches, cleans them and hands them to `sink`.
+    Every stored micro-batch is checkpointed in `journal`. `matched` is the dict filled by
+    `discover_links`, read when a micro-batch is stored. A job stored before link discovery is
+    finished (`discovered` not set yet) can still be found under another keyword: once discovery
+    is done, such jobs are stored again with their complete `matched_keywords` (the newest row of
+    a job wins, see `append_parquet`).
+
+    Returns:
+        int: number of raw records stored
+    """
+    batch = []
+    total = 0
+    provisional = {}    # job UUID -> (record, keywords yang tersimpan), selama discovery masih berjalan
+
+    async def flush(records:list, log:bool=True):
+        # keyword yang ditulis diambil sekali di sini, discover_links masih bisa menambah selama batch ditulis
+        keys = [job_uuid(record["url"]) for record in records]
+        keywords = {key: list(matched.get(key, [])) for key in keys} if matched is not None else None
+        if keywords is not None and discovered is not None and not discovered.is_set():
+            for key, record in zip(keys, records):
+                provisional[key] = (record, tuple(keywords[key]))
+
+        if raw_sink:
+            await asyncio.to_thread(raw_sink, raw_batch(records, keywords))
+        df = await asyncio.to_thread(clean_batch, records, list_keyword, keywords)
+        if not df.empty:
+            await asyncio.to_thread(sink, df)
+        if journal and log:
+            await asyncio.to_thread(journal.log_records, records)
+
+    async def restore_late_matches():
+        late = [record for key, (record, keywords) in provisional.items() if tuple(matched.get(key, [])) != keywords]
+        provisional.clear()
+        if late:
+            await flush(late, log=False)
+            print(f"\nStored {len(late)} jobs again with keywords found after they were stored")
+
+    while True:
+        record = await record_queue.get()
+        if record is _DONE:
+            break
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await flush(batch)
+            total += len(batch)
+            print(f"\nStored micro-batch of {len(batch)} jobs ({total} so far)")
+            batch = []
+        if provisional and discovered.is_set():
+            await restore_late_matches()
+
+    if batch:
+        await flush(batch)
+        total += len(batch)
+    if provisional:
+        await restore_late_matches()
+    return total
+
+
+# _________________________________________________________________________________________ Runner
+
+async def run_pipeline_async(search_fetcher, detail_fetchers:list, job_title, sink, limit:int=None,
+                             list_keyword:list=None, batch_size:int=50, queue_size:int=100,
+                             max_rps:float=2.0, raw_sink=None, cache:PageCache=None,
+                             archive:PageArchive=None, journal:CrawlJournal=None, rate_limiter:RateLimiter=None) -> int:
+    """Runs link discovery, detail extraction and cleaning/storage concurrently, connected by bounded
+    queues. A full queue blocks the stage in front of it, so memory use stays flat whatever the crawl size.
+    When any stage fails, the other stages are cancelled and the error is raised.
+
+    Args:
+        search_fetcher: Selenium WebDriver instance or fetcher backend used for the search pages.
+        detail_fetchers (list): one Selenium WebDriver instance or fetcher backend per detail worker.
+        job_title (str | list): job_title to search for, or a list of them
+        sink (callable): called with every cleaned micro-batch (pd.DataFrame). A job matched by another
+            keyword after it was stored is handed again at the end, the newest row wins.
+        limit (int, optional): limit search pages. Defaults to None.
+        list_keyword (list, optional): keywords for `filter_relevan_job`. Defaults to None.
+        batch_size (int, optional): number of records per micro-batch. Defaults to 50.
+        queue_size (int, optional): capacity of each queue between stages. Defaults to 100.
+        max_rps (float, optional): highest requests per second the shared request governor may reach. Defaults to 2.0.
+        raw_sink (callable, optional): called with every raw micro-batch before cleaning. Defaults to None.
+        cache (PageCache, optional): on-disk page cache shared by the detail workers. Defaults to None.
+        archive (PageArchive, optional): raw page archive for offline re-parsing. Defaults to None.
+        journal (CrawlJournal, optional): checkpoint journal, to resume an interrupted run. Defaults to None.
+        rate_limiter (RateLimiter, optional): request governor. Defaults to a new `AdaptiveRateLimiter` up to `max_rps`.
+
+    Returns:
+        int: number of raw records stored
+    """
+    link_queue = asyncio.Queue(maxsize=queue_size)
+    record_queue = asyncio.Queue(maxsize=queue_size)
+    rate_limiter = rate_limiter or AdaptiveRateLimiter(max_rps=max_rps)
+    retry_queue = RetryQueue()
+    matched = {}
+    discovered = asyncio.Event()
+
+    consumers = [asyncio.create_task(extract_details(fetcher, link_queue, record_queue, rate_limiter, cache, archive, retry_queue))
+                 for fetcher in detail_fetchers]
+    storer = asyncio.create_task(store_batches(record_queue, sink, batch_size, list_keyword, raw_sink, journal, matched, discovered))
+
+    async def produce():
+        total_links = await discover_links(search_fetcher, job_title, link_queue, limit, rate_limiter, journal, matched)
+        discovered.set()
+        print(f"\nTotal job found: {total_links}")
+        for _ in consumers:
+            await link_queue.put(_DONE)
+        await asyncio.gather(*consumers)
+        await record_queue.put(_DONE)
+
+    tasks = [asyncio.create_task(produce()), *consumers, storer]
+    try:
+        # tahap yang gagal menghentikan tahap lain, supaya antrian yang penuh tidak menggantung
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        print(f"Request governor: {rate_limiter.stats()}, gave up on {len(retry_queue.dropped)} links")
+        if cache:
+            cache.save()
+            print(f"Page cache: {cache.stats()}")
+
+    return storer.result()
+
+
+def run_pipeline(*args, **kwargs) -> int:
+    """Synchronous wrapper around `run_pipeline_async`, taking the same arguments."""
+    return asyncio.run(run_pipeline_async(*args, **kwargs))
+
+
+def csv_sink(path:str):
+    """Returns a sink that appends every micro-batch to the CSV file at `path`."""
+    def sink(df:pd.DataFrame) -> None:
+        df.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+    return sink
+
+
+def parquet_sink(root:str="data/glints"):
+    """Returns a sink that appends every micro-batch to the Parquet dataset at `root`."""
+    def sink(df:pd.DataFrame) -> None:
+        append_parquet(df, root)
+    return sink
@@ -0,0 +1,181 @@
+import math
+import os
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from utils.Scraping import report_outcome
+from utils.Urls import search_url
+from utils.Parsing import get_job_parser, JOB_FIELDS, FALLBACK_JOB_FIELDS, PAGE_SELECTORS, FALLBACK_PAGE_SELECTORS
+from utils.Parquet_storing import read_parquet
+from utils.Fetching import as_fetcher, TRANSIENT_ERRORS, PERMANENT_ERRORS
+from utils.Throttling import AdaptiveRateLimiter
+from utils.Metrics import timed
+
+
+# Field parser -> kolom dataset yang berasal dari field tersebut
+FIELD_COLUMNS = {
+    "job_name": "job_name",
+    "job_type": "job_type",
+    "salary": "salary_range",
+    "skills": "skills_requirements",
+    "education": "education_requirements",
+    "experience": "experience_requirements",
+    "requirements": "another_requirements",
+    "province": "province",
+    "city": "city",
+    "district": "district",
+    "company_name": "company_name",
+    "company_industry": "company_industry",
+    "company_size": "company_size",
+    "post_time": "last_post",
+}
+
+# Nilai default parser, artinya selector tidak menemukan apa-apa
+EMPTY_VALUES = {"", "No Title", "No Requirement", "Unspecified"}
+
+# Tanpa dataset lama: field yang harus selalu terisi
+DEFAULT_BASELINE = {"job_name": 1.0, "last_post": 1.0, "company_name": 1.0}
+
+READY_SELECTOR = "#__next"  # root Next.js, tidak bergantung pada class hasil styled-components
+
+
+# _________________________________________________________________________________________ Fill rates
+
+def fill_rates(df:pd.DataFrame, columns:list=tuple(FIELD_COLUMNS.values())) -> pd.Series:
+    """Share of rows of every column holding a real value (not missing and not a parser default)."""
+    rates = {}
+    for col in columns:
+        if col in df:
+            values = df[col].astype("object")
+            rates[col] = float((values.notna() & ~values.isin(EMPTY_VALUES)).mean()) if len(df) else 0.0
+    return pd.Series(rates, dtype="float64")
+
+
+def baseline_fill_rates(dataset_root:str="data/glints", csv_path:str="data/Glints_RAW.csv") -> pd.Series:
+    """Historical fill rate of every parsed column, from the stored Parquet dataset (or the raw CSV).
+    Returns None when there is no stored data yet."""
+    columns = list(FIELD_COLUMNS.values())
+    df = read_parquet(dataset_root, columns=columns)
+    if df.empty and os.path.exists(csv_path):
+        df = pd.read_csv(csv_path, usecols=lambda col: col in columns)
+    return fill_rates(df) if not df.empty else None
+
+
+def _sampled_fields(fields:list) -> list:
+    # field "required" dibaca sebagai text biasa, supaya satu field hilang tidak membatalkan satu halaman
+    return [(field, selector, default, "text" if kind == "required" else kind) for field, selector, default, kind in fields]
+
+
+def _page_records(pages:list, fields:list) -> pd.DataFrame:
+    parser = get_job_parser(fields=_sampled_fields(fields))
+    records = []
+    for html in pages:
+        parsed = parser.parse(html) or {}
+        records.append({
+            FIELD_COLUMNS[field]: ", ".join(value) if isinstance(value, list) else value
+            for field, value in parsed.items() if field in FIELD_COLUMNS
+        })
+    return pd.DataFrame(records, columns=list(FIELD_COLUMNS.values()))
+
+
+def drifted_fields(rates:pd.Series, baseline:pd.Series, n_pages:int, tolerance:float=0.25, alpha:float=0.05) -> list:
+    """Columns whose fill rate dropped more than `tolerance` below the baseline, by more than
+    sampling noise: with the baseline rate, seeing so few filled pages out of `n_pages` must
+    have a probability below `alpha` (binomial tail), so sparse fields do not fail by chance."""
+    drifted = []
+    for col, expected in baseline.reindex(rates.index).dropna().items():
+        filled = round(rates[col] * n_pages)
+        p_value = sum(math.comb(n_pages, k) * expected**k * (1 - expected)**(n_pages - k) for k in range(filled + 1))
+        if rates[col] < expected - tolerance and p_value < alpha:
+            drifted.append(col)
+    return drifted
+
+
+# _________________________________________________________________________________________ Preflight
+
+@timed("preflight")
+def preflight(browser, job_title:str, baseline:pd.Series=None, n_pages:int=5, tolerance:float=0.25, alpha:float=0.05, rate_limiter=None) -> dict:
+    """Function to check the selectors before a crawl: fetches one search page and a handful of job
+    pages, and measures the fill rate of every field with the primary selectors and with the
+    hash-independent fallback selectors, against the historical baseline.
+
+    Args:
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
+        job_title (str): job title to search for
+        baseline (pd.Series, optional): historical fill rates from `baseline_fill_rates`. Defaults to DEFAULT_BASELINE.
+        n_pages (int, optional): job pages to sample. Defaults to 5.
+        tolerance (float, optional): allowed drop of a fill rate below its baseline. Defaults to 0.25.
+        alpha (float, optional): significance level of a drop, see `drifted_fields`. Defaults to 0.05.
+        rate_limiter (RateLimiter, optional): request governor. Defaults to a new `AdaptiveRateLimiter`.
+
+    Returns:
+        dict: report with `mode` ("primary", "fallback" or "abort"), `reason`, the links found and
+            the fill rates and drifted fields of both selector sets
+    """
+    fetcher = as_fetcher(browser)
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
+    baseline = baseline if baseline is not None else pd.Series(DEFAULT_BASELINE)
+    report = {"mode": "abort", "reason": None, "links": {}, "pages": 0, "fill_rates": {}, "drifted": {}}
+
+    #--------------------------- - 1. Halaman pencarian: link dengan kedua set selector
+    try:
+        rate_limiter.wait()
+        html = fetcher.get_html(search_url(job_title, 1), wait_selector=READY_SELECTOR)
+    except TRANSIENT_ERRORS + PERMANENT_ERRORS as e:
+        report["reason"] = f"search page could not be loaded: {type(e).__name__}"
+        return report
+    page = BeautifulSoup(html, "html.parser")
+
+    links = {}
+    for mode, selectors in (("primary", PAGE_SELECTORS), ("fallback", FALLBACK_PAGE_SELECTORS)):
+        cards = page.select(selectors["job_card"])
+        links[mode] = [link["href"] for link in (card.select_one(selectors["job_link"]) for card in cards) if link]
+        report["links"][mode] = len(links[mode])
+    sample = links["primary"] or links["fallback"]
+    if not sample:
+        report["reason"] = "no job links found on the search page"
+        return report
+
+    #--------------------------- - 2. Beberapa halaman detail
+    step = max(1, len(sample) // n_pages)
+    pages = []
+    for link in sample[::step][:n_pages]:
+        url = link if link.startswith("http") else f"https://glints.com{link}"
+        try:
+            rate_limiter.wait()
+            pages.append(fetcher.get_html(url.split("?")[0], wait_selector=READY_SELECTOR))
+            report_outcome(rate_limiter, ok=True)
+        except TRANSIENT_ERRORS:
+            report_outcome(rate_limiter, ok=False)
+        except PERMANENT_ERRORS:
+            pass    # job sudah ditutup (404/410), tidak dihitung sebagai throttling
+    report["pages"] = len(pages)
+    if not pages:
+        report["reason"] = "no job page could be loaded"
+        return report
+
+    #--------------------------- - 3. Fill rate per field vs baseline
+    for mode, fields in (("primary", JOB_FIELDS), ("fallback", FALLBACK_JOB_FIELDS)):
+        rates = fill_rates(_page_records(pages, fields))
+        report["fill_rates"][mode] = rates.round(2).to_dict()
+        report["drifted"][mode] = drifted_fields(rates, baseline, len(pages), tolerance, alpha)
+
+    for mode in ("primary", "fallback"):
+        if report["links"][mode] and not report["drifted"][mode]:
+            report["mode"] = mode
+            break
+    else:
+        report["reason"] = "selectors drifted: " + ", ".join(report["drifted"]["fallback"] or report["drifted"]["primary"])
+    return report
+
+
+def print_preflight(report:dict, baseline:pd.Series=None) -> None:
+    """Prints the preflight report as a table of fill rates per field."""
+    print(f"\nPreflight: {report['pages']} job pages, links primary={report['links'].get('primary', 0)} "
+          f"fallback={report['links'].get('fallback', 0)} -> {report['mode']}" + (f" ({report['reason']})" if report["reason"] else ""))
+    if report["fill_rates"]:
+        table = pd.DataFrame(report["fill_rates"])
+        if baseline is not None:
+            table["baseline"] = baseline.reindex(table.index).round(2)
+        print(table.to_string())
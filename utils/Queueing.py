@@ -0,0 +1,371 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from utils.Urls import job_uuid
+
+
+MAX_ATTEMPTS = 3        # percobaan per link, termasuk lease yang habis karena worker mati
+LEASE_SECONDS = 300     # lama lease sebelum link boleh diambil worker lain
+
+
+# _________________________________________________________________________________________ Backends
+#
+# A work queue backend provides (tasks are keyed by job UUID, delivery is at-least-once):
+#   publish(links, matched)                   queue job links, returns the number of newly queued ones
+#   lease(worker, n, lease_seconds)           up to n (link, attempt) pairs, owned by `worker` until the lease expires
+#   renew(worker, links, lease_seconds)       extends the leases `worker` still holds
+#   complete(worker, link, record)            stores the record of a link and marks it done
+#   fail(worker, link, error)                 gives the link back, or marks it failed after MAX_ATTEMPTS
+#   results(new_only, limit)                  (records, matched) not collected yet
+#   mark_collected(records)                   records written to the dataset
+#   requeue_failed()                          failed links back to pending
+#   set_meta(name, value) / get_meta(name)    settings of the run shared with the workers (e.g. selector mode)
+#   stats()                                   number of tasks per state
+
+class SqliteWorkQueue:
+    """Work queue in a SQLite file (WAL mode), shared by the worker processes of one host.
+    A lease is taken in one `BEGIN IMMEDIATE` transaction, so two workers never get the same link,
+    and a link whose lease expired (its worker crashed or hung) is leased again.
+
+    SQLite locking is not reliable on network file systems: for workers on several hosts use
+    `RedisWorkQueue`.
+
+    Args:
+        path (str, optional): SQLite database file. Defaults to "data/work_queue.sqlite".
+        max_attempts (int, optional): attempts per link. Defaults to MAX_ATTEMPTS.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            key TEXT PRIMARY KEY, link TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0,
+            matched TEXT, error TEXT, added REAL
+        );
+        CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_until);
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY, record TEXT NOT NULL, worker TEXT, finished REAL,
+            collected INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, path:str="data/work_queue.sqlite", max_attempts:int=MAX_ATTEMPTS):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # autocommit, transaksi dibuka manual dengan BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def _transaction(self, sql:list) -> list:
+        """Runs (query, params, many) statements in one write transaction, returns the rows of every statement."""
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = []
+                for query, params, many in sql:
+                    cursor = self.connection.executemany(query, params) if many else self.connection.execute(query, params)
+                    rows.append(cursor.fetchall())
+                self.connection.execute("COMMIT")
+                return rows
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def publish(self, links:list, matched:dict=None) -> int:
+        """Queues job links. Links already pending or leased keep their state, done or failed
+        ones are queued again (a new crawl asks for fresh details)."""
+        matched = matched or {}
+        now = time.time()
+        rows = [(job_uuid(link), link, json.dumps(matched.get(job_uuid(link), [])), now) for link in links]
+        upsert = """
+            INSERT INTO tasks (key, link, matched, added) VALUES (?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                link = excluded.link, matched = excluded.matched,
+                attempts = CASE WHEN state IN ('done', 'failed') THEN 0 ELSE attempts END,
+                error = CASE WHEN state IN ('done', 'failed') THEN NULL ELSE error END,
+                added = CASE WHEN state IN ('done', 'failed') THEN excluded.added ELSE added END,
+                state = CASE WHEN state IN ('done', 'failed') THEN 'pending' ELSE state END
+        """
+        count_open = ("SELECT COUNT(*) FROM tasks WHERE state IN ('pending', 'leased')", (), False)
+        before, _, after = self._transaction([count_open, (upsert, rows, True), count_open])
+        return after[0][0] - before[0][0]
+
+    def lease(self, worker:str, n:int=10, lease_seconds:float=LEASE_SECONDS) -> list:
+        """Leases up to `n` links to `worker`: pending links first, then links whose lease expired.
+
+        Returns:
+            list: (link, attempt) pairs
+        """
+        now = time.time()
+        _, rows = self._transaction([
+            # lease habis dan percobaan sudah habis: tidak diulang lagi
+            ("UPDATE tasks SET state = 'failed', worker = NULL, lease_until = NULL, error = 'lease expired' "
+             "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?", (now, self.max_attempts), False),
+            ("UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+             "WHERE key IN (SELECT key FROM tasks WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) "
+             "ORDER BY state = 'leased', added LIMIT ?) RETURNING link, attempts",
+             (worker, now + lease_seconds, now, n), False),
+        ])
+        return [(link, attempt) for link, attempt in rows]
+
+    def renew(self, worker:str, links:list, lease_seconds:float=LEASE_SECONDS) -> None:
+        if not links:
+            return
+        until = time.time() + lease_seconds
+        self._transaction([("UPDATE tasks SET lease_until = ? WHERE key = ? AND worker = ? AND state = 'leased'",
+                            [(until, job_uuid(link), worker) for link in links], True)])
+
+    def complete(self, worker:str, link:str, record:dict) -> None:
+        """Stores the record of a link. Accepted even when the lease was lost: the record is keyed
+        by job UUID, so a link finished twice is stored once."""
+        key = job_uuid(link)
+        self._transaction([
+            ("INSERT OR REPLACE INTO results (key, record, worker, finished) VALUES (?, ?, ?, ?)",
+             (key, json.dumps(record), worker, time.time()), False),
+            ("UPDATE tasks SET state = 'done', worker = NULL, lease_until = NULL, error = NULL WHERE key = ?", (key,), False),
+        ])
+
+    def fail(self, worker:str, link:str, error:str=None) -> None:
+        self._transaction([(
+            # dicoba lagi setelah link lain (added = sekarang, ke belakang antrian)
+            "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "worker = NULL, lease_until = NULL, error = ?, added = ? WHERE key = ? AND worker = ? AND state = 'leased'",
+            (self.max_attempts, error, time.time(), job_uuid(link), worker), False)])
+
+    def results(self, new_only:bool=True, limit:int=None) -> tuple:
+        """Returns the stored records (only the ones not collected yet when `new_only`) and the
+        keywords that matched each job, in the format of `collect_job_links_multi`."""
+        query = ("SELECT r.key, r.record, t.matched FROM results r LEFT JOIN tasks t ON t.key = r.key"
+                 + (" WHERE r.collected = 0" if new_only else "") + " ORDER BY r.finished"
+                 + (" LIMIT ?" if limit else ""))
+        with self._lock:
+            rows = self.connection.execute(query, (limit,) if limit else ()).fetchall()
+        records = [json.loads(record) for _, record, _ in rows]
+        matched = {key: json.loads(keywords) for key, _, keywords in rows if keywords}
+        return records, matched
+
+    def mark_collected(self, records:list) -> None:
+        self._transaction([("UPDATE results SET collected = 1 WHERE key = ?",
+                            [(job_uuid(record["url"]),) for record in records], True)])
+
+    def requeue_failed(self) -> int:
+        rows, = self._transaction([("UPDATE tasks SET state = 'pending', attempts = 0, error = NULL "
+                                    "WHERE state = 'failed' RETURNING key", (), False)])
+        return len(rows)
+
+    def set_meta(self, name:str, value:str) -> None:
+        self._transaction([("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value), False)])
+
+    def get_meta(self, name:str, default:str=None) -> str:
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+            expired = self.connection.execute("SELECT COUNT(*) FROM tasks WHERE state = 'leased' AND lease_until < ?",
+                                              (time.time(),)).fetchone()[0]
+            uncollected = self.connection.execute("SELECT COUNT(*) FROM results WHERE collected = 0").fetchone()[0]
+        stats = {state: counts.get(state, 0) for state in ("pending", "leased", "done", "failed")}
+        stats.update(expired=expired, uncollected=uncollected)
+        return stats
+
+
+class RedisWorkQueue:
+    """Work queue in Redis, for workers on several hosts. Pending links are a sorted set (by time
+    queued) and leased links a sorted set scored by lease expiry. Leasing, renewing and giving links
+    back are Lua scripts, so each of them is atomic on the server.
+
+    Requires the `redis` package.
+
+    Args:
+        client (redis.Redis): Redis client.
+        prefix (str, optional): prefix of the Redis keys, one queue per prefix. Defaults to "glints:queue".
+        max_attempts (int, optional): attempts per link. Defaults to MAX_ATTEMPTS.
+    """
+
+    # KEYS: pending, leased, owner, attempts, failed | ARGV: now, n, lease_until, worker, max_attempts
+    LEASE_SCRIPT = """
+        local now, n, until_time = tonumber(ARGV[1]), tonumber(ARGV[2]), ARGV[3]
+        local worker, max_attempts = ARGV[4], tonumber(ARGV[5])
+        local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)
+        for _, key in ipairs(expired) do
+            redis.call('ZREM', KEYS[2], key)
+            redis.call('HDEL', KEYS[3], key)
+            if tonumber(redis.call('HGET', KEYS[4], key) or '0') >= max_attempts then
+                redis.call('SADD', KEYS[5], key)
+            else
+                redis.call('ZADD', KEYS[1], now, key)
+            end
+        end
+        local leased = {}
+        local popped = redis.call('ZPOPMIN', KEYS[1], n)
+        for i = 1, #popped, 2 do
+            local key = popped[i]
+            table.insert(leased, key)
+            table.insert(leased, redis.call('HINCRBY', KEYS[4], key, 1))
+            redis.call('ZADD', KEYS[2], until_time, key)
+            redis.call('HSET', KEYS[3], key, worker)
+        end
+        return leased
+    """
+
+    # KEYS: leased, owner | ARGV: worker, lease_until, key...
+    RENEW_SCRIPT = """
+        for i = 3, #ARGV do
+            if redis.call('HGET', KEYS[2], ARGV[i]) == ARGV[1] then
+                redis.call('ZADD', KEYS[1], 'XX', ARGV[2], ARGV[i])
+            end
+        end
+        return 0
+    """
+
+    # KEYS: pending, leased, owner, attempts, failed | ARGV: worker, key, now, max_attempts
+    FAIL_SCRIPT = """
+        if redis.call('HGET', KEYS[3], ARGV[2]) ~= ARGV[1] then
+            return 0
+        end
+        redis.call('ZREM', KEYS[2], ARGV[2])
+        redis.call('HDEL', KEYS[3], ARGV[2])
+        if tonumber(redis.call('HGET', KEYS[4], ARGV[2]) or '0') >= tonumber(ARGV[4]) then
+            redis.call('SADD', KEYS[5], ARGV[2])
+        else
+            redis.call('ZADD', KEYS[1], ARGV[3], ARGV[2])
+        end
+        return 1
+    """
+
+    # KEYS: tasks, pending, leased, attempts, done, failed | ARGV: now, (key, payload)...
+    PUBLISH_SCRIPT = """
+        local queued = 0
+        for i = 2, #ARGV, 2 do
+            local key = ARGV[i]
+            redis.call('HSET', KEYS[1], key, ARGV[i+1])
+            if not redis.call('ZSCORE', KEYS[2], key) and not redis.call('ZSCORE', KEYS[3], key) then
+                redis.call('HSET', KEYS[4], key, 0)
+                redis.call('SREM', KEYS[5], key)
+                redis.call('SREM', KEYS[6], key)
+                redis.call('ZADD', KEYS[2], ARGV[1], key)
+                queued = queued + 1
+            end
+        end
+        return queued
+    """
+
+    # KEYS: failed, attempts, pending | ARGV: now
+    REQUEUE_SCRIPT = """
+        local failed = redis.call('SMEMBERS', KEYS[1])
+        for _, key in ipairs(failed) do
+            redis.call('HSET', KEYS[2], key, 0)
+            redis.call('ZADD', KEYS[3], ARGV[1], key)
+        end
+        redis.call('DEL', KEYS[1])
+        return #failed
+    """
+
+    def __init__(self, client, prefix:str="glints:queue", max_attempts:int=MAX_ATTEMPTS):
+        self.client = client
+        self.max_attempts = max_attempts
+        self.keys = {name: f"{prefix}:{name}" for name in
+                     ("tasks", "pending", "leased", "owner", "attempts", "done", "failed", "results", "new_results", "meta")}
+        self._lease = client.register_script(self.LEASE_SCRIPT)
+        self._renew = client.register_script(self.RENEW_SCRIPT)
+        self._fail = client.register_script(self.FAIL_SCRIPT)
+        self._publish = client.register_script(self.PUBLISH_SCRIPT)
+        self._requeue = client.register_script(self.REQUEUE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url:str, prefix:str="glints:queue", max_attempts:int=MAX_ATTEMPTS) -> "RedisWorkQueue":
+        import redis
+        return cls(redis.Redis.from_url(url, decode_responses=True), prefix, max_attempts)
+
+    def _state_keys(self) -> list:
+        return [self.keys[name] for name in ("pending", "leased", "owner", "attempts", "failed")]
+
+    def publish(self, links:list, matched:dict=None) -> int:
+        matched = matched or {}
+        args = [time.time()]
+        for link in links:
+            key = job_uuid(link)
+            args += [key, json.dumps({"link": link, "matched": matched.get(key, [])})]
+        keys = [self.keys[name] for name in ("tasks", "pending", "leased", "attempts", "done", "failed")]
+        return int(self._publish(keys=keys, args=args)) if links else 0
+
+    def lease(self, worker:str, n:int=10, lease_seconds:float=LEASE_SECONDS) -> list:
+        now = time.time()
+        leased = self._lease(keys=self._state_keys(), args=[now, n, now + lease_seconds, worker, self.max_attempts])
+        keys, attempts = leased[0::2], leased[1::2]
+        tasks = self.client.hmget(self.keys["tasks"], keys) if keys else []
+        return [(json.loads(task)["link"], int(attempt)) for task, attempt in zip(tasks, attempts)]
+
+    def renew(self, worker:str, links:list, lease_seconds:float=LEASE_SECONDS) -> None:
+        if links:
+            self._renew(keys=[self.keys["leased"], self.keys["owner"]],
+                        args=[worker, time.time() + lease_seconds] + [job_uuid(link) for link in links])
+
+    def complete(self, worker:str, link:str, record:dict) -> None:
+        key = job_uuid(link)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(self.keys["results"], key, json.dumps(record))
+        pipe.sadd(self.keys["new_results"], key)
+        pipe.zrem(self.keys["leased"], key)
+        pipe.zrem(self.keys["pending"], key)    # lease sempat habis dan link sudah masuk antrian lagi
+        pipe.hdel(self.keys["owner"], key)
+        pipe.srem(self.keys["failed"], key)
+        pipe.sadd(self.keys["done"], key)
+        pipe.execute()
+
+    def fail(self, worker:str, link:str, error:str=None) -> None:
+        self._fail(keys=self._state_keys(), args=[worker, job_uuid(link), time.time(), self.max_attempts])
+
+    def results(self, new_only:bool=True, limit:int=None) -> tuple:
+        # semua record yang tersimpan, juga job yang sedang diantrekan ulang (seperti tabel results di SQLite)
+        keys = list(self.client.smembers(self.keys["new_results"]) if new_only else self.client.hkeys(self.keys["results"]))[:limit]
+        if not keys:
+            return [], {}
+        records = [json.loads(record) for record in self.client.hmget(self.keys["results"], keys) if record]
+        tasks = self.client.hmget(self.keys["tasks"], keys)
+        matched = {key: json.loads(task)["matched"] for key, task in zip(keys, tasks) if task}
+        return records, matched
+
+    def mark_collected(self, records:list) -> None:
+        if records:
+            self.client.srem(self.keys["new_results"], *[job_uuid(record["url"]) for record in records])
+
+    def requeue_failed(self) -> int:
+        # satu script: link yang gagal di antara SMEMBERS dan requeue tidak hilang
+        keys = [self.keys[name] for name in ("failed", "attempts", "pending")]
+        return int(self._requeue(keys=keys, args=[time.time()]))
+
+    def set_meta(self, name:str, value:str) -> None:
+        self.client.hset(self.keys["meta"], name, value)
+
+    def get_meta(self, name:str, default:str=None) -> str:
+        value = self.client.hget(self.keys["meta"], name)
+        return value if value is not None else default
+
+    def stats(self) -> dict:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zcard(self.keys["pending"])
+        pipe.zcard(self.keys["leased"])
+        pipe.scard(self.keys["done"])
+        pipe.scard(self.keys["failed"])
+        pipe.zcount(self.keys["leased"], "-inf", time.time())
+        pipe.scard(self.keys["new_results"])
+        return dict(zip(("pending", "leased", "done", "failed", "expired", "uncollected"), pipe.execute()))
+
+
+def open_work_queue(url:str="data/work_queue.sqlite", max_attempts:int=MAX_ATTEMPTS):
+    """Opens a work queue: `redis://host:port/db` for a Redis queue, otherwise the path of a SQLite file."""
+    if url.startswith(("redis://", "rediss://")):
+        return RedisWorkQueue.from_url(url, max_attempts=max_attempts)
+    return SqliteWorkQueue(url, max_attempts=max_attempts)
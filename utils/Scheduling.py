@@ -0,0 +1,104 @@
+from tqdm import tqdm
+
+from utils.Scraping import request_page, get_job_link_page, get_last_page_num, job_uuid
+from utils.Throttling import RateLimiter, AdaptiveRateLimiter
+from utils.Checkpointing import CrawlJournal
+
+
+def search_page_links(browser, keyword:str, page_num:int, rate_limiter:RateLimiter=None, journal:CrawlJournal=None) -> tuple:
+    """Function to get the job links of one search page, from the journal when the page was already crawled.
+
+    Returns:
+        tuple: (list of job links, number of the last page or None), or None when the page failed to load.
+            The number of the last page is only read on the first page.
+    """
+    done = journal.page(keyword, page_num) if journal else None
+    if done:
+        return done
+
+    raw_page = request_page(keyword, page_num, browser, rate_limiter)
+    if not raw_page:
+        return None
+
+    last_page_num = None
+    if page_num == 1:
+        try:
+            last_page_num = get_last_page_num(raw_page) or 1
+        except (ValueError, IndexError) as e:
+            print(f"Error parsing pagination for '{keyword}': {str(e)}")
+            last_page_num = 1
+
+    links = get_job_link_page(raw_page)
+    if journal:
+        journal.log_page(keyword, page_num, links, last_page_num)
+    return links, last_page_num
+
+
+def iterate_search_pages(browser, keywords:list, limit:int=None, rate_limiter:RateLimiter=None, journal:CrawlJournal=None):
+    """Generator over the search result pages of several keywords, in interleaved order:
+    the first page of every keyword, then page 2 of every keyword, page 3, and so on.
+
+    Args:
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
+        keywords (list): job titles to search for
+        limit (int, optional): limit pages per keyword. Defaults to None.
+        rate_limiter (RateLimiter, optional): shared politeness budget used instead of the random delay. Defaults to None.
+        journal (CrawlJournal, optional): checkpoint journal; pages already journaled are not requested again. Defaults to None.
+
+    Yields:
+        tuple: (keyword, page number, list of job links)
+    """
+    #--------------------------- - 1. Halaman pertama tiap keyword, sekaligus jumlah halamannya
+    last_pages = {}
+    for keyword in keywords:
+        first_page = search_page_links(browser, keyword, 1, rate_limiter, journal)
+        if not first_page:
+            print(f"No matches found for '{keyword}', or there was an error loading the first page.")
+            continue
+        links, last_page_num = first_page
+        yield keyword, 1, links
+        last_pages[keyword] = limit if limit is not None and limit < last_page_num else last_page_num
+
+    #--------------------------- - 2. Halaman berikutnya, bergantian antar keyword
+    for page_num in range(2, max(last_pages.values(), default=1)+1):
+        for keyword, max_page_num in last_pages.items():
+            if page_num > max_page_num:
+                continue
+            page = search_page_links(browser, keyword, page_num, rate_limiter, journal)
+            if page:
+                yield keyword, page_num, page[0]
+
+
+def collect_job_links_multi(browser, keywords:list, limit:int=None, rate_limiter:RateLimiter=None, journal:CrawlJournal=None) -> tuple:
+    """Function to collect job links for several keywords at once, deduplicated by job UUID,
+    so every unique job is fetched only once whatever the number of keywords it matches.
+
+    Args:
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
+        keywords (list): job titles to search for
+        limit (int, optional): limit pages per keyword. Defaults to None.
+        rate_limiter (RateLimiter, optional): request governor shared with other stages. Defaults to a new `AdaptiveRateLimiter`.
+        journal (CrawlJournal, optional): checkpoint journal; pages already journaled are not requested again. Defaults to None.
+
+    Returns:
+        tuple: (list of unique job links, dict of job UUID -> list of matching keywords)
+    """
+    print(f"\nAnalyzing job market for: {', '.join(keywords)} ...")
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
+
+    links = []
+    matched = {}
+    total_links = 0
+    pages = iterate_search_pages(browser, keywords, limit, rate_limiter, journal)
+    for keyword, page_num, page_links in tqdm(pages, desc="Collecting search pages", colour='green', ncols=100, unit="page"):
+        for link in page_links:
+            total_links += 1
+            key = job_uuid(link)
+            if key not in matched:
+                matched[key] = []
+                links.append(link)
+            if keyword not in matched[key]:
+                matched[key].append(keyword)
+
+    print(f"Successfully gathered {len(links)} unique job listings ({total_links} before deduplication)")
+    return links, matched
@@ -3,28 +3,60 @@ from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 
-from dotenv import dotenv_values
 from tqdm import tqdm
+import threading
+import queue
 import time
 from random import randint
 import datetime as dt
 from dateutil.relativedelta import relativedelta
-import pandas as pd
 
+from utils.Throttling import RateLimiter, AdaptiveRateLimiter, RetryQueue
+from utils.Fetching import as_fetcher, TRANSIENT_ERRORS, PERMANENT_ERRORS
+from utils.Caching import PageCache
+from utils.Archiving import PageArchive
+from utils.Checkpointing import CrawlJournal
+from utils.Session import SessionStore
+from utils.Browser import build_options, open_browser
+from utils.Parsing import get_job_parser, PAGE_SELECTORS, FALLBACK_JOB_FIELDS, FALLBACK_PAGE_SELECTORS
+from utils.Metrics import METRICS, timed
+from utils.Urls import job_uuid, search_url
 
-def glints_login(browser, email_glints, password_glints) -> bool:
+
+# Parser halaman detail, selector di-compile sekali (lxml jika terpasang, html.parser jika tidak)
+JOB_PARSER = get_job_parser()
+# Selector halaman pencarian / penanda halaman siap, diganti oleh use_fallback_selectors()
+SELECTORS = dict(PAGE_SELECTORS)
+
+
+def use_fallback_selectors() -> None:
+    """Function to switch the parser and the search page selectors to the hash-independent
+    fallback selectors (`utils.Parsing.prefix_selector`), e.g. after a failed preflight check."""
+    global JOB_PARSER
+    JOB_PARSER = get_job_parser(fields=FALLBACK_JOB_FIELDS)
+    SELECTORS.update(FALLBACK_PAGE_SELECTORS)
+
+
+@timed("glints_login")
+def glints_login(browser, email_glints, password_glints, session:SessionStore=None) -> bool:
     """Function to login to glints.com using Selenium WebDriver.
     This function automates the login process by filling in the email and password fields from the .env file.
     Args:
         browser (webdriver): Selenium WebDriver instance.
         email_glints (str): email address for glints login
         password_glints (str): password for glints login
+        session (SessionStore, optional): saved session, restored instead of the login form while it is
+            still valid and saved again after a full login. Defaults to None.
     Returns:
         bool: True if login is successful, False otherwise.
     """
+    if session and session.restore(browser):
+        print("\nRestored saved session, login form skipped")
+        return True
+
     total_steps = 7
     max_waiting_time = 15 # seconds
     try:
@@ -64,6 +96,8 @@ def glints_login(browser, email_glints, password_glints) -> bool:
             if browser.find_elements(By.CSS_SELECTOR, ".UserMenuComponentssc__NameHolder-sc-ovl5x6-4"):
                 pbar.update(1) # jika sudah muncul maka login berhasil  7
                 # print("\nLogin successful!")
+                if session:
+                    session.save(browser)
                 return True
             else:
                 print("\nAuthentication Error: Invalid credentials detected")
@@ -77,42 +111,64 @@ def glints_login(browser, email_glints, password_glints) -> bool:
         return False
     
 
-def request_page(job_title:str, page_num:int, browser:webdriver) -> BeautifulSoup:
-    """Function to request a raw data html page from glints.com using Selenium WebDriver.
+def report_outcome(rate_limiter:RateLimiter, ok:bool) -> None:
+    """Passes the outcome of a network request to the request governor.
+    Only an `AdaptiveRateLimiter` adapts its rate; a plain `RateLimiter` or None is left as is."""
+    if not hasattr(rate_limiter, "success"):
+        return
+    if ok:
+        rate_limiter.success()
+    else:
+        rate_limiter.failure()
+
+@timed("request_page")
+def request_page(job_title:str, page_num:int, browser:webdriver, rate_limiter:RateLimiter=None, retries:int=2) -> BeautifulSoup:
+    """Function to request a raw data html page from glints.com.
     This function automates the process of navigating to a specific job search page and retrieving its HTML content.
     Args:
         job_title (str): job_title to search for
         page_num (int): page number to request
-        browser (webdriver): Selenium WebDriver instance.
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
+        rate_limiter (RateLimiter, optional): shared politeness budget (or `AdaptiveRateLimiter` governor) used instead of the random delay. Defaults to None.
+        retries (int, optional): extra attempts after a timeout, browser error or throttling page. Defaults to 2.
 
     Returns:
         BeautifulSoup: raw page content of the requested page
     """
-    try:
-        # Random delay to avoid rate limiting
-        time.sleep(randint(1, 5))
-        
-        url = f"https://glints.com/id/opportunities/jobs/explore?keyword={job_title}&country=ID&locationName=All+Cities%2FProvinces&lowestLocationLevel=1&page={page_num}"
-        browser.get(url)
-
-        WebDriverWait(browser, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.JobCardsc__JobcardContainer-sc-hmqj50-0"))
-        )
-        
-        # browser.save_screenshot(f"page_{page_num}.png")  # Save screenshot for debugging
-        html = browser.page_source
-        soup = BeautifulSoup(html, "html.parser")
-        return soup.find(id="__next")
-        
-    except TimeoutException:
-        print(f"\nTimeout loading page {page_num} for '{job_title}'. Skipping...")
-        return None
-    except WebDriverException as e:
-        print(f"\nBrowser error on page {page_num} for '{job_title}': {str(e)}. Skipping...")
-        return None
-    except Exception as e:
-        print(f"\nUnexpected error loading page {page_num} for '{job_title}': {str(e)}. Skipping...")
-        return None
+    fetcher = as_fetcher(browser)
+    url = search_url(job_title, page_num)
+
+    for attempt in range(1, retries+2):
+        try:
+            # Random delay to avoid rate limiting
+            if rate_limiter:
+                rate_limiter.wait()
+            else:
+                delay = randint(1, 5)
+                time.sleep(delay)
+                METRICS.observe("sleep", delay)
+
+            html = fetcher.get_html(url, wait_selector=SELECTORS["search_ready"])
+            report_outcome(rate_limiter, ok=True)
+
+            # browser.save_screenshot(f"page_{page_num}.png")  # Save screenshot for debugging
+            soup = BeautifulSoup(html, "html.parser")
+            return soup.find(id="__next")
+
+        except TRANSIENT_ERRORS as e:
+            report_outcome(rate_limiter, ok=False)
+            METRICS.count("page_errors")
+            if attempt <= retries:
+                print(f"\nError loading page {page_num} for '{job_title}': {type(e).__name__}. Retrying ({attempt}/{retries})...")
+                continue
+            if isinstance(e, TimeoutException):
+                print(f"\nTimeout loading page {page_num} for '{job_title}'. Skipping...")
+            else:
+                print(f"\nBrowser error on page {page_num} for '{job_title}': {str(e)}. Skipping...")
+            return None
+        except Exception as e:
+            print(f"\nUnexpected error loading page {page_num} for '{job_title}': {str(e)}. Skipping...")
+            return None
 
 def get_job_link_page(raw_page:BeautifulSoup) -> list:
     """Function to extract all job links from single page of glints.com.
@@ -125,31 +181,46 @@ def get_job_link_page(raw_page:BeautifulSoup) -> list:
     if not raw_page:
         return []
         
-    jobs = raw_page.find_all("div", class_="JobCardsc__JobcardContainer-sc-hmqj50-0 iirqVR CompactOpportunityCardsc__CompactJobCardWrapper-sc-dkg8my-5 hRilQl")
+    jobs = raw_page.select(SELECTORS["job_card"])
     links = []
     
     for job in jobs:
-        job_link = job.find("a", class_="CompactOpportunityCardsc__JobCardTitleNoStyleAnchor-sc-dkg8my-12 jHptbP", href=True)
+        job_link = job.select_one(SELECTORS["job_link"])
         if job_link and 'href' in job_link.attrs:
             links.append(job_link['href'])
             
     return links
 
-def collect_job_links(browser:webdriver, job_title:str, limit:int=None) -> list:
+def get_last_page_num(raw_page:BeautifulSoup) -> int:
+    """Function to read the number of the last search result page from the pagination buttons.
+    Args:
+        raw_page (BeautifulSoup): raw page content of the first search page
+
+    Returns:
+        int: number of the last page, or None if the results fit on a single page
+    """
+    next_page_button = raw_page.select(SELECTORS["pagination"])
+    if not next_page_button:
+        return None
+    return int(next_page_button[-1].get_text())
+
+def collect_job_links(browser:webdriver, job_title:str, limit:int=None, rate_limiter:RateLimiter=None) -> list:
     """Function to collect job links from multiple pages of glints.com.
     Args:
-        browser (webdriver): Selenium WebDriver instance.
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
         job_title (str): job_title to search for
         limit (int, optional): limit pages . Defaults to None.
+        rate_limiter (RateLimiter, optional): request governor shared with other stages. Defaults to a new `AdaptiveRateLimiter`.
 
     Returns:
         list: list of job links found on the pages
     """
     print(f"\nAnalyzing job market for: {job_title} ...")
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
 
     #--------------------------- - 1. Get links from the first page
     all_jobs_link = []
-    first_raw_page = request_page(job_title, 1, browser)
+    first_raw_page = request_page(job_title, 1, browser, rate_limiter)
     if not first_raw_page:
         print(f"No matches found for '{job_title}', or there was an error loading the first page.")
         return []
@@ -159,20 +230,23 @@ def collect_job_links(browser:webdriver, job_title:str, limit:int=None) -> list:
     print(f"\nFound {len(first_page_links)} job listings on the first page.")
 
     #--------------------------- - 2. Check tombol next page
-    next_page_button = first_raw_page.find_all("button", class_="UnstyledButton-sc-zp0cw8-0 AnchorPaginationsc__Number-sc-8wke03-3 dYSdtB bkvUQn")
-    if not next_page_button:
+    try:
+        last_page_num = get_last_page_num(first_raw_page)
+    except (ValueError, IndexError) as e:
+        print(f"Error parsing pagination: {str(e)}")
+        return all_jobs_link
+    if not last_page_num:
         print(f"Retrieved {len(all_jobs_link)} job listings from this page.")
         return all_jobs_link
     
     #--------------------------- - 3. Iterasi ke halaman selanjutnya dan ambil link
     try:
-        last_page_num = int(next_page_button[-1].get_text())
         max_page_num = limit if limit is not None and limit < last_page_num else last_page_num 
 
         print(f"Discovered {last_page_num} pages of job listings, capping the process at {max_page_num} pages.")
 
         for page_num in tqdm(range(2, max_page_num+1), desc=f"Collecting {max_page_num-1} remaining pages", colour='green', ncols=100, unit="page"):
-            page = request_page(job_title, page_num, browser)
+            page = request_page(job_title, page_num, browser, rate_limiter)
             if page:
                 page_links = get_job_link_page(page)
                 all_jobs_link.extend(page_links)
@@ -190,105 +264,170 @@ def extract_text(soup, selector, default=None):
     element = soup.select_one(selector)
     return element.get_text() if element else default
 
-def extract_job_details(url:str, browser:webdriver)-> dict:
+def fetch_job_page(base_url:str, fetcher, rate_limiter:RateLimiter=None, cache:PageCache=None) -> tuple:
+    """Function to get the html of a job page, from the cache when the entry is still fresh.
+    Stale entries are revalidated with a conditional request when the fetcher supports it.
+
+    Args:
+        base_url (str): absolute job url
+        fetcher: fetcher backend from `utils.Fetching`
+        rate_limiter (RateLimiter, optional): shared politeness budget (or `AdaptiveRateLimiter` governor) used instead of the random delay. Defaults to None.
+        cache (PageCache, optional): on-disk page cache. Defaults to None.
+
+    Returns:
+        tuple: (html, fetched_at) where fetched_at is the datetime the html was downloaded
+    """
+    key = job_uuid(base_url)
+    cached = cache.lookup(key) if cache else None
+    if cached and cached[2]:
+        html, meta, _ = cached
+        return html, dt.datetime.fromisoformat(meta["stored"])
+
+    if rate_limiter:
+        rate_limiter.wait()
+    else:
+        delay = randint(1, 5)
+        time.sleep(delay)  # Random delay to avoid rate limiting
+        METRICS.observe("sleep", delay)
+
+    wait_selector = SELECTORS["detail_ready"] # Nama pekerjaan
+    if cache and hasattr(fetcher, "get_html_conditional"):
+        meta = cached[1] if cached else {}
+        with METRICS.time("fetch_page"):
+            new_html, etag, last_modified = fetcher.get_html_conditional(base_url, meta.get("etag"), meta.get("last_modified"), wait_selector=wait_selector)
+        report_outcome(rate_limiter, ok=True)
+        if new_html is None:
+            cache.mark_revalidated(key)
+            return cached[0], dt.datetime.now()
+        cache.put(key, new_html, etag, last_modified)
+        return new_html, dt.datetime.now()
+
+    with METRICS.time("fetch_page"):
+        html = fetcher.get_html(base_url, wait_selector=wait_selector)
+    report_outcome(rate_limiter, ok=True)
+    if cache:
+        cache.put(key, html)
+    return html, dt.datetime.now()
+
+@timed("extract_job_details")
+def extract_job_details(url:str, browser:webdriver, rate_limiter:RateLimiter=None, cache:PageCache=None, archive:PageArchive=None,
+                        retry_queue:RetryQueue=None, attempt:int=1)-> dict:
     """Function to extract job details from a job url.
     This function automates the process of navigating to a specific job page and extracting its details.
 
     Args:
         url (str): job url to extract details from
-        browser (webdriver): Selenium WebDriver instance.
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
+        rate_limiter (RateLimiter, optional): shared politeness budget (or `AdaptiveRateLimiter` governor) used instead of the random delay. Defaults to None.
+        cache (PageCache, optional): on-disk page cache; fresh entries are parsed without a network load. Defaults to None.
+        archive (PageArchive, optional): raw page archive for offline re-parsing. Defaults to None.
+        retry_queue (RetryQueue, optional): failed links (timeout, browser error, throttling) are queued here
+            for another attempt instead of being dropped. Defaults to None.
+        attempt (int, optional): attempt number of this call, used by `retry_queue`. Defaults to 1.
 
     Returns:
         dict: dictionary containing job details
     """
     base_url = "https://glints.com" + url
+    fetcher = as_fetcher(browser)
 
     try:
-        browser.get(base_url)
-        time.sleep(randint(1, 5))  # Random delay to avoid rate limiting
-        WebDriverWait(browser, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".TopFoldsc__JobOverViewTitle-sc-1fbktg5-3"))
-        ) # Nama pekerjaan
-
-        html = browser.page_source
-        soup = BeautifulSoup(html, "html.parser")
-        page = soup.find(id="__next")
-        
-        if not page:
+        html, fetched_at = fetch_job_page(base_url, fetcher, rate_limiter, cache)
+        if archive:
+            archive.save(job_uuid(base_url), base_url, html, fetched_at)
+        return parse_job_details(html, base_url, fetched_at)
+
+    except TRANSIENT_ERRORS as e:
+        report_outcome(rate_limiter, ok=False)
+        METRICS.count("job_errors")
+        if retry_queue is not None and retry_queue.push(url, attempt):
             return None
-
-        job_name = extract_text(page, "h1.TopFoldsc__JobOverViewTitle-sc-1fbktg5-3", "No Title")
-        education = extract_text(page, "div.TopFoldsc__JobOverViewInfo-sc-1fbktg5-9:nth-child(4) > span", "No Requirement")
-        job_type = extract_text(page, "div.TopFoldsc__JobOverViewInfo-sc-1fbktg5-9:nth-child(3)", "Unspecified")
-        experience = extract_text(page, "div.TopFoldsc__JobOverViewInfo-sc-1fbktg5-9:nth-child(5)", "No Requirement")
-        salary = extract_text(page, ".TopFoldsc__BasicSalary-sc-1fbktg5-13", "Unspecified")
-        post_time = page.find("span", class_="TopFoldsc__PostedAt-sc-1fbktg5-12 fcmpfD").get_text(strip=True)
-        post_time = post_time.replace("Tayang ","")
-
-        list_skill = []
-        container_skill = page.find("div", class_="Opportunitysc__SkillsContainer-sc-gb4ubh-10 jccjri")
-        if container_skill:
-            list_skill = [element.get_text(strip=True) for element in container_skill.find_all("span") if element.get_text(strip=True)]
-
-        requirements = []
-        extra_requirements = page.find_all("div", class_="TagStyle-sc-r1wv7a-4 bJWZOt JobRequirementssc__Tag-sc-15g5po6-3 cIkSrV")
-        if extra_requirements and len(extra_requirements) > 3:
-            requirements = [req.get_text() for req in extra_requirements[3:] if req]
-
-        
-        province = extract_text(page, "label.BreadcrumbStyle__BreadcrumbItemWrapper-sc-eq3cq-0:nth-child(3) > a", "Unspecified")
-        city = extract_text(page, "label.BreadcrumbStyle__BreadcrumbItemWrapper-sc-eq3cq-0:nth-child(4) > a", "Unspecified")
-        district = extract_text(page, "label.BreadcrumbStyle__BreadcrumbItemWrapper-sc-eq3cq-0:nth-child(5) > a", "Unspecified")
-
-        company_name = extract_text(page, ".AboutCompanySectionsc__Title-sc-c7oevo-6 > a", "Unspecified")
-        company_industry = extract_text(page, ".AboutCompanySectionsc__CompanyIndustryAndSize-sc-c7oevo-7 > span:nth-of-type(1)", "Unspecified")
-        company_size = extract_text(page, ".AboutCompanySectionsc__CompanyIndustryAndSize-sc-c7oevo-7 > span:nth-of-type(2)", "Unspecified")
-        
-        return {
-            "job_name": job_name,
-            "job_type": job_type,
-            "salary_range": salary,
-            "salary_min": pd.Series(salary).str.extract(r'IDR([\d\.]+)\s*-\s*\d+')[0].str.replace('.', '').astype(float).values[0],
-            "salary_max": pd.Series(salary).str.extract(r'IDR[\d\.]+\s*-\s*([\d\.]+)')[0].str.replace('.', '').astype(float).values[0],
-            "skills_requirements": ", ".join(list_skill),
-            "education_requirements": education,
-            "experience_requirements": experience,
-            "another_requirements": ", ".join(requirements),
-            "province": province,
-            "city": city,
-            "district": district,
-            "company_name": company_name,
-            "company_industry": company_industry,
-            "company_size": company_size,
-            "last_post": post_time,
-            "post_time": exctract_time(post_time),
-            "obtained": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "url": base_url,
-        }
-
-    except TimeoutException:
-        print(f"Timeout while loading job details for {base_url}")
+        if isinstance(e, TimeoutException):
+            print(f"Timeout while loading job details for {base_url}")
+        else:
+            print(f"\nError extracting job details for {base_url}: {str(e)}")
+        return None
+    except PERMANENT_ERRORS as e:
+        # 4xx (mis. job sudah ditutup): tidak diulang dan laju governor tidak diturunkan
+        METRICS.count("job_errors")
+        print(f"\nJob page not available {base_url}: {str(e)}")
         return None
     except Exception as e:
         print(f"\nError extracting job details for {base_url}: {str(e)}")
         return None
 
+@timed("parse_job_details")
+def parse_job_details(html:str, base_url:str, fetched_at:dt.datetime=None) -> dict:
+    """Function to extract job details from the html of a job page.
+
+    Args:
+        html (str): html of the job page
+        base_url (str): absolute job url
+        fetched_at (datetime, optional): when the html was downloaded, used for `post_time` and `obtained`. Defaults to now.
+
+    Returns:
+        dict: dictionary containing job details, or None when the page has no content.
+            `salary_min`, `salary_max` and `post_time` are added afterwards for the whole
+            frame by `utils.Normalization.normalize_jobs`.
+    """
+    fetched_at = fetched_at or dt.datetime.now()
+    fields = JOB_PARSER.parse(html)
+    
+    if not fields:
+        return None
+
+    post_time = fields["post_time"].replace("Tayang ","")
+    
+    return {
+        "job_name": fields["job_name"],
+        "job_type": fields["job_type"],
+        "salary_range": fields["salary"],
+        "skills_requirements": ", ".join(fields["skills"]),
+        "education_requirements": fields["education"],
+        "experience_requirements": fields["experience"],
+        "another_requirements": ", ".join(fields["requirements"]),
+        "province": fields["province"],
+        "city": fields["city"],
+        "district": fields["district"],
+        "company_name": fields["company_name"],
+        "company_industry": fields["company_industry"],
+        "company_size": fields["company_size"],
+        "last_post": post_time,
+        "obtained": fetched_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "url": base_url,
+    }
+
 def split_extract_running(links:list,split:int) -> list:
     total_links = len(links)
     return [links[i:i+split] for i in range(0, total_links, split)]
 
-def extract_all_job_details(links:list, browser:webdriver, split:int=60) -> list:
+def extract_all_job_details(links:list, browser:webdriver, split:int=60, cache:PageCache=None, archive:PageArchive=None,
+                            rate_limiter:RateLimiter=None, retry_queue:RetryQueue=None, journal:CrawlJournal=None) -> list:
     """Function to extract job details from multiple job links.
     This function automates the process of navigating to each job page and extracting its details.
 
     Args:
         links (list): list of job links to extract details from
-        browser (webdriver): Selenium WebDriver instance.
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
         split (int, optional): number of links to process in each batch. Defaults to 60.
+        cache (PageCache, optional): on-disk page cache shared by every batch. Defaults to None.
+        archive (PageArchive, optional): raw page archive for offline re-parsing. Defaults to None.
+        rate_limiter (RateLimiter, optional): request governor. Defaults to a new `AdaptiveRateLimiter`.
+        retry_queue (RetryQueue, optional): queue for failed links, retried after the last batch. Defaults to a new `RetryQueue`.
+        journal (CrawlJournal, optional): checkpoint journal; every finished batch is journaled and
+            jobs already journaled are taken from it instead of being fetched again. Defaults to None.
 
     Returns:
         list: list of dictionaries containing job details
     """
+    #--------------------------- - 0. Lanjutkan dari journal (mode resume)
+    jobs = []
+    if journal:
+        jobs = [journal.record(link) for link in links if journal.record(link)]
+        links = [link for link in links if not journal.record(link)]
+        if jobs:
+            print(f"\nResuming: {len(jobs)} jobs taken from the journal, {len(links)} left to fetch")
+
     #--------------------------- - 1. Atur pembagian running
     if split > len(links):
         print(f"Split value {split} is greater than the number of job links {len(links)}")
@@ -298,46 +437,271 @@ def extract_all_job_details(links:list, browser:webdriver, split:int=60) -> list
     splited_links = split_extract_running(links, split)
     print(f"\nSplitting {len(links)} job links into {len(splited_links)} batches for the job detail extraction process.")
 
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
+    retry_queue = retry_queue if retry_queue is not None else RetryQueue()
+
     #--------------------------- - 2. Menjalankan running tiap batch
-    jobs = []
     for i, list_link in enumerate(splited_links,start=1):
 
-        time.sleep(randint(3, 8))  # Random delay to avoid rate limiting
+        batch_jobs = []
         for link in tqdm(list_link, desc=f"(Batch {i}) Fetching full job details" ,ncols=100, unit="step"):
-            job_details = extract_job_details(link, browser)
+            job_details = extract_job_details(link, browser, rate_limiter, cache, archive, retry_queue)
             if job_details:
-                jobs.append(job_details)
+                batch_jobs.append(job_details)
+        jobs.extend(batch_jobs)
+        if journal:
+            journal.log_records(batch_jobs)
+        if cache:
+            cache.save()
+
+    #--------------------------- - 3. Ulangi link yang gagal
+    recovered = retry_failed_jobs(retry_queue, browser, rate_limiter, cache, archive)
+    jobs.extend(recovered)
+    if journal:
+        journal.log_records(recovered)
+
+    if cache:
+        print(f"Page cache: {cache.stats()}")
     return jobs
 
-def exctract_time(post_time):
+def retry_failed_jobs(retry_queue:RetryQueue, browser:webdriver, rate_limiter:RateLimiter=None, cache:PageCache=None, archive:PageArchive=None) -> list:
+    """Function to retry the links queued in `retry_queue` until it is empty.
+    Links that fail again are queued again until their attempts are used up.
+
+    Args:
+        retry_queue (RetryQueue): queue of failed links
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
+        rate_limiter (RateLimiter, optional): request governor. Defaults to None.
+        cache (PageCache, optional): on-disk page cache. Defaults to None.
+        archive (PageArchive, optional): raw page archive for offline re-parsing. Defaults to None.
+
+    Returns:
+        list: list of dictionaries containing job details of the recovered links
+    """
+    if not len(retry_queue):
+        return []
+
+    print(f"\nRetrying {len(retry_queue)} failed job links...")
+    jobs = []
+    while True:
+        item = retry_queue.pop()
+        if item is None:
+            break
+        link, attempt = item
+        job_details = extract_job_details(link, browser, rate_limiter, cache, archive, retry_queue, attempt)
+        if job_details:
+            jobs.append(job_details)
+
+    print(f"Recovered {len(jobs)} jobs, gave up on {len(retry_queue.dropped)} links")
+    if hasattr(rate_limiter, "stats"):
+        print(f"Request governor: {rate_limiter.stats()}")
+    return jobs
+
+def open_worker_browsers(n_workers:int, options:Options, email_glints:str, password_glints:str, session:SessionStore=None) -> list:
+    """Function to open several Firefox sessions and log each of them in to glints.com.
+    Sessions that fail to log in are closed and left out of the returned list.
+
+    Args:
+        n_workers (int): number of browser sessions to open
+        options (Options): Firefox options used for every session
+        email_glints (str): email address for glints login
+        password_glints (str): password for glints login
+        session (SessionStore, optional): saved session restored in every worker instead of the login form. Defaults to None.
+
+    Returns:
+        list: list of logged-in Selenium WebDriver instances
+    """
+    browsers = []
+    for i in range(1, n_workers+1):
+        print(f"\nStarting browser worker {i}/{n_workers}...")
+        browser = open_browser(options)
+        if glints_login(browser, email_glints, password_glints, session):
+            browsers.append(browser)
+        else:
+            print(f"Login failed for browser worker {i}, closing it.")
+            browser.quit()
+    return browsers
+
+def extract_all_job_details_parallel(links:list, browsers:list, max_rps:float=0.5, cache:PageCache=None, archive:PageArchive=None,
+                                     rate_limiter:RateLimiter=None, journal:CrawlJournal=None, checkpoint_every:int=50) -> list:
+    """Function to extract job details from multiple job links with a pool of browser workers.
+    Every browser pulls links from a shared work queue, and all of them share one politeness
+    budget, so throughput grows with the number of workers without exceeding `max_rps`.
+
+    Args:
+        links (list): list of job links to extract details from
+        browsers (list): list of logged-in Selenium WebDriver instances (or fetcher backends), one per worker
+        max_rps (float, optional): maximum requests per second across all workers. Defaults to 0.5.
+        cache (PageCache, optional): on-disk page cache shared by every worker. Defaults to None.
+        archive (PageArchive, optional): raw page archive for offline re-parsing. Defaults to None.
+        rate_limiter (RateLimiter, optional): request governor shared with other stages. Defaults to a new
+            `AdaptiveRateLimiter` capped at `max_rps`.
+        journal (CrawlJournal, optional): checkpoint journal; jobs already journaled are not fetched again. Defaults to None.
+        checkpoint_every (int, optional): number of finished jobs per journal batch. Defaults to 50.
+
+    Returns:
+        list: list of dictionaries containing job details, in the same order as `links`
+    """
+    if not browsers:
+        print("No browser workers available for the job detail extraction process.")
+        return []
+
+    #--------------------------- - 1. Isi antrian kerja (job yang sudah ada di journal dilewati)
+    results = [None] * len(links)
+    work = queue.Queue()
+    for i, link in enumerate(links):
+        if journal and journal.record(link):
+            results[i] = journal.record(link)
+        else:
+            work.put((i, link))
+    if journal and work.qsize() < len(links):
+        print(f"\nResuming: {len(links) - work.qsize()} jobs taken from the journal, {work.qsize()} left to fetch")
+
+    rate_limiter = rate_limiter or AdaptiveRateLimiter(max_rps=max_rps)
+    retry_queue = RetryQueue()
+    positions = {link: i for i, link in enumerate(links)}
+    pending = []
+    print(f"\nExtracting {work.qsize()} job links with {len(browsers)} browser workers (max {max_rps} requests/sec).")
+
+    #--------------------------- - 2. Menjalankan worker tiap browser
+    with tqdm(total=work.qsize(), desc="Fetching full job details", ncols=100, unit="step") as pbar:
+        lock = threading.Lock()
+
+        def worker(browser):
+            while True:
+                try:
+                    i, link = work.get_nowait()
+                    attempt = 1
+                except queue.Empty:
+                    # antrian utama habis, lanjut ke link yang gagal
+                    item = retry_queue.pop()
+                    if item is None:
+                        return
+                    link, attempt = item
+                    i = positions[link]
+                results[i] = extract_job_details(link, browser, rate_limiter, cache, archive, retry_queue, attempt)
+                with lock:
+                    if attempt == 1:
+                        pbar.update(1)
+                    if journal and results[i]:
+                        pending.append(results[i])
+                        if len(pending) >= checkpoint_every:
+                            journal.log_records(pending)
+                            pending.clear()
+
+        threads = [threading.Thread(target=worker, args=(browser,), daemon=True) for browser in browsers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    if journal:
+        journal.log_records(pending)
+
+    if retry_queue.dropped:
+        print(f"Gave up on {len(retry_queue.dropped)} job links after {retry_queue.max_attempts} attempts")
+    if hasattr(rate_limiter, "stats"):
+        print(f"Request governor: {rate_limiter.stats()}")
+    if cache:
+        cache.save()
+        print(f"Page cache: {cache.stats()}")
+    return [job for job in results if job]
+
+def extract_from_queue(work_queue, browser:webdriver, worker_id:str, batch_size:int=10, lease_seconds:float=300,
+                       rate_limiter:RateLimiter=None, cache:PageCache=None, archive:PageArchive=None,
+                       poll_seconds:float=10, stop_when_empty:bool=True) -> int:
+    """Function to run one worker of a distributed crawl: leases job links from a shared work queue
+    (`utils.Queueing`), extracts their details and reports every result back to the queue.
+    Any number of workers, on any number of hosts, can run against the same queue. Delivery is
+    at-least-once: a worker that crashes only loses its current lease, and the links of an expired
+    lease are leased again by another worker.
+
+    Args:
+        work_queue: work queue backend from `utils.Queueing` (`open_work_queue`)
+        browser (webdriver): Selenium WebDriver instance, or a fetcher backend from `utils.Fetching`.
+        worker_id (str): unique name of this worker, owner of its leases
+        batch_size (int, optional): links leased at once. Defaults to 10.
+        lease_seconds (float, optional): lease length, renewed after every job. Defaults to 300.
+        rate_limiter (RateLimiter, optional): request governor of this worker (or of the workers of one host). Defaults to a new `AdaptiveRateLimiter`.
+        cache (PageCache, optional): on-disk page cache. Defaults to None.
+        archive (PageArchive, optional): raw page archive for offline re-parsing. Defaults to None.
+        poll_seconds (float, optional): wait before leasing again while other workers hold every open link. Defaults to 10.
+        stop_when_empty (bool, optional): stop when no link is pending or leased, otherwise keep polling. Defaults to True.
+
+    Returns:
+        int: number of jobs completed by this worker
+    """
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
+    done, failed = 0, 0
+
+    with tqdm(desc=f"({worker_id}) Fetching full job details", ncols=100, unit="step") as pbar:
+        while True:
+            leased = work_queue.lease(worker_id, batch_size, lease_seconds)
+            if not leased:
+                stats = work_queue.stats()
+                if stop_when_empty and not stats["pending"] and not stats["leased"]:
+                    break
+                # link yang tersisa dipegang worker lain, tunggu sampai selesai atau lease-nya habis
+                time.sleep(poll_seconds)
+                continue
+
+            for i, (link, attempt) in enumerate(leased):
+                job_details = extract_job_details(link, browser, rate_limiter, cache, archive)
+                if job_details:
+                    work_queue.complete(worker_id, link, job_details)
+                    done += 1
+                else:
+                    work_queue.fail(worker_id, link, f"attempt {attempt} failed")
+                    failed += 1
+                pbar.update(1)
+                # perpanjang lease link yang belum dikerjakan
+                work_queue.renew(worker_id, [link for link, _ in leased[i+1:]], lease_seconds)
+            if cache:
+                cache.save()
+
+    print(f"Worker {worker_id}: {done} jobs done, {failed} failed attempts")
+    if hasattr(rate_limiter, "stats"):
+        print(f"Request governor: {rate_limiter.stats()}")
+    return done
+
+def exctract_time(post_time, now:dt.datetime=None):
+    """Function to convert a relative Indonesian post time (e.g. "3 hari yang lalu") to a timestamp.
+
+    Args:
+        post_time (str): relative post time shown on the job page
+        now (datetime, optional): reference time the relative time is counted from. Defaults to now.
+
+    Returns:
+        str: timestamp formatted as "%Y-%m-%d %H:%M:%S", or None if the format is unknown
+    """
+    now = now or dt.datetime.now()
 
     if "menit" in post_time.lower():
         minute = int(post_time.split(" ")[0])
-        post_time = dt.datetime.now() - pd.Timedelta(minutes=minute)
+        post_time = now - dt.timedelta(minutes=minute)
         return post_time.strftime("%Y-%m-%d %H:%M:%S")
     
     elif "jam" in post_time.lower():
         hour = int(post_time.split(" ")[0])
-        post_time = dt.datetime.now() - pd.Timedelta(hours=hour)
+        post_time = now - dt.timedelta(hours=hour)
         return post_time.strftime("%Y-%m-%d %H:%M:%S")
     
     elif "kemarin"in post_time.lower():
-        post_time = dt.datetime.now() - pd.Timedelta(days=1)
+        post_time = now - dt.timedelta(days=1)
         return post_time.strftime("%Y-%m-%d %H:%M:%S")
         
     elif "hari" in post_time.lower():
         day = int(post_time.split(" ")[0])
-        post_time = dt.datetime.now() - pd.Timedelta(days=day)
+        post_time = now - dt.timedelta(days=day)
         return post_time.strftime("%Y-%m-%d %H:%M:%S")
     
     elif "bulan" in post_time.lower():
         month = int(post_time.split(" ")[0])
-        post_time = dt.datetime.now() - relativedelta(months=month)
+        post_time = now - relativedelta(months=month)
         return post_time.strftime("%Y-%m-%d %H:%M:%S")
     
     elif "tahun" in post_time.lower():
         year = int(post_time.split(" ")[0])
-        post_time = dt.datetime.now() - relativedelta(years=year)
+        post_time = now - relativedelta(years=year)
         return post_time.strftime("%Y-%m-%d %H:%M:%S")
     
     else:
@@ -345,19 +709,17 @@ def exctract_time(post_time):
         
 
 if __name__ == "__main__":
-    
+    import pandas as pd
+    from dotenv import dotenv_values
+    from utils.Normalization import normalize_jobs
+
     email_glints = dotenv_values("../privacy/.env").get("GLINTS_EMAIL")
     password_glints = dotenv_values("../privacy/.env").get("GLINTS_PASSWORD")
 
     try:
         # Konfigurasi Browser________________________________________ 1
-        options = Options()
-        options.add_argument("--headless")
-        # options.headless = True
-        options.set_preference('network.proxy.type', 0)  # Nonaktifkan proxy
-        options.set_preference("general.useragent.override", 
-                            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0")
-        browser = webdriver.Firefox(options=options)
+        options = build_options()
+        browser = open_browser(options)
 
         # Proses Login_______________________________________________ 2
         if glints_login(browser, email_glints, password_glints):
@@ -377,7 +739,7 @@ if __name__ == "__main__":
             print("No job details found")
             browser.quit()
             exit()
-        df = pd.DataFrame(result)
+        df = normalize_jobs(pd.DataFrame(result))
 
         # save to csv_______________________________________________
         df.to_csv(f"Glints_{job_title}.csv", index=False)
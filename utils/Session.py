@@ -0,0 +1,111 @@
+import base64
+import json
+import os
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+
+HOME_URL = "https://glints.com/id"
+PROFILE_SELECTOR = ".UserMenuComponentssc__NameHolder-sc-ovl5x6-4"  # nama user, hanya muncul jika sudah login
+
+SALT_SIZE = 16
+
+
+class SessionStore:
+    """Encrypted local copy of an authenticated glints.com session (cookies and local storage),
+    so later runs and extra browser workers can skip the login form.
+
+    The file holds a random salt followed by a Fernet token; the key is derived from `secret`
+    (e.g. the Glints password or a dedicated SESSION_KEY) with PBKDF2.
+
+    Args:
+        secret (str): secret the encryption key is derived from.
+        path (str, optional): session file. Defaults to "privacy/session.bin".
+        check_timeout (int, optional): seconds to wait for the profile menu when checking a restored session. Defaults to 5.
+    """
+
+    def __init__(self, secret:str, path:str="privacy/session.bin", check_timeout:int=5):
+        if not secret:
+            raise ValueError("A secret is needed to encrypt the session file")
+        self.secret = secret.encode("utf-8")
+        self.path = path
+        self.check_timeout = check_timeout
+
+    def _fernet(self, salt:bytes) -> Fernet:
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=390_000)
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(self.secret)))
+
+    def save(self, browser) -> None:
+        """Saves the cookies and local storage of a logged-in browser."""
+        session = {
+            "cookies": browser.get_cookies(),
+            "local_storage": browser.execute_script("return Object.assign({}, window.localStorage);"),
+        }
+        salt = os.urandom(SALT_SIZE)
+        token = self._fernet(salt).encrypt(json.dumps(session).encode("utf-8"))
+
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(salt + token)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> dict:
+        """Returns the saved session, or None when there is none or it cannot be decrypted."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            data = f.read()
+        try:
+            return json.loads(self._fernet(data[:SALT_SIZE]).decrypt(data[SALT_SIZE:]))
+        except (InvalidToken, ValueError):
+            print("Saved session cannot be decrypted, ignoring it.")
+            return None
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def restore(self, browser) -> bool:
+        """Loads the saved session into `browser` and checks it with a single page load.
+
+        Returns:
+            bool: True if the browser is logged in, False if there is no session or it has expired.
+        """
+        session = self.load()
+        if not session:
+            return False
+
+        try:
+            browser.get(HOME_URL)   # cookie hanya bisa dipasang pada domain yang sedang dibuka
+            for cookie in session["cookies"]:
+                try:
+                    browser.add_cookie(cookie)
+                except WebDriverException:
+                    continue
+            browser.execute_script(
+                "for (const [key, value] of Object.entries(arguments[0])) { window.localStorage.setItem(key, value); }",
+                session["local_storage"],
+            )
+
+            browser.get(HOME_URL)
+            WebDriverWait(browser, self.check_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, PROFILE_SELECTOR))
+            )
+            return True
+        except TimeoutException:
+            print("Saved session has expired, logging in again.")
+            self.clear()
+            return False
+        except WebDriverException as e:
+            print(f"Could not restore the saved session: {str(e)}")
+            return False
@@ -0,0 +1,320 @@
+import numpy as np
+import pandas as pd
+
+from utils.Metrics import timed
+
+
+# Alias -> nama kanonik. Kunci dibandingkan tanpa huruf besar/kecil dan spasi ganda,
+# jadi "sql", "SQL" dan "Sql " sudah otomatis sama tanpa perlu ditulis di sini.
+SKILL_ALIASES = {
+    "LLM": "Large Language Model",
+    "LLMs": "Large Language Model",
+    "Large Language Models": "Large Language Model",
+    "Gpt": "Large Language Model",
+    "Phyton": "Python",
+    "Python Programming": "Python",
+    "team work": "Teamwork",
+    "Kerjasama": "Teamwork",
+    "Collaboration": "Teamwork",
+    "Adaptasi": "Adaptability",
+    "Riset": "Research Skills",
+    "Visualisasi Data": "Data Visualization",
+    "Perangkat Lunak Visualisasi Data": "Data Visualization",
+    "Data Visualization And Reporting": "Data Visualization",
+    "Nosql Database": "NoSQL",
+    "Etl Pipeline": "ETL",
+    "SQL Query": "SQL",
+    "Query": "SQL",
+    "Excel": "Microsoft Excel",
+    "MS Excel": "Microsoft Excel",
+    "spreadsheet": "Google Sheets",
+    "looker": "Google Data Studio",
+    "Looker Studio": "Google Data Studio",
+    "PowerBI": "Power BI",
+    "Content creator": "Content Creation",
+    "Communicative": "Communication Skills",
+    "Strong Communication Skills": "Communication Skills",
+    "Fluent English": "English Language",
+    "Mandarin language": "Chinese Language",
+    "ML": "Machine Learning",
+    "AWS": "Amazon Web Services (AWS)",
+    "Amazon Web Services": "Amazon Web Services (AWS)",
+    "SPSS": "SPSS Statistics",
+    "IBM SPSS": "SPSS Statistics",
+    "Hse": "Safety and Environment",
+}
+
+# Ejaan kata yang bukan huruf kapital biasa (akronim, camel case), dipakai untuk nama tampilan
+SKILL_WORDS = {word.casefold(): word for word in [
+    ".NET", "3D", "5R", "A/B", "AI", "API", "ASP.NET", "AutoCAD", "AWS", "B2B", "B2C", "BI", "CAD", "CCNA", "CRM",
+    "CSS", "CSS3", "ERP", "ETL", "FTTH", "FTTX", "GIS", "HR", "HRD", "HRIS", "HSE", "HTML", "HTML5", "IBM", "IoT",
+    "IP", "IT", "JavaScript", "JSON", "KAM", "KPI", "KTA", "LLM", "MySQL", "NoSQL", "OOP", "PHP", "PostgreSQL",
+    "PowerPoint", "PPIC", "PV", "PyTorch", "QA", "REST", "SAP", "Scikit-learn", "SEO", "SPSS", "SQL", "TensorFlow", "TikTok",
+    "TypeScript", "UI", "UX",
+]}
+# Kata sambung yang tetap huruf kecil di tengah nama
+MINOR_WORDS = {"a", "an", "and", "di", "dan", "dari", "dengan", "for", "in", "ke", "of", "on", "or", "the", "to",
+               "under", "untuk", "with", "yang"}
+
+# Kolom yang dihitung per grup -> nama tabel agregat
+GROUP_TABLES = {"province": "Skills_Province", "company_industry": "Skills_Industry"}
+
+
+def skill_key(name:str) -> str:
+    """Comparison key of a skill name: whitespace collapsed and case folded."""
+    return " ".join(str(name).split()).casefold()
+
+
+def skill_lookup(aliases:dict=SKILL_ALIASES) -> dict:
+    """skill_key -> canonical name, for every alias and every canonical name of `aliases`."""
+    lookup = {skill_key(name): name for name in aliases.values()}
+    lookup.update({skill_key(alias): name for alias, name in aliases.items()})
+    return lookup
+
+
+def _display_word(word:str, first:bool) -> str:
+    if word in SKILL_WORDS:
+        return SKILL_WORDS[word]
+    if len(word) > 2 and word.startswith("(") and word.endswith(")"):
+        return "(" + _display_word(word[1:-1], True) + ")"
+    if not first and word in MINOR_WORDS:
+        return word
+    return "-".join(part[:1].upper() + part[1:] for part in word.split("-"))
+
+
+def display_name(key:str) -> str:
+    """Display form of a skill key (see `skill_key`): every word capitalized, except connecting
+    words and the acronyms / camel case names of SKILL_WORDS, e.g. "it project management"
+    -> "IT Project Management"."""
+    return " ".join(_display_word(word, i == 0) for i, word in enumerate(key.split(" ")))
+
+
+_DEFAULT_LOOKUP = skill_lookup(SKILL_ALIASES)
+
+
+def canonical_skill(name:str, lookup:dict=None) -> str:
+    """Canonical name of one skill: the alias target of its key, otherwise `display_name` of its key.
+    It only depends on the case-folded key, so "sql", "SQL" and "Sql" always give "SQL", whatever
+    spelling is seen first. Every skill count (SkillIndex, warehouse deltas, dedup) goes through it.
+
+    Args:
+        name (str): skill name as written in the posting
+        lookup (dict, optional): result of `skill_lookup`. Defaults to the lookup of SKILL_ALIASES.
+    """
+    key = skill_key(name)
+    lookup = _DEFAULT_LOOKUP if lookup is None else lookup
+    return lookup.get(key) or display_name(key)
+
+
+def canonical_skills(skills:pd.Series, aliases:dict=SKILL_ALIASES) -> pd.Series:
+    """Maps every skill name (one per row, e.g. from `split_skills`) to its canonical name (`canonical_skill`)."""
+    lookup = _DEFAULT_LOOKUP if aliases is SKILL_ALIASES else skill_lookup(aliases)
+    mapping = {name: canonical_skill(name, lookup) for name in skills.dropna().unique()}
+    return skills.map(mapping)
+
+
+# _________________________________________________________________________________________ Index
+
+class SkillIndex:
+    """Normalized skills index: every skill name is interned to an integer ID through the alias
+    map, every posting keeps its skills as a sparse array of IDs (CSR: `indptr` / `indices`),
+    and the demand aggregates are kept up to date as postings are added:
+
+    - `counts`: postings per skill
+    - `pairs`: postings per pair of skills (sparse co-occurrence matrix, upper triangle)
+    - `groups`: postings per skill for every column of `group_columns` (province, industry)
+
+    Dashboards read these aggregates (`tables()`) instead of splitting the skills text again.
+
+    With `keep_postings=False` only the aggregates are kept (no posting keys, no CSR arrays), so
+    the index size depends on the number of distinct skills and groups, not on the number of postings.
+
+    Args:
+        aliases (dict, optional): alias -> canonical skill name. Defaults to SKILL_ALIASES.
+        group_columns (list, optional): columns counted per group. Defaults to the keys of GROUP_TABLES.
+        keep_postings (bool, optional): keep the skills of every posting. Defaults to True.
+    """
+
+    def __init__(self, aliases:dict=SKILL_ALIASES, group_columns:list=tuple(GROUP_TABLES), keep_postings:bool=True):
+        self.lookup = _DEFAULT_LOOKUP if aliases is SKILL_ALIASES else skill_lookup(aliases)
+        self.group_columns = list(group_columns)
+        self.keep_postings = keep_postings
+        self.n_postings = 0
+
+        self.names = []     # id -> nama kanonik
+        self.ids = {}       # skill_key -> id
+
+        self.keys = []      # job_uuid (atau url) per posting
+        self._indptr = [np.zeros(1, dtype=np.int64)]
+        self._indices = []
+
+        self.counts = pd.Series(dtype="int64")
+        self.pairs = pd.Series(dtype="int64", index=pd.MultiIndex.from_arrays([[], []], names=["skill_a", "skill_b"]))
+        self.groups = {col: pd.Series(dtype="int64", index=pd.MultiIndex.from_arrays([[], []], names=[col, "skill_id"]))
+                       for col in self.group_columns}
+
+    def __len__(self) -> int:
+        return self.n_postings
+
+    # ______ Interning
+
+    def intern(self, name:str) -> int:
+        """ID of the canonical skill behind `name`, adding it when it is new."""
+        canonical = canonical_skill(name, self.lookup)
+        key = skill_key(canonical)
+        if key not in self.ids:
+            self.ids[key] = len(self.names)
+            self.names.append(canonical)
+        return self.ids[key]
+
+    def skill_id(self, name:str) -> int:
+        """ID of `name` (or of its canonical skill), None when the skill is unknown."""
+        return self.ids.get(skill_key(canonical_skill(name, self.lookup)))
+
+    def encode(self, skills:pd.Series) -> pd.DataFrame:
+        """Comma separated skills of every posting -> one (posting, skill_id) row per distinct skill.
+        `posting` is the position of the row in `skills`."""
+        exploded = skills.reset_index(drop=True).dropna().astype(str).str.split(",").explode().str.strip()
+        exploded = exploded[exploded != ""]
+        uniques = exploded.unique()
+        mapping = dict(zip(uniques, [self.intern(name) for name in uniques]))
+
+        encoded = pd.DataFrame({"posting": exploded.index.to_numpy(dtype=np.int64),
+                                "skill_id": exploded.map(mapping).to_numpy(dtype=np.int64)})
+        # alias bisa membuat skill yang sama muncul dua kali dalam satu posting
+        return encoded.drop_duplicates().sort_values(["posting", "skill_id"], ignore_index=True)
+
+    # ______ Postings and aggregates
+
+    @timed("skill_index")
+    def add(self, df:pd.DataFrame) -> "SkillIndex":
+        """Adds the postings of `df` (column `skills_requirements`) to the index and its aggregates."""
+        encoded = self.encode(df["skills_requirements"])
+        posting, ids = encoded["posting"].to_numpy(), encoded["skill_id"].to_numpy()
+
+        #--------------------------- - 1. Posting -> array ID (CSR), kecuali mode agregat saja
+        self.n_postings += len(df)
+        if self.keep_postings:
+            lengths = np.bincount(posting, minlength=len(df))
+            self._indptr.append(self._indptr[-1][-1] + np.cumsum(lengths))
+            self._indices.append(ids.astype(np.int32))
+            key_col = "job_uuid" if "job_uuid" in df else "url"
+            self.keys.extend(df[key_col].astype(str).tolist() if key_col in df else [None] * len(df))
+
+        #--------------------------- - 2. Jumlah posting per skill
+        self.counts = self.counts.add(encoded["skill_id"].value_counts(), fill_value=0).astype("int64")
+
+        #--------------------------- - 3. Co-occurrence: pasangan skill dalam posting yang sama
+        pairs = encoded.merge(encoded, on="posting", suffixes=("_a", "_b"))
+        pairs = pairs[pairs["skill_id_a"] < pairs["skill_id_b"]]
+        pair_counts = pairs.groupby(["skill_id_a", "skill_id_b"]).size()
+        pair_counts.index.names = ["skill_a", "skill_b"]
+        self.pairs = self.pairs.add(pair_counts, fill_value=0).astype("int64")
+
+        #--------------------------- - 4. Jumlah per provinsi / industri
+        for col in self.group_columns:
+            if col not in df:
+                continue
+            labels = df[col].astype("object").to_numpy()[posting]
+            group_counts = pd.DataFrame({col: labels, "skill_id": ids}).dropna().groupby([col, "skill_id"]).size()
+            self.groups[col] = self.groups[col].add(group_counts, fill_value=0).astype("int64")
+        return self
+
+    @property
+    def indptr(self) -> np.ndarray:
+        return np.concatenate(self._indptr)
+
+    @property
+    def indices(self) -> np.ndarray:
+        return np.concatenate(self._indices) if self._indices else np.zeros(0, dtype=np.int32)
+
+    def posting_skills(self, i:int) -> np.ndarray:
+        """Skill IDs of the `i`-th posting added."""
+        indptr = self.indptr
+        return self.indices[indptr[i]:indptr[i+1]]
+
+    # ______ Queries
+
+    def top_skills(self, n:int=20) -> pd.Series:
+        """Most demanded skills (name -> postings)."""
+        top = self.counts.sort_values(ascending=False, kind="stable").head(n)
+        return pd.Series(top.to_numpy(), index=[self.names[i] for i in top.index], name="count")
+
+    def co_occurring(self, skill:str, n:int=20) -> pd.Series:
+        """Skills most often asked together with `skill` (name -> postings)."""
+        skill_id = self.skill_id(skill)
+        if skill_id is None or self.pairs.empty:
+            return pd.Series(dtype="int64", name="count")
+        a = self.pairs.index.get_level_values("skill_a")
+        b = self.pairs.index.get_level_values("skill_b")
+        partner = np.where(a == skill_id, b, a)[(a == skill_id) | (b == skill_id)]
+        counts = self.pairs[(a == skill_id) | (b == skill_id)].to_numpy()
+        top = pd.Series(counts, index=partner).sort_values(ascending=False, kind="stable").head(n)
+        return pd.Series(top.to_numpy(), index=[self.names[i] for i in top.index], name="count")
+
+    def tables(self) -> dict:
+        """Aggregates as upload-ready tables: Skills (same columns as before: `index`, `count`),
+        Skill_Pairs and one table per group column (see GROUP_TABLES)."""
+        names = np.array(self.names, dtype=object)
+        skills = pd.DataFrame({"index": names[self.counts.index.to_numpy(dtype=np.int64)], "count": self.counts.to_numpy()})
+        tables = {"Skills": skills.sort_values("count", ascending=False, kind="stable", ignore_index=True)}
+
+        pairs = self.pairs.reset_index(name="count")
+        pairs["skill_a"] = names[pairs["skill_a"].to_numpy(dtype=np.int64)]
+        pairs["skill_b"] = names[pairs["skill_b"].to_numpy(dtype=np.int64)]
+        # urutan pasangan menurut nama, bukan ID, supaya sama di setiap index (delta warehouse)
+        swap = pairs["skill_a"] > pairs["skill_b"]
+        pairs.loc[swap, ["skill_a", "skill_b"]] = pairs.loc[swap, ["skill_b", "skill_a"]].to_numpy()
+        tables["Skill_Pairs"] = pairs.sort_values("count", ascending=False, kind="stable", ignore_index=True)
+
+        for col, counts in self.groups.items():
+            table = counts.reset_index(name="count")
+            table["skill"] = names[table.pop("skill_id").to_numpy(dtype=np.int64)]
+            table_name = GROUP_TABLES.get(col, f"Skills_{col}")
+            tables[table_name] = table[[col, "skill", "count"]].sort_values([col, "count"], ascending=[True, False], kind="stable", ignore_index=True)
+        return tables
+
+    # ______ Persistence
+
+    def save(self, path:str="data/skills_index.npz") -> None:
+        """Saves the index (names, postings and aggregates) as a compressed numpy archive."""
+        arrays = {
+            "names": np.array(self.names, dtype=str),
+            "keys": np.array([key or "" for key in self.keys], dtype=str),
+            "indptr": self.indptr,
+            "indices": self.indices,
+            "count_ids": self.counts.index.to_numpy(dtype=np.int64),
+            "counts": self.counts.to_numpy(dtype=np.int64),
+            "pair_a": self.pairs.index.get_level_values(0).to_numpy(dtype=np.int64),
+            "pair_b": self.pairs.index.get_level_values(1).to_numpy(dtype=np.int64),
+            "pair_counts": self.pairs.to_numpy(dtype=np.int64),
+            "group_columns": np.array(self.group_columns, dtype=str),
+            "n_postings": np.array(self.n_postings, dtype=np.int64),
+            "keep_postings": np.array(self.keep_postings),
+        }
+        for col, counts in self.groups.items():
+            arrays[f"group_{col}_labels"] = counts.index.get_level_values(0).astype(str).to_numpy(dtype=str)
+            arrays[f"group_{col}_ids"] = counts.index.get_level_values(1).to_numpy(dtype=np.int64)
+            arrays[f"group_{col}_counts"] = counts.to_numpy(dtype=np.int64)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path:str="data/skills_index.npz", aliases:dict=SKILL_ALIASES) -> "SkillIndex":
+        """Loads an index saved with `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            keep_postings = bool(data["keep_postings"]) if "keep_postings" in data else True
+            index = cls(aliases=aliases, group_columns=data["group_columns"].tolist(), keep_postings=keep_postings)
+            for name in data["names"].tolist():
+                index.ids[skill_key(name)] = len(index.names)
+                index.names.append(name)
+            index.keys = [key or None for key in data["keys"].tolist()]
+            index._indptr = [data["indptr"]]
+            index._indices = [data["indices"]]
+            index.n_postings = int(data["n_postings"]) if "n_postings" in data else len(index.keys)
+            index.counts = pd.Series(data["counts"], index=data["count_ids"])
+            index.pairs = pd.Series(data["pair_counts"], index=pd.MultiIndex.from_arrays(
+                [data["pair_a"], data["pair_b"]], names=["skill_a", "skill_b"]))
+            for col in index.group_columns:
+                index.groups[col] = pd.Series(data[f"group_{col}_counts"], index=pd.MultiIndex.from_arrays(
+                    [data[f"group_{col}_labels"].astype(object), data[f"group_{col}_ids"]], names=[col, "skill_id"]))
+        return index
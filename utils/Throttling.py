@@ -0,0 +1,141 @@
+import collections
+import threading
+import time
+
+from utils.Metrics import METRICS
+
+
+class RateLimiter:
+    """Thread-safe politeness budget shared by every browser worker.
+
+    Requests are spaced so that, across all workers holding the same limiter,
+    no more than `max_rps` requests per second are sent to glints.com.
+
+    Args:
+        max_rps (float): maximum number of requests per second across all workers.
+    """
+
+    def __init__(self, max_rps:float=0.5):
+        if max_rps <= 0:
+            raise ValueError("max_rps must be greater than 0")
+        self.max_rps = max_rps
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.max_rps
+
+    def wait(self) -> float:
+        """Blocks until the caller is allowed to send the next request.
+
+        Returns:
+            float: number of seconds the caller spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+            METRICS.observe("sleep", delay)
+        return delay
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Request governor: a `RateLimiter` whose rate follows the health of the responses.
+
+    Every healthy response raises the rate by `step` (up to `max_rps`); every timeout, browser error
+    or throttling page divides it by `backoff` (down to `min_rps`) and pauses all workers for an
+    exponentially growing penalty, so the crawl runs as fast as the site allows without fixed idle waits.
+
+    Args:
+        max_rps (float, optional): highest rate the governor may reach. Defaults to 2.0.
+        start_rps (float, optional): rate used for the first requests. Defaults to 0.5.
+        min_rps (float, optional): lowest rate after repeated failures. Defaults to 0.05.
+        step (float, optional): requests per second added after each healthy response. Defaults to 0.05.
+        backoff (float, optional): factor the rate is divided by after each failure. Defaults to 2.0.
+        max_penalty (float, optional): longest pause (seconds) after consecutive failures. Defaults to 60.
+    """
+
+    def __init__(self, max_rps:float=2.0, start_rps:float=0.5, min_rps:float=0.05, step:float=0.05,
+                 backoff:float=2.0, max_penalty:float=60.0):
+        super().__init__(max_rps)
+        if not 0 < min_rps <= max_rps:
+            raise ValueError("min_rps must be greater than 0 and not above max_rps")
+        self.min_rps = min_rps
+        self.rps = min(max(start_rps, min_rps), max_rps)
+        self.step = step
+        self.backoff = backoff
+        self.max_penalty = max_penalty
+        self.failures = 0       # kegagalan berturut-turut
+        self.successes = 0
+        self.errors = 0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.rps
+
+    def success(self) -> None:
+        """Reports a healthy response: the rate goes up by `step`."""
+        with self._lock:
+            self.failures = 0
+            self.successes += 1
+            self.rps = min(self.max_rps, self.rps + self.step)
+
+    def failure(self) -> float:
+        """Reports a timeout, browser error or throttling page: the rate is divided by `backoff`
+        and every worker is paused for `interval * 2**consecutive_failures` seconds (capped).
+
+        Returns:
+            float: length of the pause in seconds.
+        """
+        with self._lock:
+            self.failures += 1
+            self.errors += 1
+            self.rps = max(self.min_rps, self.rps / self.backoff)
+            penalty = min(self.max_penalty, self.interval * 2 ** self.failures)
+            self._next_slot = max(self._next_slot, time.monotonic() + penalty)
+        return penalty
+
+    def stats(self) -> dict:
+        return {"rps": round(self.rps, 3), "successes": self.successes, "errors": self.errors}
+
+
+class RetryQueue:
+    """Bounded, thread-safe queue of failed items waiting for another attempt.
+
+    Args:
+        max_size (int, optional): maximum number of items waiting at once. Defaults to 500.
+        max_attempts (int, optional): attempts per item, the first one included. Defaults to 3.
+    """
+
+    def __init__(self, max_size:int=500, max_attempts:int=3):
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self._items = collections.deque()
+        self._lock = threading.Lock()
+        self.dropped = []
+
+    def push(self, item, attempt:int=1) -> bool:
+        """Queues `item` after its failed attempt number `attempt`.
+
+        Returns:
+            bool: False when the item is given up (attempts used up or queue full).
+        """
+        with self._lock:
+            if attempt >= self.max_attempts or len(self._items) >= self.max_size:
+                self.dropped.append(item)
+                return False
+            self._items.append((item, attempt + 1))
+            return True
+
+    def pop(self) -> tuple:
+        """Returns the next (item, attempt) pair, or None when the queue is empty."""
+        with self._lock:
+            return self._items.popleft() if self._items else None
+
+    def __len__(self) -> int:
+        return len(self._items)
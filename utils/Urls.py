@@ -0,0 +1,26 @@
+import hashlib
+import re
+
+
+# Modul ringan (tanpa selenium / pandas), dipakai tahap mana pun yang butuh kunci job
+
+
+def search_url(job_title:str, page_num:int) -> str:
+    """Url of a job search result page on glints.com."""
+    return f"https://glints.com/id/opportunities/jobs/explore?keyword={job_title}&country=ID&locationName=All+Cities%2FProvinces&lowestLocationLevel=1&page={page_num}"
+
+
+def job_uuid(url:str) -> str:
+    """Function to get the job UUID from a job url (query strings such as `traceInfo` are ignored).
+    Falls back to a hash of the url path when the url holds no UUID.
+
+    Args:
+        url (str): job url, relative or absolute
+
+    Returns:
+        str: job UUID
+    """
+    match = re.search(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", url.lower())
+    if match:
+        return match.group(0)
+    return hashlib.sha1(url.split("?")[0].encode("utf-8")).hexdigest()
@@ -0,0 +1,318 @@
+import sqlite3
+
+import pandas as pd
+
+from utils.Urls import job_uuid
+from utils.Metrics import timed
+from utils.Skills import GROUP_TABLES, SkillIndex
+
+
+# Kolom tabel Skills, sama dengan hasil upload_gbq (value_counts().reset_index())
+SKILL_COLUMN = "index"
+COUNT_COLUMN = "count"
+
+
+# _________________________________________________________________________________________ Backends
+#
+# A warehouse backend provides:
+#   columns(table) -> list                             column names, [] when the table does not exist
+#   read(table) -> pd.DataFrame                        the whole table
+#   replace(table, df, key, chunk_size)                replace the table with df (unique by key)
+#   fetch(table, key, keys, columns) -> pd.DataFrame   existing rows for the given keys
+#   upsert(table, df, key, chunk_size)                 insert or update rows by key
+#   add_counts(table, df, key, count_col)              add `count_col` of df to the stored counts, dropping
+#                                                      rows that reach 0 (`key` may be a list of columns)
+
+def _key_list(key) -> list:
+    return [key] if isinstance(key, str) else list(key)
+
+
+class SqliteWarehouse:
+    """Local stand-in for BigQuery, behind the same interface, so incremental loading can be run offline.
+
+    Args:
+        path (str, optional): SQLite database file. Defaults to "data/warehouse.sqlite".
+    """
+
+    def __init__(self, path:str="data/warehouse.sqlite"):
+        self.connection = sqlite3.connect(path)
+
+    def _exists(self, table:str) -> bool:
+        query = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?"
+        return self.connection.execute(query, (table,)).fetchone() is not None
+
+    def _stage(self, df:pd.DataFrame, staging:str, chunk_size:int) -> None:
+        for i, start in enumerate(range(0, len(df), chunk_size)):
+            df.iloc[start:start+chunk_size].to_sql(staging, self.connection, index=False,
+                                                  if_exists="replace" if i == 0 else "append")
+
+    def _create_like(self, table:str, staging:str, key) -> None:
+        if not self._exists(table):
+            self.connection.execute(f'CREATE TABLE "{table}" AS SELECT * FROM "{staging}" WHERE 0')
+        # kolom yang ditambahkan kemudian (mis. matched_tags) ditambahkan ke tabel lama
+        existing = set(self.columns(table))
+        for _, col, col_type, *_ in self.connection.execute(f'PRAGMA table_info("{staging}")').fetchall():
+            if col not in existing:
+                self.connection.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" {col_type}')
+        # tabel lama (upload_gbq) belum punya unique index
+        keys = _key_list(key)
+        index_name = "_".join([table] + keys)
+        columns = ", ".join(f'"{col}"' for col in keys)
+        self.connection.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{index_name}" ON "{table}" ({columns})')
+
+    def columns(self, table:str) -> list:
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info("{table}")')]
+
+    def read(self, table:str) -> pd.DataFrame:
+        return pd.read_sql(f'SELECT * FROM "{table}"', self.connection)
+
+    def replace(self, table:str, df:pd.DataFrame, key:str, chunk_size:int=500) -> None:
+        staging = f"{table}_staging"
+        self._stage(df, staging, chunk_size)
+        self.connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self._create_like(table, staging, key)
+        self.connection.execute(f'INSERT INTO "{table}" SELECT * FROM "{staging}"')
+        self.connection.execute(f'DROP TABLE "{staging}"')
+        self.connection.commit()
+
+    def fetch(self, table:str, key:str, keys:list, columns:list) -> pd.DataFrame:
+        if not self._exists(table) or not keys:
+            return pd.DataFrame(columns=columns)
+        cols = ", ".join(f'"{col}"' for col in columns)
+        frames = []
+        for start in range(0, len(keys), 500):
+            chunk = list(keys[start:start+500])
+            placeholders = ", ".join("?" * len(chunk))
+            frames.append(pd.read_sql(f'SELECT {cols} FROM "{table}" WHERE "{key}" IN ({placeholders})', self.connection, params=chunk))
+        return pd.concat(frames, ignore_index=True)
+
+    def upsert(self, table:str, df:pd.DataFrame, key:str, chunk_size:int=500) -> None:
+        staging = f"{table}_staging"
+        self._stage(df, staging, chunk_size)
+        self._create_like(table, staging, key)
+
+        cols = ", ".join(f'"{col}"' for col in df.columns)
+        updates = ", ".join(f'"{col}" = excluded."{col}"' for col in df.columns if col != key)
+        self.connection.execute(f'INSERT INTO "{table}" ({cols}) SELECT {cols} FROM "{staging}" WHERE true '
+                                f'ON CONFLICT ("{key}") DO UPDATE SET {updates}')
+        self.connection.execute(f'DROP TABLE "{staging}"')
+        self.connection.commit()
+
+    def add_counts(self, table:str, df:pd.DataFrame, key, count_col:str) -> None:
+        staging = f"{table}_staging"
+        self._stage(df, staging, chunk_size=len(df) or 1)
+        self._create_like(table, staging, key)
+
+        keys = ", ".join(f'"{col}"' for col in _key_list(key))
+        self.connection.execute(f'INSERT INTO "{table}" ({keys}, "{count_col}") SELECT {keys}, "{count_col}" FROM "{staging}" WHERE true '
+                                f'ON CONFLICT ({keys}) DO UPDATE SET "{count_col}" = "{table}"."{count_col}" + excluded."{count_col}"')
+        self.connection.execute(f'DELETE FROM "{table}" WHERE "{count_col}" <= 0')
+        self.connection.execute(f'DROP TABLE "{staging}"')
+        self.connection.commit()
+
+
+class BigQueryWarehouse:
+    """BigQuery backend: rows are staged in chunks through batched load jobs (pandas_gbq),
+    then merged into the main table with a single MERGE statement.
+
+    Args:
+        project_id (str): The Google Cloud Project ID.
+        dataset_id (str): The BigQuery Dataset ID.
+        key_path (str): Path to the service account key file for authentication.
+    """
+
+    def __init__(self, project_id:str, dataset_id:str, key_path:str):
+        from google.cloud import bigquery
+        from google.oauth2 import service_account
+
+        scopes = ["https://www.googleapis.com/auth/bigquery"]
+        self.credentials = service_account.Credentials.from_service_account_file(filename=key_path, scopes=scopes)
+        self.client = bigquery.Client(project=project_id, credentials=self.credentials)
+        self.bigquery = bigquery
+        self.project_id = project_id
+        self.dataset_id = dataset_id
+
+    def _table(self, table:str) -> str:
+        return f"`{self.project_id}.{self.dataset_id}.{table}`"
+
+    def _exists(self, table:str) -> bool:
+        from google.api_core.exceptions import NotFound
+        try:
+            self.client.get_table(f"{self.project_id}.{self.dataset_id}.{table}")
+            return True
+        except NotFound:
+            return False
+
+    def _stage(self, df:pd.DataFrame, staging:str, chunk_size:int) -> None:
+        import pandas_gbq
+        pandas_gbq.to_gbq(
+            dataframe=df,
+            destination_table=f"{self.dataset_id}.{staging}",
+            project_id=self.project_id,
+            if_exists="replace",
+            chunksize=chunk_size,
+            credentials=self.credentials
+        )
+
+    def _run(self, sql:str, params:list=None) -> pd.DataFrame:
+        job_config = self.bigquery.QueryJobConfig(query_parameters=params or [])
+        return self.client.query(sql, job_config=job_config).result().to_dataframe()
+
+    def _add_missing_columns(self, table:str, staging:str) -> None:
+        """Adds the columns of `staging` missing from `table` (columns added later, e.g. matched_tags)."""
+        target = self.client.get_table(f"{self.project_id}.{self.dataset_id}.{table}")
+        existing = {field.name for field in target.schema}
+        missing = [field for field in self.client.get_table(f"{self.project_id}.{self.dataset_id}.{staging}").schema
+                   if field.name not in existing]
+        if missing:
+            target.schema = list(target.schema) + missing
+            self.client.update_table(target, ["schema"])
+
+    def columns(self, table:str) -> list:
+        if not self._exists(table):
+            return []
+        return [field.name for field in self.client.get_table(f"{self.project_id}.{self.dataset_id}.{table}").schema]
+
+    def read(self, table:str) -> pd.DataFrame:
+        return self._run(f"SELECT * FROM {self._table(table)}")
+
+    def replace(self, table:str, df:pd.DataFrame, key:str, chunk_size:int=500) -> None:
+        # BigQuery tidak punya unique index, kunci dijaga oleh MERGE di upsert
+        self._stage(df, table, chunk_size)
+
+    def fetch(self, table:str, key:str, keys:list, columns:list) -> pd.DataFrame:
+        if not self._exists(table) or not keys:
+            return pd.DataFrame(columns=columns)
+        cols = ", ".join(f"`{col}`" for col in columns)
+        params = [self.bigquery.ArrayQueryParameter("keys", "STRING", list(keys))]
+        return self._run(f"SELECT {cols} FROM {self._table(table)} WHERE `{key}` IN UNNEST(@keys)", params)
+
+    def upsert(self, table:str, df:pd.DataFrame, key:str, chunk_size:int=500) -> None:
+        staging = f"{table}_staging"
+        self._stage(df, staging, chunk_size)
+
+        cols = ", ".join(f"`{col}`" for col in df.columns)
+        values = ", ".join(f"S.`{col}`" for col in df.columns)
+        updates = ", ".join(f"`{col}` = S.`{col}`" for col in df.columns if col != key)
+        self._run(f"CREATE TABLE IF NOT EXISTS {self._table(table)} AS SELECT * FROM {self._table(staging)} LIMIT 0")
+        self._add_missing_columns(table, staging)
+        self._run(f"""
+            MERGE {self._table(table)} T
+            USING {self._table(staging)} S
+            ON T.`{key}` = S.`{key}`
+            WHEN MATCHED THEN UPDATE SET {updates}
+            WHEN NOT MATCHED THEN INSERT ({cols}) VALUES ({values})
+        """)
+        self.client.delete_table(f"{self.project_id}.{self.dataset_id}.{staging}", not_found_ok=True)
+
+    def add_counts(self, table:str, df:pd.DataFrame, key, count_col:str) -> None:
+        staging = f"{table}_staging"
+        self._stage(df, staging, chunk_size=len(df) or 1)
+
+        keys = _key_list(key)
+        on = " AND ".join(f"T.`{col}` = S.`{col}`" for col in keys)
+        cols = ", ".join(f"`{col}`" for col in keys + [count_col])
+        values = ", ".join(f"S.`{col}`" for col in keys + [count_col])
+        self._run(f"CREATE TABLE IF NOT EXISTS {self._table(table)} AS SELECT * FROM {self._table(staging)} LIMIT 0")
+        self._add_missing_columns(table, staging)
+        self._run(f"""
+            MERGE {self._table(table)} T
+            USING {self._table(staging)} S
+            ON {on}
+            WHEN MATCHED AND T.`{count_col}` + S.`{count_col}` <= 0 THEN DELETE
+            WHEN MATCHED THEN UPDATE SET `{count_col}` = T.`{count_col}` + S.`{count_col}`
+            WHEN NOT MATCHED THEN INSERT ({cols}) VALUES ({values})
+        """)
+        self.client.delete_table(f"{self.project_id}.{self.dataset_id}.{staging}", not_found_ok=True)
+
+
+# _________________________________________________________________________________________ Loading
+
+def row_hash(df:pd.DataFrame, ignore:list=("obtained", "post_time", "last_post")) -> pd.Series:
+    """Hash of the content columns of every row, used to detect changed postings.
+    Fetch-time columns are ignored, so re-scraping an unchanged posting does not count as a change."""
+    content = df[[col for col in df.columns if col not in ignore]].astype(str)
+    return pd.util.hash_pandas_object(content, index=False).astype(str)
+
+
+def _with_keys(df:pd.DataFrame) -> pd.DataFrame:
+    """Adds `job_uuid` (when missing) and `row_hash`, keeping the last row of every job."""
+    df = df.astype({col: "object" for col in df.select_dtypes("category").columns})
+    df = df.drop(columns="row_hash", errors="ignore").copy()
+    if "job_uuid" not in df:
+        df["job_uuid"] = df["url"].map(job_uuid)
+    df = df.drop_duplicates("job_uuid", keep="last")
+    df["row_hash"] = row_hash(df.drop(columns="job_uuid"))
+    return df
+
+
+def migrate_legacy(warehouse, glints_table:str="Glints", chunk_size:int=500) -> bool:
+    """Adds `job_uuid` and `row_hash` to a Glints table written by `upload_gbq` (full replace),
+    so incremental loading can run on top of it. The skills tables written with it already
+    count the same rows, so they are kept as they are.
+
+    Returns:
+        bool: True when the table was migrated
+    """
+    columns = warehouse.columns(glints_table)
+    if not columns or {"job_uuid", "row_hash"} <= set(columns):
+        return False
+    legacy = _with_keys(warehouse.read(glints_table))
+    warehouse.replace(glints_table, legacy, key="job_uuid", chunk_size=chunk_size)
+    print(f"Table {glints_table}: legacy table migrated ({len(legacy)} rows keyed by job_uuid)")
+    return True
+
+
+def _count_delta(new:pd.DataFrame, old:pd.DataFrame, count_col:str=COUNT_COLUMN) -> pd.DataFrame:
+    """Difference of two count tables (same key columns), without the unchanged keys."""
+    keys = [col for col in new.columns if col != count_col]
+    delta = new.set_index(keys)[count_col].sub(old.set_index(keys)[count_col], fill_value=0)
+    return delta[delta != 0].astype("int64").reset_index()
+
+
+@timed("upload_incremental")
+def upload_incremental(df:pd.DataFrame, warehouse, chunk_size:int=500, glints_table:str="Glints", skills_table:str="Skills") -> int:
+    """Loads only new or changed rows into the warehouse and updates the skills tables (Skills,
+    Skill_Pairs, Skills_Province, Skills_Industry) by delta, instead of replacing them on every run.
+
+    Args:
+        df (pd.DataFrame): cleaned job records
+        warehouse: `BigQueryWarehouse` or `SqliteWarehouse`
+        chunk_size (int, optional): rows per staging load. Defaults to 500.
+        glints_table (str, optional): main table. Defaults to "Glints".
+        skills_table (str, optional): skills count table. Defaults to "Skills".
+
+    Returns:
+        int: number of rows inserted or updated
+    """
+    df = _with_keys(df)
+    migrate_legacy(warehouse, glints_table, chunk_size)
+
+    #--------------------------- - 1. Cari baris baru / berubah
+    group_columns = [col for col in GROUP_TABLES if col in df]
+    stored = warehouse.fetch(glints_table, "job_uuid", df["job_uuid"].tolist(),
+                             ["job_uuid", "row_hash", "skills_requirements"] + group_columns)
+    known_hash = dict(zip(stored["job_uuid"], stored["row_hash"]))
+    changed = df[df["job_uuid"].map(known_hash) != df["row_hash"]]
+    if changed.empty:
+        print("\nNo new or changed jobs to upload")
+        return 0
+
+    #--------------------------- - 2. Upsert tabel Glints
+    warehouse.upsert(glints_table, changed, key="job_uuid", chunk_size=chunk_size)
+    print(f"Table {glints_table}: {len(changed)} new or changed rows upserted")
+
+    #--------------------------- - 3. Update tabel skills dengan selisih saja (versi baru - versi lama)
+    old_rows = stored[stored["job_uuid"].isin(changed["job_uuid"])]
+    new_tables = SkillIndex(group_columns=group_columns).add(changed).tables()
+    old_tables = SkillIndex(group_columns=group_columns).add(old_rows).tables()
+    for table_name, new_counts in new_tables.items():
+        table_delta = _count_delta(new_counts, old_tables[table_name])
+        if table_delta.empty:
+            continue
+        table_name = skills_table if table_name == "Skills" else table_name
+        keys = [col for col in table_delta.columns if col != COUNT_COLUMN]
+        warehouse.add_counts(table_name, table_delta, key=keys, count_col=COUNT_COLUMN)
+        print(f"Table {table_name}: {len(table_delta)} counts updated")
+
+    return len(changed)